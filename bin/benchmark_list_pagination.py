@@ -0,0 +1,80 @@
+"""Benchmark the listing of paginated assets against a local mock server.
+
+The mock server answers like the Substra backend list routes (page number pagination), adding a fixed
+latency to each request. The same listing is timed when following the pages one by one and when
+fetching them concurrently.
+"""
+
+import argparse
+import http.server
+import json
+import sys
+import threading
+import time
+import urllib.parse
+
+from substra.sdk.backends.remote import rest_client
+
+
+def make_handler(count, page_size, latency):
+    class PaginatedHandler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            url = urllib.parse.urlsplit(self.path)
+            page = int(urllib.parse.parse_qs(url.query).get("page", ["1"])[0])
+            start = (page - 1) * page_size
+            end = min(count, start + page_size)
+            next_url = None
+            if end < count:
+                next_url = f"http://{self.headers['Host']}{url.path}?page={page + 1}"
+            body = json.dumps(
+                {
+                    "count": count,
+                    "next": next_url,
+                    "previous": None,
+                    "results": [{"key": str(i)} for i in range(start, end)],
+                }
+            ).encode()
+
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return PaginatedHandler
+
+
+def run(count, page_size, latency, page_workers):
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), make_handler(count, page_size, latency))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    try:
+        for workers in sorted({1, page_workers}):
+            client = rest_client.Client(url, insecure=False, token=None, page_workers=workers)
+            ts = time.perf_counter()
+            assets = client.list("task")
+            elapsed = time.perf_counter() - ts
+            assert [asset["key"] for asset in assets] == [str(i) for i in range(count)]
+            print(f"page_workers={workers}: listed {len(assets)} assets in {elapsed:.2f}s")
+            client.close()
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=5000, help="number of assets to list")
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.05, help="latency of each request, in seconds")
+    parser.add_argument("--page-workers", type=int, default=rest_client.DEFAULT_PAGE_WORKERS)
+
+    args = parser.parse_args(sys.argv[1:])
+    run(args.count, args.page_size, args.latency, args.page_workers)
@@ -6,9 +6,13 @@ from pathlib import Path
 import docstring_parser
 
 from substra import Client
+from substra.sdk.aio import AsyncClient
+from substra.sdk.performances import ColumnarPerformances
+from substra.sdk.utils import PollingPolicy
+from substra.sdk.utils import RetryPolicy
 from substra.sdk.utils import retry_on_exception
 
-MODULE_LIST = [Client, retry_on_exception]
+MODULE_LIST = [Client, AsyncClient, RetryPolicy, PollingPolicy, ColumnarPerformances, retry_on_exception]
 
 KEYWORDS = ["Args", "Returns", "Yields", "Raises", "Example"]
 
@@ -2,11 +2,15 @@ from substra.sdk import models
 from substra.sdk import schemas
 from substra.sdk.client import Client
 from substra.sdk.schemas import BackendType
+from substra.sdk.utils import PollingPolicy
+from substra.sdk.utils import RetryPolicy
 from substra.sdk.utils import retry_on_exception
 
 __all__ = [
     "Client",
     "retry_on_exception",
+    "RetryPolicy",
+    "PollingPolicy",
     "BackendType",
     "schemas",
     "models",
@@ -0,0 +1,377 @@
+import asyncio
+import concurrent.futures
+import functools
+import threading
+from typing import AsyncIterator
+from typing import List
+from typing import Optional
+
+from substra.sdk import exceptions
+from substra.sdk import models
+from substra.sdk import schemas
+from substra.sdk.backends.remote import rest_client
+from substra.sdk.client import _WAIT_STATUSES
+from substra.sdk.client import Client
+from substra.sdk.client import _gather_wait_results
+from substra.sdk.client import _iter_wait_polls
+from substra.sdk.client import _stream_polls
+from substra.sdk.client import _wait_polls
+from substra.sdk.performances import PerformanceRow
+
+DEFAULT_MAX_WORKERS = rest_client.DEFAULT_POOL_MAXSIZE
+
+
+def _blocking(name: str):
+    """Coroutine running the method `name` of the blocking client in a worker thread."""
+    method = getattr(Client, name)
+
+    @functools.wraps(method)
+    async def run(self, *args, **kwargs):
+        client = await self._get_client()
+        return await self._run(getattr(client, name), *args, **kwargs)
+
+    run.__doc__ = f"Run `Client.{name}` in a worker thread, cf [Client.{name}](#{name})."
+    return run
+
+
+def _blocking_iter(name: str):
+    """Asynchronous iterator over the method `name` of the blocking client, each item read in a worker thread."""
+    method = getattr(Client, name)
+
+    @functools.wraps(method)
+    async def iterate(self, *args, **kwargs):
+        client = await self._get_client()
+        async for item in self._aiter(getattr(client, name)(*args, **kwargs)):
+            yield item
+
+    iterate.__doc__ = (
+        f"Iterate over `Client.{name}`, each page read in a worker thread, " f"cf [Client.{name}](#{name})."
+    )
+    return iterate
+
+
+class AsyncClient:
+    """Asynchronous client, exposing the methods of [Client](#Client) as coroutines.
+
+    The HTTP requests are sent through the pooled session of a `Client`, from a pool of `max_workers`
+    worker threads: at most `max_workers` blocking calls run at the same time, the other ones wait for a
+    free thread. The `Client` itself is built in a worker thread, by `async with` or by the first call,
+    as it may log in to the server. The `wait_*` and `iter_wait_*` methods are native coroutines: they
+    only use a worker thread while a status request is in flight, so thousands of compute plans or tasks
+    can be waited for at the same time.
+
+    Example:
+        ```python
+        async with AsyncClient(url=url, token=token, backend_type="remote") as client:
+            compute_plans = await asyncio.gather(*[client.wait_compute_plan(key) for key in keys])
+            async for task in client.iter_task(filters={"compute_plan_key": [key]}):
+                print(task.status)
+        ```
+
+    Args:
+        max_workers (int, optional): maximum number of blocking calls, e.g. HTTP requests, running at the same
+            time. Defaults to the size of the connection pool of the client.
+        kwargs: arguments of the [Client](#Client)
+    """
+
+    def __init__(self, *, max_workers: int = DEFAULT_MAX_WORKERS, **kwargs):
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="substra-aio"
+        )
+        self._client_kwargs = kwargs
+        self._client = None
+        self._client_lock = threading.Lock()
+
+    async def __aenter__(self):
+        await self._get_client()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self) -> None:
+        """Log out from the remote server (if `login` was used), close the connections to the server and
+        release the worker threads."""
+        if self._client is not None:
+            await self._run(self._client.close)
+        self._executor.shutdown(wait=False)
+
+    @property
+    def client(self) -> Optional[Client]:
+        """The underlying blocking client, None until it is built by `async with` or by the first call."""
+        return self._client
+
+    @property
+    def backend_mode(self) -> schemas.BackendType:
+        """Get the backend mode, once the client is built by `async with` or by the first call."""
+        if self._client is None:
+            raise exceptions.SDKException("The client is not built yet, use `async with AsyncClient(...)`")
+        return self._client.backend_mode
+
+    def _build_client(self) -> Client:
+        with self._client_lock:
+            if self._client is None:
+                self._client = Client(**self._client_kwargs)
+            return self._client
+
+    async def _get_client(self) -> Client:
+        if self._client is None:
+            await self._run(self._build_client)
+        return self._client
+
+    async def _run(self, f, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(f, *args, **kwargs))
+
+    async def _aiter(self, iterator) -> AsyncIterator:
+        end = object()
+        try:
+            while True:
+                item = await self._run(next, iterator, end)
+                if item is end:
+                    return
+                yield item
+        finally:
+            # closing the generator cancels its prefetched pages, also when the iteration is abandoned
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                try:
+                    future = self._executor.submit(close)
+                except RuntimeError:  # the worker threads are released
+                    close()
+                else:
+                    # the generator is closed even if the iteration is cancelled meanwhile
+                    await asyncio.shield(asyncio.wrap_future(future))
+
+    login = _blocking("login")
+    metrics = _blocking("metrics")
+    organization_info = _blocking("organization_info")
+
+    add_data_sample = _blocking("add_data_sample")
+    add_data_samples = _blocking("add_data_samples")
+    add_dataset = _blocking("add_dataset")
+    add_function = _blocking("add_function")
+    add_task = _blocking("add_task")
+    add_compute_plan = _blocking("add_compute_plan")
+    add_compute_plan_tasks = _blocking("add_compute_plan_tasks")
+    resume_compute_plan_submission = _blocking("resume_compute_plan_submission")
+
+    get_function = _blocking("get_function")
+    get_functions = _blocking("get_functions")
+    get_compute_plan = _blocking("get_compute_plan")
+    get_compute_plans = _blocking("get_compute_plans")
+    get_performances = _blocking("get_performances")
+    get_performances_many = _blocking("get_performances_many")
+    get_new_performances = _blocking("get_new_performances")
+    get_dataset = _blocking("get_dataset")
+    get_task = _blocking("get_task")
+    get_tasks = _blocking("get_tasks")
+    get_logs = _blocking("get_logs")
+    get_model = _blocking("get_model")
+    get_models = _blocking("get_models")
+    get_data_sample = _blocking("get_data_sample")
+    get_task_output_asset = _blocking("get_task_output_asset")
+
+    list_function = _blocking("list_function")
+    list_compute_plan = _blocking("list_compute_plan")
+    list_data_sample = _blocking("list_data_sample")
+    list_dataset = _blocking("list_dataset")
+    list_model = _blocking("list_model")
+    list_task = _blocking("list_task")
+    list_task_input_assets = _blocking("list_task_input_assets")
+    list_task_output_assets = _blocking("list_task_output_assets")
+    list_organization = _blocking("list_organization")
+
+    iter_function = _blocking_iter("iter_function")
+    iter_compute_plan = _blocking_iter("iter_compute_plan")
+    iter_data_sample = _blocking_iter("iter_data_sample")
+    iter_dataset = _blocking_iter("iter_dataset")
+    iter_model = _blocking_iter("iter_model")
+    iter_task = _blocking_iter("iter_task")
+
+    update_function = _blocking("update_function")
+    update_compute_plan = _blocking("update_compute_plan")
+    update_dataset = _blocking("update_dataset")
+    link_dataset_with_data_samples = _blocking("link_dataset_with_data_samples")
+    cancel_compute_plan = _blocking("cancel_compute_plan")
+
+    download_dataset = _blocking("download_dataset")
+    download_function = _blocking("download_function")
+    download_model = _blocking("download_model")
+    download_model_from_task = _blocking("download_model_from_task")
+    download_logs = _blocking("download_logs")
+    describe_function = _blocking("describe_function")
+    describe_dataset = _blocking("describe_dataset")
+
+    async def wait_compute_plan(
+        self,
+        key: str,
+        *,
+        timeout: Optional[float] = None,
+        polling_period: Optional[float] = None,
+        raise_on_failure: bool = True,
+    ) -> models.ComputePlan:
+        """Wait for the execution of the given compute plan to finish, cf `Client.wait_compute_plan`."""
+        return await self._wait(
+            key=key,
+            asset_getter="get_compute_plan",
+            polling_period=polling_period,
+            raise_on_failure=raise_on_failure,
+            timeout=timeout,
+            **_WAIT_STATUSES[schemas.Type.ComputePlan],
+        )
+
+    async def wait_task(
+        self,
+        key: str,
+        *,
+        timeout: Optional[float] = None,
+        polling_period: Optional[float] = None,
+        raise_on_failure: bool = True,
+    ) -> models.Task:
+        """Wait for the execution of the given task to finish, cf `Client.wait_task`."""
+        return await self._wait(
+            key=key,
+            asset_getter="get_task",
+            polling_period=polling_period,
+            raise_on_failure=raise_on_failure,
+            timeout=timeout,
+            **_WAIT_STATUSES[schemas.Type.Task],
+        )
+
+    async def wait_function(
+        self,
+        key: str,
+        *,
+        timeout: Optional[float] = None,
+        polling_period: Optional[float] = None,
+        raise_on_failure: bool = True,
+    ) -> models.Function:
+        """Wait for the build of the given function to finish, cf `Client.wait_function`."""
+        return await self._wait(
+            key=key,
+            asset_getter="get_function",
+            polling_period=polling_period,
+            raise_on_failure=raise_on_failure,
+            timeout=timeout,
+            **_WAIT_STATUSES[schemas.Type.Function],
+        )
+
+    async def iter_wait_compute_plans(
+        self, keys: List[str], *, timeout: Optional[float] = None, polling_period: Optional[float] = None
+    ) -> AsyncIterator[models.ComputePlan]:
+        """Yield the given compute plans as soon as they are finished, cf `Client.iter_wait_compute_plans`."""
+        async for compute_plan in self._iter_wait(
+            assets_getter="get_compute_plans",
+            asset_type=schemas.Type.ComputePlan,
+            keys=keys,
+            polling_period=polling_period,
+            timeout=timeout,
+            **_WAIT_STATUSES[schemas.Type.ComputePlan],
+        ):
+            yield compute_plan
+
+    async def iter_wait_tasks(
+        self, keys: List[str], *, timeout: Optional[float] = None, polling_period: Optional[float] = None
+    ) -> AsyncIterator[models.Task]:
+        """Yield the given tasks as soon as they are finished, cf `Client.iter_wait_tasks`."""
+        async for task in self._iter_wait(
+            assets_getter="get_tasks",
+            asset_type=schemas.Type.Task,
+            keys=keys,
+            polling_period=polling_period,
+            timeout=timeout,
+            **_WAIT_STATUSES[schemas.Type.Task],
+        ):
+            yield task
+
+    async def wait_compute_plans(
+        self,
+        keys: List[str],
+        *,
+        timeout: Optional[float] = None,
+        polling_period: Optional[float] = None,
+        raise_on_failure: bool = True,
+    ) -> List[models.ComputePlan]:
+        """Wait for the execution of the given compute plans to finish, cf `Client.wait_compute_plans`."""
+        finished = {
+            compute_plan.key: compute_plan
+            async for compute_plan in self.iter_wait_compute_plans(keys, timeout=timeout, polling_period=polling_period)
+        }
+        return _gather_wait_results(
+            keys, finished, raise_on_failure=raise_on_failure, **_WAIT_STATUSES[schemas.Type.ComputePlan]
+        )
+
+    async def wait_tasks(
+        self,
+        keys: List[str],
+        *,
+        timeout: Optional[float] = None,
+        polling_period: Optional[float] = None,
+        raise_on_failure: bool = True,
+    ) -> List[models.Task]:
+        """Wait for the execution of the given tasks to finish, cf `Client.wait_tasks`."""
+        finished = {
+            task.key: task async for task in self.iter_wait_tasks(keys, timeout=timeout, polling_period=polling_period)
+        }
+        return _gather_wait_results(
+            keys, finished, raise_on_failure=raise_on_failure, **_WAIT_STATUSES[schemas.Type.Task]
+        )
+
+    async def stream_performances(
+        self, key: str, *, timeout: Optional[float] = None, polling_period: Optional[float] = None
+    ) -> AsyncIterator[PerformanceRow]:
+        """Stream the performances of a compute plan as its tasks are done, cf `Client.stream_performances`."""
+        client = await self._get_client()
+        polls = _stream_polls(
+            polling_policy=client.polling_policy.with_period(polling_period),
+            timeout=timeout,
+            **_WAIT_STATUSES[schemas.Type.ComputePlan],
+        )
+        for delay, cursor in polls:
+            await asyncio.sleep(delay)
+            # the status is read first, so that the performances of a finished compute plan are all listed
+            compute_plan = await self._run(client.get_compute_plan, key)
+            rows, cursor = await self._run(client.get_new_performances, key, cursor)
+            for row in polls.send((compute_plan, rows, cursor)):
+                yield row
+
+    async def _iter_wait(
+        self,
+        *,
+        assets_getter: str,
+        asset_type: schemas.Type,
+        keys: List[str],
+        polling_period: Optional[float],
+        timeout: Optional[float] = None,
+        **kwargs,
+    ) -> AsyncIterator:
+        client = await self._get_client()
+        polls = _iter_wait_polls(
+            asset_type=asset_type,
+            keys=keys,
+            polling_policy=client.polling_policy.with_period(polling_period),
+            timeout=timeout,
+            **kwargs,
+        )
+        for delay, pending_keys in polls:
+            await asyncio.sleep(delay)
+            for asset in polls.send(await self._run(getattr(client, assets_getter), pending_keys)):
+                yield asset
+
+    async def _wait(
+        self,
+        *,
+        key: str,
+        asset_getter: str,
+        polling_period: Optional[float],
+        timeout: Optional[float] = None,
+        **kwargs,
+    ):
+        client = await self._get_client()
+        polls = _wait_polls(polling_policy=client.polling_policy.with_period(polling_period), timeout=timeout, **kwargs)
+        for delay in polls:
+            await asyncio.sleep(delay)
+            asset = await self._run(getattr(client, asset_getter), key)
+            polls.send(asset)
+        return asset
@@ -18,12 +18,34 @@ class BaseBackend(abc.ABC):
     def logout(self):
         pass
 
+    def close(self):
+        """Release the resources held by the backend, e.g. its pooled HTTP connections."""
+        pass
+
     @abc.abstractmethod
     def get(self, asset_type, key):
         raise NotImplementedError
 
     @abc.abstractmethod
-    def list(self, asset_type, filters=None, paginated=False):
+    def get_many(self, asset_type, keys):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def list(
+        self,
+        asset_type,
+        filters=None,
+        order_by=None,
+        ascending=False,
+        paginated=False,
+        limit=None,
+        offset=0,
+        cursor=None,
+    ):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def iter_list(self, asset_type, filters=None, order_by=None, ascending=False):
         raise NotImplementedError
 
     @abc.abstractmethod
@@ -38,6 +60,10 @@ class BaseBackend(abc.ABC):
     def add_compute_plan_tasks(self, spec, spec_options):
         raise NotImplementedError
 
+    @abc.abstractmethod
+    def resume_compute_plan_submission(self, spec, spec_options):
+        raise NotImplementedError
+
     @abc.abstractmethod
     def link_dataset_with_data_samples(self, dataset_key, data_sample_keys) -> List[str]:
         raise NotImplementedError
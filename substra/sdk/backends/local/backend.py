@@ -1,12 +1,15 @@
 import copy
+import functools
 import logging
 import shutil
+import threading
 import typing
 import warnings
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 from typing import Dict
+from typing import Iterator
 from typing import List
 from typing import NoReturn
 from typing import Optional
@@ -19,6 +22,7 @@ from substra.sdk import exceptions
 from substra.sdk import fs
 from substra.sdk import graph
 from substra.sdk import models
+from substra.sdk import performances
 from substra.sdk import schemas
 from substra.sdk.backends import base
 from substra.sdk.backends.local import compute
@@ -28,34 +32,49 @@ logger = logging.getLogger(__name__)
 
 _MAX_LEN_KEY_METADATA = 50
 _MAX_LEN_VALUE_METADATA = 100
+# number of assets read at once by `iter_list`
+_LIST_PAGE_SIZE = 1000
 
 
 class Local(base.BaseBackend):
+    """Backend creating the assets and executing the tasks locally.
+
+    The backends share the same db, each one acting as a different organization, and can be used from several
+    threads: the db is thread-safe and the counters of the compute plans are updated atomically.
+    """
+
     org_counter = 1
+    _org_counter_lock = threading.Lock()
 
-    def __init__(self, backend, backend_type, *args, **kwargs):
+    def __init__(self, backend, backend_type, *args, db_path=None, **kwargs):
         self._local_worker_dir = Path.cwd() / "local-worker"
         self._local_worker_dir.mkdir(exist_ok=True)
 
         self._execution_mode = backend_type
         # create a store to abstract the db
-        self._db = dal.DataAccess(backend, local_worker_dir=self._local_worker_dir)
+        self._db = dal.DataAccess(backend, local_worker_dir=self._local_worker_dir, db_path=db_path)
         self._worker = compute.Worker(
             self._db,
             local_worker_dir=self._local_worker_dir,
             debug_spawner=self._execution_mode,
         )
 
-        self._org_id = f"MyOrg{Local.org_counter}MSP"
-        self._org_name = f"MyOrg{Local.org_counter}MSP"
-        Local.org_counter += 1
-        self._db.add(
-            models.Organization(
-                id=self._org_id,
-                is_current=False,  # all orgs share the same db, catch and change this value at the "get"
-                creation_date=self.__now(),
+        with Local._org_counter_lock:
+            org_index = Local.org_counter
+            Local.org_counter += 1
+        self._org_id = f"MyOrg{org_index}MSP"
+        self._org_name = f"MyOrg{org_index}MSP"
+        try:
+            self._db.add(
+                models.Organization(
+                    id=self._org_id,
+                    is_current=False,  # all orgs share the same db, catch and change this value at the "get"
+                    creation_date=self.__now(),
+                )
             )
-        )
+        except exceptions.KeyAlreadyExistsError:
+            # the organization was created by a previous run stored in the same persistent db
+            pass
 
     def __now(self):
         """Return the current date in the iso format"""
@@ -78,9 +97,15 @@ class Local(base.BaseBackend):
     def logout(self):
         self._db.logout()
 
+    def close(self):
+        self._db.close()
+
     def get(self, asset_type, key):
         return self._db.get(asset_type, key)
 
+    def get_many(self, asset_type, keys):
+        return self._db.get_many(asset_type, keys)
+
     def get_task_output_asset(self, compute_task_key: str, identifier: str) -> models.OutputAsset:
         outputs = self._db.list(
             schemas.Type.OutputAsset, {"identifier": identifier, "compute_task_key": compute_task_key}
@@ -107,6 +132,26 @@ class Local(base.BaseBackend):
 
         return performances
 
+    def get_new_performances(self, key, cursor=None):
+        return self._db.get_new_performances(key, cursor)
+
+    def get_performances_many(self, keys):
+        rows = []
+        for key in dict.fromkeys(keys):
+            perf = self._db.get_performances(key)
+            rows.extend(
+                zip(
+                    perf.compute_plan_key,
+                    perf.task_key,
+                    perf.worker,
+                    perf.task_rank,
+                    perf.round_idx,
+                    perf.identifier,
+                    perf.performance,
+                )
+            )
+        return performances.ColumnarPerformances.from_rows(rows)
+
     def list(
         self,
         asset_type: schemas.Type,
@@ -114,18 +159,32 @@ class Local(base.BaseBackend):
         order_by: str = None,
         ascending: bool = False,
         paginated: bool = True,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        cursor: Optional[str] = None,
     ) -> List[models._Model]:
         """List the assets
 
         Args:
             paginated (bool, optional): True if server response is expected to be paginated.
                 Ignored for local backend (responses are never paginated)
+            limit (int, optional): maximum number of assets returned. Defaults to None (all the assets).
+            offset (int, optional): number of matching assets skipped. Defaults to 0.
+            cursor (str, optional): key of the last asset of the previous page. Defaults to None.
             others: cf [dal](substra.sdk.backends.local.dal.list)
 
         Returns:
             List[models._Model]: List of results
         """
-        results = self._db.list(type_=asset_type, filters=filters, order_by=order_by, ascending=ascending)
+        results = self._db.list(
+            type_=asset_type,
+            filters=filters,
+            order_by=order_by,
+            ascending=ascending,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+        )
         if asset_type == schemas.Type.Organization:
             for i, item in enumerate(results):
                 if item.id == self._org_id:
@@ -134,6 +193,31 @@ class Local(base.BaseBackend):
                     results[i] = my_org
         return results
 
+    def iter_list(
+        self,
+        asset_type: schemas.Type,
+        filters: Dict[str, List[str]] = None,
+        order_by: str = None,
+        ascending: bool = False,
+    ) -> Iterator[models._Model]:
+        """Iterate over the assets page by page, each page starting after the last asset of the previous one,
+        cf [list](substra.sdk.backends.local.backend.list)"""
+        cursor = None
+        while True:
+            page = self.list(
+                asset_type,
+                filters=filters,
+                order_by=order_by,
+                ascending=ascending,
+                limit=_LIST_PAGE_SIZE,
+                cursor=cursor,
+            )
+            yield from page
+            if len(page) < _LIST_PAGE_SIZE:
+                return
+            # the organizations are identified by their id
+            cursor = getattr(page[-1], "key", None) or page[-1].id
+
     @staticmethod
     def _check_metadata(metadata: Optional[Dict[str, str]]):
         if metadata is not None:
@@ -242,9 +326,7 @@ class Local(base.BaseBackend):
                     )
 
             # Add to the compute plan
-            compute_plan.task_count += 1
-            compute_plan.waiting_executor_slot_count += 1
-            compute_plan.status = models.ComputePlanStatus.created
+            self._db.modify(schemas.Type.ComputePlan, compute_plan_key, _add_task_to_compute_plan)
 
         elif not spec.compute_plan_key and (spec.rank == 0 or spec.rank is None):
             # Create a compute plan
@@ -274,7 +356,8 @@ class Local(base.BaseBackend):
 
                 progress_bar.update()
 
-        return compute_plan
+        # the tasks update the compute plan stored in the db
+        return self._db.get(schemas.Type.ComputePlan, compute_plan.key)
 
     def _add_function(self, key, spec, spec_options=None):
         self._check_metadata(spec.metadata)
@@ -351,9 +434,10 @@ class Local(base.BaseBackend):
 
         # update dataset(s) accordingly
         for dataset in datasets:
-            samples_list = dataset.data_sample_keys
-            if data_sample.key not in samples_list:
-                samples_list.append(data_sample.key)
+            if self._db.is_local(dataset.key, schemas.Type.Dataset):
+                self._db.modify(
+                    schemas.Type.Dataset, dataset.key, functools.partial(_add_key, "data_sample_keys", data_sample.key)
+                )
 
         return data_sample
 
@@ -492,16 +576,23 @@ class Local(base.BaseBackend):
                 return key
 
     def link_dataset_with_data_samples(self, dataset_key, data_sample_keys) -> List[str]:
-        dataset = self._db.get(schemas.Type.Dataset, dataset_key)
-        data_samples = []
+        dataset_is_local = self._db.is_local(dataset_key, schemas.Type.Dataset)
+        self._db.get(schemas.Type.Dataset, dataset_key)
         for key in data_sample_keys:
             data_sample = self._db.get(schemas.Type.DataSample, key)
             if dataset_key not in data_sample.data_manager_keys:
-                data_sample.data_manager_keys.append(dataset_key)
-                dataset.data_sample_keys.append(key)
+                if self._db.is_local(key, schemas.Type.DataSample):
+                    self._db.modify(
+                        schemas.Type.DataSample,
+                        key,
+                        functools.partial(_add_key, "data_manager_keys", dataset_key),
+                    )
+                if dataset_is_local:
+                    self._db.modify(
+                        schemas.Type.Dataset, dataset_key, functools.partial(_add_key, "data_sample_keys", key)
+                    )
             else:
                 logger.warning(f"Data sample already in dataset: {key}")
-            data_samples.append(data_sample)
         return data_sample_keys
 
     def download(self, asset_type, url_field_path, key, destination_file):
@@ -590,6 +681,33 @@ class Local(base.BaseBackend):
         compute_plan = self.__execute_compute_plan(spec, compute_plan, visited, tasks, spec_options)
         return compute_plan
 
+    def resume_compute_plan_submission(self, spec: schemas.ComputePlanSpec, spec_options: dict = None):
+        try:
+            self._db.get(schemas.Type.ComputePlan, spec.key)
+        except exceptions.NotFound:
+            return self.add(spec, spec_options)
+
+        tasks = spec.tasks or []
+        existing_tasks = self._db.get_many(schemas.Type.Task, [task.task_id for task in tasks])
+        tasks_spec = schemas.UpdateComputePlanTasksSpec(
+            key=spec.key,
+            tasks=[task for task in tasks if task.task_id not in existing_tasks],
+        )
+        return self.add_compute_plan_tasks(tasks_spec, spec_options)
+
+
+def _add_task_to_compute_plan(compute_plan: models.ComputePlan):
+    compute_plan.task_count += 1
+    compute_plan.waiting_executor_slot_count += 1
+    compute_plan.status = models.ComputePlanStatus.created
+
+
+def _add_key(field: str, key: str, asset: models._Model):
+    """Add the key to the list of keys `field` of the asset, if not already there."""
+    keys = getattr(asset, field)
+    if key not in keys:
+        keys.append(key)
+
 
 def _output_from_spec(outputs: Dict[str, schemas.ComputeTaskOutputSpec]) -> Dict[str, models.ComputeTaskOutput]:
     """Convert a list of schemas.ComputeTaskOuput to a list of models.ComputeTaskOutput"""
@@ -48,7 +48,8 @@ def _mkdir(path, delete_if_exists=False):
         if not delete_if_exists:
             return path
         shutil.rmtree(path)
-    path.mkdir(parents=True)
+    # the directory may be created by another thread in the meantime
+    path.mkdir(parents=True, exist_ok=True)
     return path
 
 
@@ -83,8 +84,11 @@ class Worker:
 
         performances = self._db.get_performances(compute_plan_key)
 
-        with (path).open("w", encoding="UTF-8") as json_file:
+        # the file is written under a temporary name first, so that it is never read partially written
+        tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+        with (tmp_path).open("w", encoding="UTF-8") as json_file:
             json.dump(performances.model_dump(), json_file, default=str)
+        os.replace(tmp_path, path)
 
     def _get_asset_unknown_type(self, asset_key, possible_types: List[schemas.Type]) -> Tuple[Any, schemas.Type]:
         for asset_type in possible_types:
@@ -97,21 +101,25 @@ class Worker:
             raise exceptions.NotFound(f"Wrong pk {asset_key}", 404)
         return asset, asset_type
 
-    def _update_cp(self, compute_plan: models.ComputePlan, update_live_performances: bool):
-        compute_plan.done_count += 1
-        compute_plan.waiting_executor_slot_count -= 1
-        if compute_plan.done_count == compute_plan.task_count:
-            compute_plan.status = models.ComputePlanStatus.done
-            compute_plan.end_date = datetime.datetime.now()
-            compute_plan.estimated_end_date = compute_plan.end_date
+    def _update_cp(self, compute_plan_key: str, update_live_performances: bool):
+        def task_done(compute_plan: models.ComputePlan):
+            compute_plan.done_count += 1
+            compute_plan.waiting_executor_slot_count -= 1
+            if compute_plan.done_count == compute_plan.task_count:
+                compute_plan.status = models.ComputePlanStatus.done
+                compute_plan.end_date = datetime.datetime.now()
+                compute_plan.estimated_end_date = compute_plan.end_date
 
-            compute_plan.duration = int((compute_plan.end_date - compute_plan.start_date).total_seconds())
+                compute_plan.duration = int((compute_plan.end_date - compute_plan.start_date).total_seconds())
+
+        # the counters are updated atomically, the tasks of a compute plan can be executed by several threads
+        self._db.modify(schemas.Type.ComputePlan, compute_plan_key, task_done)
 
         # save live performances
         if update_live_performances:
-            live_perf_path = Path(self._local_worker_dir / "live_performances" / compute_plan.key / "performances.json")
+            live_perf_path = Path(self._local_worker_dir / "live_performances" / compute_plan_key / "performances.json")
             _mkdir(live_perf_path.parent)
-            self._save_cp_performances_as_json(compute_plan.key, live_perf_path)
+            self._save_cp_performances_as_json(compute_plan_key, live_perf_path)
 
     def _get_cmd_template_inputs_outputs(
         self,
@@ -257,9 +265,9 @@ class Worker:
         with self._context(task.key) as task_dir:
             task.status = models.ComputeTaskStatus.executing
             task.start_date = datetime.datetime.now()
+            self._db.update(task)
             function = self._db.get_with_files(schemas.Type.Function, task.function.key)
             input_multiplicity = {i.identifier: i.multiple for i in function.inputs}
-            compute_plan = self._db.get(schemas.Type.ComputePlan, task.compute_plan_key)
 
             command_template = []
 
@@ -379,5 +387,6 @@ class Worker:
             # Set status
             task.status = models.ComputeTaskStatus.done
             task.end_date = datetime.datetime.now()
+            self._db.update(task)
 
-            self._update_cp(compute_plan=compute_plan, update_live_performances=update_live_performances)
+            self._update_cp(compute_plan_key=task.compute_plan_key, update_live_performances=update_live_performances)
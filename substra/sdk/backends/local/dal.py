@@ -6,6 +6,7 @@ import typing
 
 from substra.sdk import exceptions
 from substra.sdk import models
+from substra.sdk import performances
 from substra.sdk import schemas
 from substra.sdk.backends.local import db
 from substra.sdk.backends.remote import backend
@@ -19,8 +20,13 @@ class DataAccess:
     This is an intermediate layer between the backend and the local/remote data access.
     """
 
-    def __init__(self, remote_backend: typing.Optional[backend.Remote], local_worker_dir: pathlib.Path):
-        self._db = db.get_db()
+    def __init__(
+        self,
+        remote_backend: typing.Optional[backend.Remote],
+        local_worker_dir: pathlib.Path,
+        db_path: typing.Optional[str] = None,
+    ):
+        self._db = db.get_db(db_path)
         self._remote = remote_backend
         self._tmp_dir = tempfile.TemporaryDirectory(prefix=str(local_worker_dir) + "/")
 
@@ -57,9 +63,18 @@ class DataAccess:
         if self._remote:
             self._remote.logout()
 
+    def close(self):
+        if self._remote:
+            self._remote.close()
+
     def add(self, asset):
         return self._db.add(asset)
 
+    def modify(self, type_, key: str, modifier: typing.Callable[[models._Model], None]) -> models._Model:
+        """Apply `modifier` to the local asset and save it atomically, cf
+        [db](substra.sdk.backends.local.db.InMemoryDb.modify)."""
+        return self._db.modify(type_, key, modifier)
+
     def remote_download(self, asset_type, url_field_path, key, destination):
         self._remote.download(asset_type, url_field_path, key, destination)
 
@@ -108,6 +123,16 @@ class DataAccess:
                 return self._remote.get(type_, key)
             raise
 
+    def get_many(self, type_, keys: typing.List[str]) -> typing.Dict[str, models._Model]:
+        """Get the assets found locally, then the others from the remote platform in hybrid mode.
+        The keys not found are absent from the result.
+        """
+        assets = self._db.get_many(type_, keys)
+        missing_keys = [key for key in keys if key not in assets]
+        if missing_keys and self._remote is not None:
+            assets.update(self._remote.get_many(type_, missing_keys))
+        return assets
+
     def get_performances(self, key: str) -> models.Performances:
         """Get the performances of a given compute. Return models.Performances() object
         easily convertible to dict, filled by the performances data of done tasks that output a performance.
@@ -152,27 +177,89 @@ class DataAccess:
 
         return performances
 
+    def get_new_performances(
+        self, key: str, cursor: typing.Optional[dict] = None
+    ) -> typing.Tuple[typing.List[performances.PerformanceRow], dict]:
+        """Get the performances of the tasks of the compute plan done since the `cursor` returned by the
+        previous call, cf [select_new_tasks](substra.sdk.performances.select_new_tasks). The outputs of the
+        new tasks are listed at once.
+        """
+        done_tasks = [
+            task
+            for task in self.list(schemas.Type.Task, filters={"compute_plan_key": [key]})
+            if task.status == models.ComputeTaskStatus.done
+        ]
+        done_tasks.sort(key=lambda task: task.end_date, reverse=True)
+        new_tasks, new_cursor = performances.select_new_tasks(done_tasks, cursor)
+        if not new_tasks:
+            return [], new_cursor
+
+        outputs_by_task = {task.key: [] for task in new_tasks}
+        for output in self.list(schemas.Type.OutputAsset, {"compute_task_key": list(outputs_by_task)}):
+            if output.kind == schemas.AssetKind.performance:
+                outputs_by_task[output.compute_task_key].append(output)
+
+        rows = []
+        for task in new_tasks:
+            try:
+                round_idx = int(task.metadata.get("round_idx"))
+            except (TypeError, ValueError):
+                round_idx = None
+            rows.extend(
+                performances.PerformanceRow(
+                    compute_plan_key=key,
+                    task_key=task.key,
+                    worker=task.worker,
+                    task_rank=task.rank,
+                    round_idx=round_idx,
+                    identifier=output.identifier,
+                    performance=output.asset,
+                )
+                for output in outputs_by_task[task.key]
+            )
+        return rows, new_cursor
+
     def list(
-        self, type_: str, filters: typing.Dict[str, typing.List[str]], order_by: str = None, ascending: bool = False
+        self,
+        type_: str,
+        filters: typing.Dict[str, typing.List[str]],
+        order_by: str = None,
+        ascending: bool = False,
+        limit: typing.Optional[int] = None,
+        offset: int = 0,
+        cursor: typing.Optional[str] = None,
     ):
         """Joins the results of the [local db](substra.sdk.backends.local.db.list) and the
         [remote db](substra.sdk.backends.rest_client.list) in hybrid mode.
+
+        `limit`, `offset` and `cursor` are applied by the local db, or to the joined results in hybrid mode.
         """
+        if not self._remote:
+            return self._db.list(
+                type_=type_,
+                filters=filters,
+                order_by=order_by,
+                ascending=ascending,
+                limit=limit,
+                offset=offset,
+                cursor=cursor,
+            )
 
         local_assets = self._db.list(type_=type_, filters=filters, order_by=order_by, ascending=ascending)
 
         remote_assets = []
-        if self._remote:
-            try:
-                remote_assets = self._remote.list(
-                    asset_type=type_, filters=filters, order_by=order_by, ascending=ascending
-                )
-            except Exception as e:
-                logger.info(
-                    f"Could not list assets from the remote platform:\n{e}. \
-                    \nIf you are not logged to a remote platform, ignore this message."
-                )
-        return local_assets + remote_assets
+        try:
+            remote_assets = self._remote.list(asset_type=type_, filters=filters, order_by=order_by, ascending=ascending)
+        except Exception as e:
+            logger.info(
+                f"Could not list assets from the remote platform:\n{e}. \
+                \nIf you are not logged to a remote platform, ignore this message."
+            )
+        assets = local_assets + remote_assets
+        if cursor is not None:
+            keys = [getattr(asset, "key", None) or asset.id for asset in assets]
+            assets = assets[keys.index(cursor) + 1 :] if cursor in keys else []
+        return assets[offset : None if limit is None else offset + limit]
 
     def save_file(self, file_path: typing.Union[str, pathlib.Path], key: str):
         """Copy file or directory into the local temp dir to mimick
@@ -1,19 +1,180 @@
+import bisect
 import collections
+import itertools
+import json
 import logging
+import math
+import os
+import sqlite3
+import threading
 import typing
 
 from substra.sdk import exceptions
 from substra.sdk import models
+from substra.sdk import schemas
+from substra.sdk.backends.local import models as models_local
 
 logger = logging.getLogger(__name__)
 
+# attributes of the assets indexed by their value, the filters on the other attributes scan the assets
+INDEXED_FIELDS = ["key", "compute_plan_key", "compute_task_key", "identifier", "status", "owner"]
 
-class InMemoryDb:
-    """In memory data db."""
+# the task assets are stored with the key of their task, which the models of the remote assets do not hold
+_LOCAL_MODELS = {
+    schemas.Type.InputAsset: models_local.InputAssetLocal,
+    schemas.Type.OutputAsset: models_local.OutputAssetLocal,
+}
+
+# attributes of the assets kept sorted, the orderings on the other attributes sort the assets
+SORTED_FIELDS = ["creation_date", "rank"]
+
+
+class _Db:
+    """Filters shared by the dbs."""
+
+    @staticmethod
+    def _compile_metadata_filter(value: typing.Dict) -> typing.Callable[[typing.Dict], bool]:
+        """Compile a metadata filter into a predicate on the metadata of an asset."""
+        key = value["key"]
+        if value["type"] == models.MetadataFilterType.exists:
+            return lambda metadata: key in metadata
+
+        expected = str(value["value"])
+        # for is_equal and contains, if the key is not there then return False
+        if value["type"] == models.MetadataFilterType.is_equal:
+            return lambda metadata: metadata.get(key) is not None and str(metadata[key]) == expected
+        if value["type"] == models.MetadataFilterType.contains:
+            return lambda metadata: metadata.get(key) is not None and expected in str(metadata[key])
+        raise NotImplementedError
+
+    def _compile_filter(
+        self, attribute: str, values: typing.Union[typing.Dict, typing.List]
+    ) -> typing.Callable[[models._Model], bool]:
+        """Compile the filter on an attribute into a predicate on the assets.
+        For the metadata, it checks that all the given filters returns True (AND condition)"""
+        if attribute == "metadata":
+            conditions = [self._compile_metadata_filter(value) for value in values]
+            return lambda asset: all(condition(asset.metadata) for condition in conditions)
+
+        values = frozenset([values] if isinstance(values, str) else values)
+        return lambda asset: str(getattr(asset, attribute)) in values
+
+    def _filter_assets(
+        self, db_assets: typing.List[models._Model], filters: typing.Dict[str, typing.List[str]]
+    ) -> typing.List[models._Model]:
+        """Return assets matching al the given filters"""
+        predicates = [self._compile_filter(attribute, values) for attribute, values in filters.items()]
+        return [asset for asset in db_assets if all(predicate(asset) for predicate in predicates)]
+
+    @staticmethod
+    def _is_after(asset, seq: int, after: tuple, order_by: typing.Optional[str], ascending: bool) -> bool:
+        """Whether the asset is listed after the (value, insertion rank, key) entry `after`."""
+        if not order_by:
+            return seq > after[1]
+        value = getattr(asset, order_by)
+        if value == after[0]:
+            return seq > after[1]
+        return value > after[0] if ascending else value < after[0]
+
+
+def _copy(asset: models._Model) -> models._Model:
+    return asset.model_copy(deep=True)
+
+
+class InMemoryDb(_Db):
+    """In memory data db.
+
+    The assets are indexed on the `INDEXED_FIELDS` attributes and on their metadata. The indexes are maintained
+    by `add` and `update`.
+
+    The db is thread-safe: each asset type has its own lock, and the db stores and returns copies of the assets.
+    An asset modified in place must be given to `update` to be saved, and `modify` applies a read-modify-write
+    atomically, e.g. to increment the counters of a compute plan from several threads.
+    """
 
     def __init__(self):
+        # a lock per asset type, guarding the assets and the indexes of this type
+        self._locks = collections.defaultdict(threading.RLock)
+        self._locks_lock = threading.Lock()
         # assets stored per type and per key
         self._data = collections.defaultdict(dict)
+        # per type, attribute and value, the keys of the assets having this value
+        self._indexes = collections.defaultdict(lambda: collections.defaultdict(lambda: collections.defaultdict(set)))
+        # per type and key, the values under which the asset is indexed
+        self._indexed_values = collections.defaultdict(dict)
+        # per type, metadata key and value, the keys of the assets having this metadata
+        self._metadata_index = collections.defaultdict(
+            lambda: collections.defaultdict(lambda: collections.defaultdict(set))
+        )
+        # per type and metadata key, the keys of the assets having this metadata key, whatever its value
+        self._metadata_keys = collections.defaultdict(lambda: collections.defaultdict(set))
+        # per type and key, the metadata under which the asset is indexed
+        self._indexed_metadata = collections.defaultdict(dict)
+        # per type and key, the insertion rank of the asset, to list the assets in insertion order
+        self._seqs = collections.defaultdict(dict)
+        # per type and attribute, the (value, insertion rank, key) of the assets, sorted
+        self._sorted_indexes = collections.defaultdict(lambda: collections.defaultdict(list))
+        # per type and key, the values under which the asset is in the sorted indexes
+        self._sorted_values = collections.defaultdict(dict)
+
+    def _index(self, type_, key, asset):
+        values = {
+            attribute: str(getattr(asset, attribute)) for attribute in INDEXED_FIELDS if hasattr(asset, attribute)
+        }
+        for attribute, value in values.items():
+            self._indexes[type_][attribute][value].add(key)
+        self._indexed_values[type_][key] = values
+
+        if getattr(asset, "metadata", None) is None:
+            return
+        metadata = dict(asset.metadata)
+        for metadata_key, value in metadata.items():
+            self._metadata_keys[type_][metadata_key].add(key)
+            if value is not None:
+                self._metadata_index[type_][metadata_key][str(value)].add(key)
+        self._indexed_metadata[type_][key] = metadata
+
+    def _index_sorted(self, type_, key, asset):
+        """Move the asset in the sorted indexes of the attributes whose value changed."""
+        seq = self._seqs[type_][key]
+        previous_values = self._sorted_values[type_].get(key, {})
+        values = {
+            attribute: getattr(asset, attribute)
+            for attribute in SORTED_FIELDS
+            if getattr(asset, attribute, None) is not None
+        }
+        for attribute in SORTED_FIELDS:
+            if attribute in previous_values and previous_values[attribute] == values.get(attribute):
+                continue
+            entries = self._sorted_indexes[type_][attribute]
+            if attribute in previous_values:
+                entry = (previous_values[attribute], seq, key)
+                del entries[bisect.bisect_left(entries, entry)]
+            if attribute in values:
+                bisect.insort(entries, (values[attribute], seq, key))
+        self._sorted_values[type_][key] = values
+
+    def _unindex(self, type_, key):
+        for attribute, value in self._indexed_values[type_].pop(key, {}).items():
+            keys = self._indexes[type_][attribute][value]
+            keys.discard(key)
+            if not keys:
+                del self._indexes[type_][attribute][value]
+
+        for metadata_key, value in self._indexed_metadata[type_].pop(key, {}).items():
+            keys = self._metadata_keys[type_][metadata_key]
+            keys.discard(key)
+            if not keys:
+                del self._metadata_keys[type_][metadata_key]
+            if value is not None:
+                keys = self._metadata_index[type_][metadata_key][str(value)]
+                keys.discard(key)
+                if not keys:
+                    del self._metadata_index[type_][metadata_key][str(value)]
+
+    def _lock(self, type_) -> threading.RLock:
+        with self._locks_lock:
+            return self._locks[type_]
 
     def add(self, asset):
         """Add an asset."""
@@ -21,59 +182,95 @@ class InMemoryDb:
         key = getattr(asset, "key", None)
         if not key:
             key = asset.id
-        if key in self._data[type_]:
-            raise exceptions.KeyAlreadyExistsError(f"The asset key {key} of type {type_} has already been used.")
-        self._data[type_][key] = asset
+        stored_asset = _copy(asset)
+        with self._lock(type_):
+            if key in self._data[type_]:
+                raise exceptions.KeyAlreadyExistsError(f"The asset key {key} of type {type_} has already been used.")
+            self._data[type_][key] = stored_asset
+            self._seqs[type_][key] = len(self._seqs[type_])
+            self._index(type_, key, stored_asset)
+            self._index_sorted(type_, key, stored_asset)
         logger.info(f"{type_} with key '{key}' has been created.")
 
         return asset
 
-    def get(self, type_, key: str):
-        """Return asset."""
+    def _get(self, type_, key: str):
         try:
             return self._data[type_][key]
         except KeyError:
             raise exceptions.NotFound(f"Wrong pk {key}", 404)
 
-    def _match_asset(self, asset: models._Model, attribute: str, values: typing.Union[typing.Dict, typing.List]):
-        """Checks if an asset attributes matches the given values.
-        For the metadata, it checks that all the given filters returns True (AND condition)"""
-        if attribute == "metadata":
-            metadata_conditions = []
-            for value in values:
-                if value["type"] == models.MetadataFilterType.exists:
-                    metadata_conditions.append(value["key"] in asset.metadata.keys())
-
-                elif asset.metadata.get(value["key"]) is None:
-                    # for is_equal and contains, if the key is not there then return False
-                    metadata_conditions.append(False)
+    def get(self, type_, key: str):
+        """Return asset."""
+        with self._lock(type_):
+            asset = self._get(type_, key)
+        # the stored assets are never modified, they can be copied out of the lock
+        return _copy(asset)
 
-                elif value["type"] == models.MetadataFilterType.is_equal:
-                    metadata_conditions.append(str(value["value"]) == str(asset.metadata[value["key"]]))
+    def get_many(self, type_, keys: typing.Iterable[str]) -> typing.Dict[str, models._Model]:
+        """Return the assets of the given keys, the keys not found are absent from the result."""
+        with self._lock(type_):
+            assets = self._data[type_]
+            assets = {key: assets[key] for key in keys if key in assets}
+        return {key: _copy(asset) for key, asset in assets.items()}
 
-                elif value["type"] == models.MetadataFilterType.contains:
-                    metadata_conditions.append(str(value["value"]) in str(asset.metadata.get(value["key"])))
-                else:
-                    raise NotImplementedError
+    def _lookup(self, type_, attribute: str, values: typing.Union[str, typing.List[str]]) -> typing.Set[str]:
+        """Keys of the assets whose attribute has one of the given values."""
+        if isinstance(values, str):
+            values = [values]
+        index = self._indexes[type_][attribute]
+        return set().union(*(index[value] for value in values if value in index))
 
-            return all(metadata_conditions)
+    def _metadata_lookup(self, type_, value: typing.Dict) -> typing.Set[str]:
+        """Keys of the assets whose metadata match the metadata filter."""
+        key = value["key"]
+        if value["type"] == models.MetadataFilterType.exists:
+            return set(self._metadata_keys[type_].get(key, ()))
 
-        return str(getattr(asset, attribute)) in values
+        expected = str(value["value"])
+        index = self._metadata_index[type_].get(key, {})
+        if value["type"] == models.MetadataFilterType.is_equal:
+            return set(index.get(expected, ()))
+        if value["type"] == models.MetadataFilterType.contains:
+            # only the values of this metadata key are scanned
+            return set().union(*(keys for metadata_value, keys in index.items() if expected in metadata_value))
+        raise NotImplementedError
 
-    def _filter_assets(
-        self, db_assets: typing.List[models._Model], filters: typing.Dict[str, typing.List[str]]
-    ) -> typing.List[models._Model]:
-        """Return assets matching al the given filters"""
+    def _iter_sorted_index(
+        self, type_, order_by: str, ascending: bool, after: typing.Optional[tuple]
+    ) -> typing.Iterator[str]:
+        """Keys of the assets ordered on `order_by`, the assets with the same value in insertion order, starting
+        after the (value, insertion rank, key) entry `after` if given."""
+        entries = self._sorted_indexes[type_][order_by]
+        if ascending:
+            start = bisect.bisect_right(entries, after) if after else 0
+            for i in range(start, len(entries)):
+                yield entries[i][2]
+            return
 
-        matching_assets = [
-            asset
-            for asset in db_assets
-            if all(self._match_asset(asset, attribute, values) for attribute, values in filters.items())
-        ]
-        return matching_assets
+        end = len(entries)
+        if after:
+            # the assets with the same value as the cursor are listed in insertion order
+            value = after[0]
+            end = bisect.bisect_left(entries, (value,))
+            for i in range(bisect.bisect_right(entries, after), bisect.bisect_right(entries, (value, math.inf))):
+                yield entries[i][2]
+        while end > 0:
+            value = entries[end - 1][0]
+            start = bisect.bisect_left(entries, (value,), 0, end)
+            for i in range(start, end):
+                yield entries[i][2]
+            end = start
 
     def list(
-        self, type_: str, filters: typing.Dict[str, typing.List[str]], order_by: str = None, ascending: bool = False
+        self,
+        type_: str,
+        filters: typing.Dict[str, typing.List[str]],
+        order_by: str = None,
+        ascending: bool = False,
+        limit: typing.Optional[int] = None,
+        offset: int = 0,
+        cursor: typing.Optional[str] = None,
     ):
         """List assets by filters.
 
@@ -84,33 +281,283 @@ class InMemoryDb:
             order_by (str, optional): attribute name to order the results on. Defaults to None.
                 e.g. "name" for an ordering on name.
             ascending (bool, optional): to reverse ordering. Defaults to False (descending order).
+            limit (int, optional): maximum number of assets returned. Defaults to None (all the assets).
+            offset (int, optional): number of matching assets skipped. Defaults to 0.
+            cursor (str, optional): key of the last asset of the previous page, the assets listed are the ones
+                after it in the ordering. Defaults to None.
 
         Returns:
             List[Dict] : a List of assets (dicts)
         """
-        # get all assets of this type
-        assets = list(self._data[type_].values())
+        with self._lock(type_):
+            assets = self._list(type_, filters, order_by, ascending, limit, offset, cursor)
+        return [_copy(asset) for asset in assets]
+
+    def _list(self, type_, filters, order_by, ascending, limit, offset, cursor) -> typing.List[models._Model]:
+        filters = dict(filters or {})
+        data = self._data[type_]
+        seqs = self._seqs[type_]
+        indexes = self._indexes[type_]
+        matches = [
+            self._lookup(type_, attribute, filters.pop(attribute))
+            for attribute in [attribute for attribute in filters if attribute in indexes]
+        ]
+        if "metadata" in filters and self._indexed_metadata.get(type_):
+            matches.extend(self._metadata_lookup(type_, value) for value in filters.pop("metadata"))
+
+        after = None
+        if cursor is not None:
+            cursor_asset = self._get(type_, cursor)
+            after = (getattr(cursor_asset, order_by) if order_by else None, seqs[cursor], cursor)
+
+        # only the SORTED_FIELDS are indexed, the other fields are sorted below
+        sorted_index = self._sorted_indexes.get(type_, {}).get(order_by) if order_by else None
+        if sorted_index is not None and not matches and len(sorted_index) == len(data):
+            # walk the sorted index, only the assets returned are read
+            keys = self._iter_sorted_index(type_, order_by, ascending, after)
+        else:
+            if matches:
+                # intersect the smallest sets first
+                matches.sort(key=len)
+                keys = sorted(matches[0].intersection(*matches[1:]), key=seqs.__getitem__)
+            else:
+                # get all assets of this type
+                keys = list(data)
+            if after:
+                keys = [key for key in keys if self._is_after(data[key], seqs[key], after, order_by, ascending)]
+            if order_by:
+                keys.sort(key=lambda key: getattr(data[key], order_by), reverse=(not ascending))
+
+        assets = (data[key] for key in keys)
+        if filters:
+            predicates = [self._compile_filter(attribute, values) for attribute, values in filters.items()]
+            assets = (asset for asset in assets if all(predicate(asset) for predicate in predicates))
+        return list(itertools.islice(assets, offset, None if limit is None else offset + limit))
+
+    def update(self, asset):
+        type_ = asset.__class__.type_
+        key = asset.key
+        stored_asset = _copy(asset)
+
+        with self._lock(type_):
+            if key not in self._data[type_]:
+                raise exceptions.NotFound(f"Wrong pk {key}", 404)
+
+            self._unindex(type_, key)
+            self._data[type_][key] = stored_asset
+            self._index(type_, key, stored_asset)
+            self._index_sorted(type_, key, stored_asset)
+        return
+
+    def modify(self, type_, key: str, modifier: typing.Callable[[models._Model], None]) -> models._Model:
+        """Apply `modifier` to the asset and save it atomically, return the modified asset."""
+        with self._lock(type_):
+            asset = _copy(self._get(type_, key))
+            modifier(asset)
+            self.update(asset)
+        return asset
+
+
+class SqliteDb(_Db):
+    """Data db persisted in a SQLite file, so that the assets of a local run can be re-opened later.
+
+    The assets are stored as JSON, with a column for each of the `INDEXED_FIELDS` and for the metadata, so
+    that the filters on them are run by SQLite. The assets returned are copies: an asset modified in place
+    must be given to `update` to be saved.
+
+    The db is thread-safe, the queries being serialized on its connection. `modify` applies a read-modify-write
+    atomically within the process; the file must not be written by several processes at the same time.
+
+    Args:
+        path (str): path of the SQLite file, created if needed
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.RLock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        columns = ", ".join(f"{field} TEXT" for field in INDEXED_FIELDS if field != "key")
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS asset ("
+                "seq INTEGER PRIMARY KEY AUTOINCREMENT, type TEXT NOT NULL, key TEXT NOT NULL, "
+                f"{columns}, metadata TEXT, data TEXT NOT NULL, UNIQUE (type, key))"
+            )
+            for field in INDEXED_FIELDS:
+                if field != "key":
+                    self._connection.execute(f"CREATE INDEX IF NOT EXISTS asset_{field} ON asset (type, {field})")
+
+    def _execute(self, query: str, parameters=()) -> typing.List[tuple]:
+        with self._lock:
+            return self._connection.execute(query, parameters).fetchall()
+
+    @staticmethod
+    def _row(asset) -> typing.Dict[str, typing.Optional[str]]:
+        row = {
+            field: str(getattr(asset, field)) if hasattr(asset, field) else None
+            for field in INDEXED_FIELDS
+            if field != "key"
+        }
+        row["metadata"] = json.dumps(asset.metadata) if getattr(asset, "metadata", None) is not None else None
+        row["data"] = asset.model_dump_json()
+        return row
+
+    @staticmethod
+    def _load(type_, data: str) -> models._Model:
+        type_ = schemas.Type(type_)
+        return _LOCAL_MODELS.get(type_, models.SCHEMA_TO_MODEL[type_]).model_validate_json(data)
+
+    def add(self, asset):
+        """Add an asset."""
+        type_ = asset.__class__.type_
+        key = getattr(asset, "key", None)
+        if not key:
+            key = asset.id
+        row = self._row(asset)
+        try:
+            self._execute(
+                f"INSERT INTO asset (type, key, {', '.join(row)}) VALUES (?, ?, {', '.join('?' * len(row))})",
+                (schemas.Type(type_).value, str(key), *row.values()),
+            )
+        except sqlite3.IntegrityError:
+            raise exceptions.KeyAlreadyExistsError(f"The asset key {key} of type {type_} has already been used.")
+        logger.info(f"{type_} with key '{key}' has been created.")
+
+        return asset
+
+    def get(self, type_, key: str):
+        """Return asset."""
+        rows = self._execute("SELECT data FROM asset WHERE type = ? AND key = ?", (schemas.Type(type_).value, str(key)))
+        if not rows:
+            raise exceptions.NotFound(f"Wrong pk {key}", 404)
+        return self._load(type_, rows[0][0])
+
+    def get_many(self, type_, keys: typing.Iterable[str]) -> typing.Dict[str, models._Model]:
+        """Return the assets of the given keys, the keys not found are absent from the result."""
+        keys = list(keys)
+        rows = self._execute(
+            "SELECT key, data FROM asset WHERE type = ? AND key IN (SELECT value FROM json_each(?))",
+            (schemas.Type(type_).value, json.dumps([str(key) for key in keys])),
+        )
+        assets = {key: self._load(type_, data) for key, data in rows}
+        return {key: assets[str(key)] for key in keys if str(key) in assets}
+
+    @staticmethod
+    def _metadata_condition(value) -> typing.Tuple[str, list]:
+        query = "EXISTS (SELECT 1 FROM json_each(asset.metadata) WHERE json_each.key = ?"
+        if value["type"] == models.MetadataFilterType.exists:
+            return query + ")", [value["key"]]
+        if value["type"] == models.MetadataFilterType.is_equal:
+            return query + " AND CAST(json_each.value AS TEXT) = ?)", [value["key"], str(value["value"])]
+        if value["type"] == models.MetadataFilterType.contains:
+            return query + " AND instr(CAST(json_each.value AS TEXT), ?) > 0)", [value["key"], str(value["value"])]
+        raise NotImplementedError
+
+    def _sql_conditions(self, type_, filters: typing.Dict) -> typing.Tuple[typing.List[str], list]:
+        """SQL conditions of the filters on the `INDEXED_FIELDS` and on the metadata, popped from `filters`."""
+        conditions = ["type = ?"]
+        parameters = [schemas.Type(type_).value]
+        for attribute in [attribute for attribute in filters if attribute in INDEXED_FIELDS]:
+            values = filters.pop(attribute)
+            if isinstance(values, str):
+                values = [values]
+            conditions.append(f"{attribute} IN (SELECT value FROM json_each(?))")
+            parameters.append(json.dumps([str(value) for value in values]))
+        for value in filters.pop("metadata", []):
+            condition, condition_parameters = self._metadata_condition(value)
+            conditions.append(condition)
+            parameters.extend(condition_parameters)
+        return conditions, parameters
+
+    def list(
+        self,
+        type_: str,
+        filters: typing.Dict[str, typing.List[str]],
+        order_by: str = None,
+        ascending: bool = False,
+        limit: typing.Optional[int] = None,
+        offset: int = 0,
+        cursor: typing.Optional[str] = None,
+    ):
+        """List assets by filters, see [InMemoryDb.list](#list). The filters on the `INDEXED_FIELDS` and on
+        the metadata are run by SQLite, the other ones on the loaded assets."""
+        filters = dict(filters or {})
+        conditions, parameters = self._sql_conditions(type_, filters)
+
+        after = None
+        if cursor is not None:
+            rows = self._execute(
+                "SELECT seq, data FROM asset WHERE type = ? AND key = ?", (schemas.Type(type_).value, str(cursor))
+            )
+            if not rows:
+                raise exceptions.NotFound(f"Wrong pk {cursor}", 404)
+            cursor_seq, cursor_data = rows[0]
+            after = (getattr(self._load(type_, cursor_data), order_by) if order_by else None, cursor_seq, cursor)
+            if not order_by:
+                conditions.append("seq > ?")
+                parameters.append(cursor_seq)
+
+        query = f"SELECT seq, data FROM asset WHERE {' AND '.join(conditions)} ORDER BY seq"
+        paginated_in_sql = not filters and not order_by
+        if paginated_in_sql and (limit is not None or offset):
+            query += " LIMIT ? OFFSET ?"
+            parameters.extend([-1 if limit is None else limit, offset])
+
+        assets = []
+        for seq, data in self._execute(query, parameters):
+            asset = self._load(type_, data)
+            if order_by and after and not self._is_after(asset, seq, after, order_by, ascending):
+                continue
+            assets.append(asset)
 
         if filters:
             assets = self._filter_assets(assets, filters)
         if order_by:
             assets.sort(key=lambda x: getattr(x, order_by), reverse=(not ascending))
+        if not paginated_in_sql:
+            assets = assets[offset : None if limit is None else offset + limit]
 
         return assets
 
     def update(self, asset):
         type_ = asset.__class__.type_
-        key = asset.key
+        row = self._row(asset)
+        with self._lock:
+            cursor = self._connection.execute(
+                f"UPDATE asset SET {', '.join(f'{column} = ?' for column in row)} WHERE type = ? AND key = ?",
+                (*row.values(), schemas.Type(type_).value, str(asset.key)),
+            )
+            if cursor.rowcount == 0:
+                raise exceptions.NotFound(f"Wrong pk {asset.key}", 404)
+        return
 
-        if key not in self._data[type_]:
-            raise exceptions.NotFound(f"Wrong pk {key}", 404)
+    def modify(self, type_, key: str, modifier: typing.Callable[[models._Model], None]) -> models._Model:
+        """Apply `modifier` to the asset and save it atomically, return the modified asset."""
+        with self._lock:
+            asset = self.get(type_, key)
+            modifier(asset)
+            self.update(asset)
+        return asset
 
-        self._data[type_][key] = asset
-        return
+    def close(self):
+        with self._lock:
+            self._connection.close()
 
 
 db = InMemoryDb()
 
+# the SQLite dbs opened, per path, shared by the clients like the in memory db
+_sqlite_dbs: typing.Dict[str, SqliteDb] = {}
+_sqlite_dbs_lock = threading.Lock()
+
 
-def get_db():
-    return db
+def get_db(path: typing.Optional[str] = None):
+    """Return the in memory db, or the SQLite db stored at `path` if given."""
+    if not path:
+        return db
+    path = os.path.realpath(os.path.expanduser(str(path)))
+    with _sqlite_dbs_lock:
+        if path not in _sqlite_dbs:
+            _sqlite_dbs[path] = SqliteDb(path)
+        return _sqlite_dbs[path]
@@ -0,0 +1,184 @@
+import collections
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+import uuid
+from typing import Callable
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SIZE = 10 * 1024 * 1024 * 1024
+
+_CHECKSUM_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+_INDEX_FILE = "index.json"
+
+
+def _is_checksum(checksum: Optional[str]) -> bool:
+    return isinstance(checksum, str) and _CHECKSUM_PATTERN.match(checksum) is not None
+
+
+def _link_or_copy(source: str, destination: str) -> None:
+    try:
+        os.link(source, destination)
+    except OSError:
+        # e.g. the cache and the destination are not on the same file system
+        shutil.copyfile(source, destination)
+
+
+class ArtifactCache:
+    """On-disk cache of the downloaded files, addressed by their SHA-256 checksum.
+
+    The files are hard linked from the cache to their destination, so that a file downloaded many times is
+    stored once: a cached file must not be modified in place. The least recently used files are evicted
+    once the cache exceeds `max_size`. The order of use of the files is kept in an index file of the cache,
+    the files themselves are never touched, as they may be linked from the downloaded files. A cached file
+    still linked from a downloaded file is not evicted, as removing it would not free any space.
+
+    Args:
+        directory (str): directory of the cache, created if needed
+        max_size (int, optional): maximum size of the cache, in bytes. Defaults to 10 GiB.
+    """
+
+    def __init__(self, directory: str, max_size: Optional[int] = None):
+        self.directory = os.path.abspath(os.path.expanduser(directory))
+        self.max_size = max_size if max_size is not None else DEFAULT_MAX_SIZE
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+        # size of the cached files, by checksum, from the least to the most recently used
+        self._entries = collections.OrderedDict()
+        self._size = 0
+        self._load_index()
+
+    def _path(self, checksum: str) -> str:
+        return os.path.join(self.directory, checksum[:2], checksum)
+
+    def _index_path(self) -> str:
+        return os.path.join(self.directory, _INDEX_FILE)
+
+    def _load_index(self) -> None:
+        """Read the order of use of the cached files, the files missing from the index being the least
+        recently used ones."""
+        try:
+            with open(self._index_path()) as f:
+                index = [checksum for checksum in json.load(f) if _is_checksum(checksum)]
+        except (OSError, ValueError, TypeError):
+            index = []
+
+        on_disk = {}
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not _is_checksum(name):
+                    continue
+                try:
+                    stat = os.stat(os.path.join(root, name))
+                except FileNotFoundError:
+                    continue
+                on_disk[name] = stat
+
+        ranks = {checksum: rank for rank, checksum in enumerate(index)}
+        for checksum in sorted(on_disk, key=lambda c: (ranks.get(c, -1), on_disk[c].st_mtime)):
+            self._entries[checksum] = on_disk[checksum].st_size
+            self._size += on_disk[checksum].st_size
+
+    def _save_index(self) -> None:
+        tmp_path = f"{self._index_path()}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(list(self._entries), f)
+        os.replace(tmp_path, self._index_path())
+
+    def _use(self, checksum: str, size: int) -> None:
+        self._size += size - self._entries.pop(checksum, 0)
+        self._entries[checksum] = size
+
+    def _forget(self, checksum: str) -> None:
+        self._size -= self._entries.pop(checksum, 0)
+
+    def get(self, checksum: str, destination: str) -> bool:
+        """Link the cached file with the given checksum to `destination`, return whether it was cached."""
+        if not _is_checksum(checksum):
+            return False
+        path = self._path(checksum)
+        if os.path.exists(destination):
+            os.remove(destination)
+        try:
+            _link_or_copy(path, destination)
+            size = os.path.getsize(path)
+        except FileNotFoundError:
+            with self._lock:
+                if checksum in self._entries:
+                    self._forget(checksum)
+                    self._save_index()
+            return False
+        with self._lock:
+            self._use(checksum, size)
+            self._save_index()
+        logger.debug(f"{destination} found in the artifact cache")
+        return True
+
+    def put(self, checksum: str, source: str) -> None:
+        """Store the file `source` in the cache, under the given checksum."""
+        if not _is_checksum(checksum):
+            return
+        path = self._path(checksum)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # the file is linked under a temporary name first, so that a partial file is never visible
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        _link_or_copy(source, tmp_path)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._use(checksum, os.path.getsize(path))
+            self._evict()
+            self._save_index()
+
+    def fetch(self, checksum: str, destination: str, download: Callable[[str], str]) -> str:
+        """Get the file with the given checksum from the cache, or download it with `download(destination)`
+        and store it in the cache. `download` must verify the checksum of the file. The cache is bypassed if
+        the checksum is not a SHA-256 hexadecimal digest.
+        """
+        if not _is_checksum(checksum):
+            logger.debug(f"Invalid checksum {checksum!r}, {destination} is downloaded without the artifact cache")
+            download(destination)
+            return destination
+        if self.get(checksum, destination):
+            return destination
+        download(destination)
+        self.put(checksum, destination)
+        return destination
+
+    def size(self) -> int:
+        """Total size of the cached files, in bytes."""
+        with self._lock:
+            return self._size
+
+    def evict(self) -> None:
+        """Remove the least recently used files until the cache fits in its maximum size."""
+        with self._lock:
+            self._evict()
+            self._save_index()
+
+    def _evict(self) -> None:
+        # the files linked from a downloaded file do not hold any space of their own: they are kept, and are
+        # not counted in the space to free
+        excess = self._size - self.max_size
+        for checksum in list(self._entries):
+            if excess <= 0:
+                break
+            path = self._path(checksum)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                excess -= self._entries[checksum]
+                self._forget(checksum)
+                continue
+            excess -= stat.st_size
+            if stat.st_nlink > 1:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self._forget(checksum)
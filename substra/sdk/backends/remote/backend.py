@@ -1,24 +1,44 @@
+import collections
+import concurrent.futures
+import itertools
 import json
 import logging
 import math
+import threading
+import time
 from copy import deepcopy
 from typing import Dict
+from typing import Iterator
 from typing import List
+from typing import Optional
+from typing import Tuple
 from typing import Union
 
 from substra.sdk import compute_plan
 from substra.sdk import exceptions
+from substra.sdk import metrics
 from substra.sdk import models
+from substra.sdk import performances
 from substra.sdk import schemas
 from substra.sdk.backends import base
+from substra.sdk.backends.remote import artifact_cache
+from substra.sdk.backends.remote import download
 from substra.sdk.backends.remote import rest_client
+from substra.sdk.backends.remote import submission
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_RETRY_TIMEOUT = 5 * 60
 AUTO_BATCHING = "auto_batching"
 BATCH_SIZE = "batch_size"
-DOWNLOAD_CHUNK_SIZE = 1024
+MAX_IN_FLIGHT_BATCHES = "max_in_flight_batches"
+# value of the batch size for batches sized from the server latency and the size of the tasks
+ADAPTIVE_BATCH_SIZE = "auto"
+# number of keys fetched per request, and number of requests in flight, when getting many assets by key
+GET_MANY_CHUNK_SIZE = 100
+GET_MANY_WORKERS = 4
+# number of model checksums kept from the fetched models, so that downloading them does not fetch them again
+MODEL_CHECKSUMS_SIZE = 1024
 
 
 def _find_asset_field(data, field):
@@ -28,10 +48,61 @@ def _find_asset_field(data, field):
     return data
 
 
+def _asset_key(asset: models._Model) -> str:
+    # the organizations are identified by their id
+    return getattr(asset, "key", None) or asset.id
+
+
+def _round_idx(value) -> Optional[int]:
+    """Round index of a task, None for the tasks which are not part of a round."""
+    try:
+        return int(value)
+    except TypeError:
+        return None
+
+
+def _performance_row(compute_plan_key: str, result: dict) -> performances.PerformanceRow:
+    """Performance row of a result of the performances listing of a compute plan."""
+    return performances.PerformanceRow(
+        compute_plan_key=compute_plan_key,
+        task_key=result["compute_task"]["key"],
+        worker=result["compute_task"]["worker"],
+        task_rank=result["compute_task"]["rank"],
+        round_idx=_round_idx(result["compute_task"]["round_idx"]),
+        identifier=result["identifier"],
+        performance=result["perf"],
+    )
+
+
 class Remote(base.BaseBackend):
-    def __init__(self, url, insecure, token, retry_timeout, backend_type):
-        self._client = rest_client.Client(url, insecure, token)
+    def __init__(
+        self,
+        url,
+        insecure,
+        token,
+        retry_timeout,
+        backend_type,
+        response_cache_size=0,
+        retry_policy=None,
+        metrics_registry=None,
+        cache_dir=None,
+        cache_max_size=None,
+        verify_checksums=True,
+    ):
+        self._metrics = metrics_registry or metrics.MetricsRegistry()
+        self._artifact_cache = artifact_cache.ArtifactCache(cache_dir, cache_max_size) if cache_dir else None
+        self._client = rest_client.Client(
+            url,
+            insecure,
+            token,
+            cache_size=response_cache_size,
+            retry_policy=retry_policy,
+            metrics_registry=self._metrics,
+        )
         self._retry_timeout = retry_timeout or DEFAULT_RETRY_TIMEOUT
+        self._verify_checksums = verify_checksums
+        self._model_checksums = collections.OrderedDict()
+        self._model_checksums_lock = threading.Lock()
         assert backend_type == self.backend_mode
 
     @property
@@ -45,10 +116,41 @@ class Remote(base.BaseBackend):
     def logout(self):
         return self._client.logout()
 
+    def close(self):
+        self._client.close()
+
     def get(self, asset_type, key):
         """Get an asset by key."""
-        asset = self._client.get(asset_type.to_server(), key)
-        return models.SCHEMA_TO_MODEL[asset_type](**asset)
+        asset = models.SCHEMA_TO_MODEL[asset_type](**self._client.get(asset_type.to_server(), key))
+        self._keep_model_checksum(asset)
+        return asset
+
+    def _keep_model_checksum(self, asset) -> None:
+        """Keep the checksum of a fetched model, used to verify it when it is downloaded."""
+        if not isinstance(asset, models.OutModel) or asset.address is None or not asset.address.checksum:
+            return
+        with self._model_checksums_lock:
+            self._model_checksums[asset.key] = asset.address.checksum
+            self._model_checksums.move_to_end(asset.key)
+            if len(self._model_checksums) > MODEL_CHECKSUMS_SIZE:
+                self._model_checksums.popitem(last=False)
+
+    def get_many(self, asset_type, keys) -> Dict[str, models._Model]:
+        """Get assets by keys, listing them by chunks of keys fetched concurrently.
+        The keys not found are absent from the result.
+        """
+        keys = list(dict.fromkeys(keys))
+        chunks = [keys[i : i + GET_MANY_CHUNK_SIZE] for i in range(0, len(keys), GET_MANY_CHUNK_SIZE)]
+        model = models.SCHEMA_TO_MODEL[asset_type]
+
+        def list_chunk(chunk):
+            return self._client.list(asset_type.to_server(), filters={"key": chunk})
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=GET_MANY_WORKERS) as executor:
+            assets = {asset["key"]: model(**asset) for page in executor.map(list_chunk, chunks) for asset in page}
+        for asset in assets.values():
+            self._keep_model_checksum(asset)
+        return assets
 
     def get_task_output_asset(self, compute_task_key: str, identifier: str) -> models.OutputAsset:
         outputs = self._client.list(
@@ -61,14 +163,19 @@ class Remote(base.BaseBackend):
             raise exceptions.TaskAssetNotFoundError(compute_task_key=compute_task_key, identifier=identifier)
         elif len(outputs) > 1:
             raise exceptions.TaskAssetMultipleFoundError(compute_task_key=compute_task_key, identifier=identifier)
-        return models.OutputAsset(**outputs[0])
+        output = models.OutputAsset(**outputs[0])
+        self._keep_model_checksum(output.asset)
+        return output
 
     def list_task_output_assets(self, compute_task_key: str) -> List[models.OutputAsset]:
         outputs = self._client.list(
             schemas.Type.Task.to_server(),
             path=compute_task_key + "/output_assets",
         )
-        return [models.OutputAsset(**output) for output in outputs]
+        outputs = [models.OutputAsset(**output) for output in outputs]
+        for output in outputs:
+            self._keep_model_checksum(output.asset)
+        return outputs
 
     def list_task_input_assets(self, compute_task_key: str) -> List[models.InputAsset]:
         inputs = self._client.list(
@@ -81,8 +188,7 @@ class Remote(base.BaseBackend):
         """Get an compute plan performance by key."""
 
         compute_plan = self.get(schemas.Type.ComputePlan, key)
-        response = self._client.list(schemas.Type.ComputePlan.to_server(), path=key + "/perf", paginated=False)
-        results = response["results"]
+        results = self._client.list(schemas.Type.ComputePlan.to_server(), path=key + "/perf", paginated=True)
 
         performances = models.Performances()
 
@@ -97,16 +203,65 @@ class Remote(base.BaseBackend):
             performances.worker.append(test_task["compute_task"]["worker"])
             performances.task_key.append(test_task["compute_task"]["key"])
             performances.task_rank.append(test_task["compute_task"]["rank"])
-            try:
-                round_idx = int(test_task["compute_task"]["round_idx"])
-            except TypeError:
-                round_idx = None
-            performances.round_idx.append(round_idx)
+            performances.round_idx.append(_round_idx(test_task["compute_task"]["round_idx"]))
             performances.identifier.append(test_task["identifier"])
             performances.performance.append(test_task["perf"])
 
         return performances
 
+    def get_performances_many(self, keys: List[str]) -> performances.ColumnarPerformances:
+        """Get the performances of many compute plans, fetched concurrently."""
+
+        def rows(key):
+            results = self._client.list(schemas.Type.ComputePlan.to_server(), path=key + "/perf", paginated=True)
+            return [_performance_row(key, result) for result in results]
+
+        keys = list(dict.fromkeys(keys))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=GET_MANY_WORKERS) as executor:
+            return performances.ColumnarPerformances.from_rows(
+                row for compute_plan_rows in executor.map(rows, keys) for row in compute_plan_rows
+            )
+
+    def get_new_performances(
+        self, key: str, cursor: Optional[dict] = None
+    ) -> Tuple[List[performances.PerformanceRow], dict]:
+        """Get the performances of the tasks of the compute plan done since the `cursor` returned by the
+        previous call, cf [select_new_tasks](substra.sdk.performances.select_new_tasks). Only the new tasks are
+        listed, from the most recently done one, and their performances are listed by chunks of task keys.
+        """
+        new_tasks, new_cursor = performances.select_new_tasks(
+            self.iter_list(
+                schemas.Type.Task,
+                filters={"compute_plan_key": [key], "status": [models.ComputeTaskStatus.done.value]},
+                order_by="end_date",
+                ascending=False,
+            ),
+            cursor,
+        )
+        task_keys = [
+            task.key
+            for task in new_tasks
+            if any(output.kind == schemas.AssetKind.performance for output in task.function.outputs)
+        ]
+        chunks = [task_keys[i : i + GET_MANY_CHUNK_SIZE] for i in range(0, len(task_keys), GET_MANY_CHUNK_SIZE)]
+
+        def list_chunk(chunk):
+            results = self._client.list(
+                schemas.Type.ComputePlan.to_server(),
+                path=key + "/perf",
+                filters={"compute_task_key": chunk},
+            )
+            # the listing is also filtered here, in case the server ignores the filter
+            chunk = set(chunk)
+            return [result for result in results if result["compute_task"]["key"] in chunk]
+
+        rows_by_task = {task_key: [] for task_key in task_keys}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=GET_MANY_WORKERS) as executor:
+            for results in executor.map(list_chunk, chunks):
+                for result in results:
+                    rows_by_task[result["compute_task"]["key"]].append(_performance_row(key, result))
+        return [row for task_rows in rows_by_task.values() for row in task_rows], new_cursor
+
     def list(
         self,
         asset_type: schemas.Type,
@@ -114,15 +269,54 @@ class Remote(base.BaseBackend):
         order_by: str = None,
         ascending: bool = False,
         paginated: bool = True,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        cursor: Optional[str] = None,
     ) -> List[models._Model]:
         """List assets of asset_type with filters.
 
+        With `limit`, `offset` or `cursor`, the pages are requested one at a time, and only until the requested
+        assets are received. The server pages the assets by page number: the pages holding only the assets
+        skipped by `offset` are not requested, but the asset matching `cursor` is searched from the first page.
+
         Args:
-            cf [rest_client](substra.sdk.backends.rest_client.list)
+            limit (int, optional): maximum number of assets returned. Defaults to None (all the assets).
+            offset (int, optional): number of matching assets skipped. Defaults to 0.
+            cursor (str, optional): key of the last asset of the previous page. Defaults to None.
+            others: cf [rest_client](substra.sdk.backends.rest_client.list)
 
         Returns:
             List[models._Model] : a List of assets
         """
+        model = models.SCHEMA_TO_MODEL[asset_type]
+        if cursor is not None:
+            pages = self._client.iter_list(
+                asset_type=asset_type.to_server(),
+                filters=filters,
+                order_by=order_by,
+                ascending=ascending,
+                prefetch=False,
+            )
+            try:
+                assets = (model(**asset) for page in pages for asset in page)
+                for asset in assets:
+                    if _asset_key(asset) == cursor:
+                        break
+                return list(itertools.islice(assets, offset, None if limit is None else offset + limit))
+            finally:
+                pages.close()
+
+        if limit is not None or offset:
+            assets = self._client.list_range(
+                asset_type=asset_type.to_server(),
+                filters=filters,
+                order_by=order_by,
+                ascending=ascending,
+                offset=offset,
+                limit=limit,
+            )
+            return [model(**asset) for asset in assets]
+
         assets = self._client.list(
             asset_type=asset_type.to_server(),
             filters=filters,
@@ -130,7 +324,32 @@ class Remote(base.BaseBackend):
             ascending=ascending,
             paginated=paginated,
         )
-        return [models.SCHEMA_TO_MODEL[asset_type](**asset) for asset in assets]
+        return [model(**asset) for asset in assets]
+
+    def iter_list(
+        self,
+        asset_type: schemas.Type,
+        filters: Dict[str, Union[List[str], dict]] = None,
+        order_by: str = None,
+        ascending: bool = False,
+    ) -> Iterator[models._Model]:
+        """Iterate over the assets of asset_type with filters, page by page.
+
+        Args:
+            cf [rest_client](substra.sdk.backends.rest_client.iter_list)
+
+        Yields:
+            models._Model : the assets
+        """
+        model = models.SCHEMA_TO_MODEL[asset_type]
+        for page in self._client.iter_list(
+            asset_type=asset_type.to_server(),
+            filters=filters,
+            order_by=order_by,
+            ascending=ascending,
+        ):
+            for asset in page:
+                yield model(**asset)
 
     def _add(self, asset, data, files=None):
         data = deepcopy(data)  # make a deep copy for avoiding modification by reference
@@ -177,9 +396,10 @@ class Remote(base.BaseBackend):
         """Add an asset."""
         spec_options = spec_options or {}
         asset_type = spec.__class__.type_
-        # Remove auto_batching and batch_size from spec_options
+        # Remove auto_batching, batch_size and max_in_flight_batches from spec_options
         auto_batching = spec_options.pop(AUTO_BATCHING, False)
         batch_size = spec_options.pop(BATCH_SIZE, None)
+        max_in_flight_batches = spec_options.pop(MAX_IN_FLIGHT_BATCHES, 1)
 
         if asset_type == schemas.Type.DataSample:
             # data sample corner case
@@ -189,7 +409,7 @@ class Remote(base.BaseBackend):
             )
         elif asset_type == schemas.Type.ComputePlan:
             cp = self._add_compute_plan(spec, spec_options)
-            self._add_tasks_from_computeplan(spec, spec_options, auto_batching, batch_size)
+            self._add_tasks_from_computeplan(spec, spec_options, auto_batching, batch_size, max_in_flight_batches)
             return cp
         elif asset_type == schemas.Type.Task:
             cp_spec = schemas.ComputePlanSpec(name=f"{spec.key}")
@@ -211,33 +431,57 @@ class Remote(base.BaseBackend):
             response = self._add(schemas.Type.ComputePlan, data)
         return models.ComputePlan(**response)
 
-    def _add_tasks_from_computeplan(self, spec, spec_options, auto_batching, batch_size):
-        """Register batch(es) of tasks."""
+    def _add_tasks_from_computeplan(self, spec, spec_options, auto_batching, batch_size, max_in_flight_batches=1):
+        """Register batch(es) of tasks.
+
+        Independent batches are sent concurrently, up to `max_in_flight_batches` at the same time.
+        With the `auto` batch size, the batches are sized from the latency of the previous ones.
+        """
         tasks = compute_plan.get_tasks(spec)
+        batch_sizer = None
         if auto_batching:
             if not batch_size:
                 raise ValueError(
                     "Batch size must be defined to create a compute plan \
                     with the auto-batching feature."
                 )
-            # Split tasks by batch
-            batches = []
-            for i in range(math.ceil(len(tasks) / batch_size)):
-                start = i * batch_size
-                end = min(len(tasks), (i + 1) * batch_size)
-                batches.append(tasks[start:end])
+            if batch_size == ADAPTIVE_BATCH_SIZE:
+                batch_sizer = submission.AdaptiveBatchSizer()
+                batches = batch_sizer.batches(tasks)
+            else:
+                # Split tasks by batch
+                batches = []
+                for i in range(math.ceil(len(tasks) / batch_size)):
+                    start = i * batch_size
+                    end = min(len(tasks), (i + 1) * batch_size)
+                    batches.append(tasks[start:end])
         else:
             batches = [tasks]
 
-        for batch in batches:
+        def add_batch(batch):
+            ts = time.time()
             try:
                 self._add_tasks(batch, spec_options)
             except exceptions.AlreadyExists:
-                logger.warning(
-                    "Skipping already submitted tasks, probably because of a timeout error. "
-                    "Check that the compute plan has the right number of tasks once the submission is complete."
-                )
-                continue
+                # the batch has been at least partly registered, probably before a timeout error
+                self._add_missing_tasks(batch, spec_options)
+            latency = time.time() - ts
+            self._metrics.record_batch(len(batch), latency)
+            if batch_sizer is not None:
+                batch_sizer.record(latency)
+
+        submission.submit_batches(batches, add_batch, max_in_flight=max_in_flight_batches)
+
+    def _add_missing_tasks(self, batch, spec_options):
+        """Submit the tasks of the batch which are not registered yet."""
+        existing_tasks = self.get_many(schemas.Type.Task, [task.key for task in batch])
+        missing_tasks = [task for task in batch if task.key not in existing_tasks]
+        logger.warning(
+            f"{len(existing_tasks)} tasks of the batch already exist, probably because of a timeout error: "
+            f"submitting the {len(missing_tasks)} other tasks"
+        )
+        if missing_tasks:
+            self._add_tasks(missing_tasks, spec_options)
 
     def _add_tasks(self, batch, spec_options):
         batch_data = []
@@ -280,10 +524,41 @@ class Remote(base.BaseBackend):
             return self._update(asset_type, key, data, files=files)
 
     def add_compute_plan_tasks(self, spec, spec_options):
-        # Remove auto_batching and batch_size from spec_options
+        # Remove auto_batching, batch_size and max_in_flight_batches from spec_options
         auto_batching = spec_options.pop(AUTO_BATCHING, False)
         batch_size = spec_options.pop(BATCH_SIZE, None)
-        self._add_tasks_from_computeplan(spec, spec_options, auto_batching, batch_size)
+        max_in_flight_batches = spec_options.pop(MAX_IN_FLIGHT_BATCHES, 1)
+        self._add_tasks_from_computeplan(spec, spec_options, auto_batching, batch_size, max_in_flight_batches)
+
+        return self.get(
+            asset_type=schemas.Type.ComputePlan,
+            key=spec.key,
+        )
+
+    def resume_compute_plan_submission(self, spec, spec_options):
+        """Create the compute plan if needed, and submit its tasks which are not registered yet."""
+        auto_batching = spec_options.pop(AUTO_BATCHING, False)
+        batch_size = spec_options.pop(BATCH_SIZE, None)
+        max_in_flight_batches = spec_options.pop(MAX_IN_FLIGHT_BATCHES, 1)
+
+        try:
+            self.get(schemas.Type.ComputePlan, spec.key)
+        except exceptions.NotFound:
+            self._add_compute_plan(spec, spec_options)
+
+        existing_keys = {
+            task["key"]
+            for page in self._client.iter_list(schemas.Type.Task.to_server(), filters={"compute_plan_key": [spec.key]})
+            for task in page
+        }
+        tasks = spec.tasks or []
+        missing_tasks = [task for task in tasks if task.task_id not in existing_keys]
+        logger.info(
+            f"{len(tasks) - len(missing_tasks)} tasks of the compute plan already exist, "
+            f"submitting the {len(missing_tasks)} other tasks"
+        )
+        tasks_spec = schemas.UpdateComputePlanTasksSpec(key=spec.key, tasks=missing_tasks)
+        self._add_tasks_from_computeplan(tasks_spec, spec_options, auto_batching, batch_size, max_in_flight_batches)
 
         return self.get(
             asset_type=schemas.Type.ComputePlan,
@@ -304,22 +579,41 @@ class Remote(base.BaseBackend):
         )
         return data_sample_keys
 
-    def _download(self, url: str, destination_file: str) -> str:
-        response = self._client.get_data(url, stream=True)
-        with open(destination_file, "wb") as f:
-            for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
-                f.write(chunk)
-
-        return destination_file
+    def _download(self, url: str, destination_file: str, checksum: str = None) -> str:
+        """Download the file, through the artifact cache if enabled. The checksum, the SHA-256 of the decoded
+        content of the file, addresses the file in the cache and is verified if `verify_checksums` is enabled.
+        The cache is bypassed if the checksum is not verified, as an unverified file could be stored under the
+        checksum of another content."""
+        if not self._verify_checksums:
+            return download.download(self._client, url, destination_file)
+        if self._artifact_cache is None or not checksum:
+            return download.download(self._client, url, destination_file, checksum=checksum)
+        return self._artifact_cache.fetch(
+            checksum,
+            destination_file,
+            lambda destination: download.download(self._client, url, destination, checksum=checksum),
+        )
 
     def download(self, asset_type: schemas.Type, url_field_path: str, key: str, destination: str) -> str:
         data = self.get(asset_type, key)
         url = _find_asset_field(data, url_field_path)
-        return self._download(url, destination)
+        # the file fields hold the checksum of the file next to its address
+        checksum = _find_asset_field(data, url_field_path.rsplit(".", 1)[0] + ".checksum")
+        return self._download(url, destination, checksum)
 
     def download_model(self, key: str, destination_file: str) -> str:
+        """Download the file of a model. If `verify_checksums` is enabled, the checksum of the model is read
+        from its metadata: they are fetched first, with one more request, unless the model was fetched before,
+        e.g. by `get_task_output_asset`."""
         url = f"{self._client.base_url}/model/{key}/file/"
-        return self._download(url, destination_file)
+        checksum = None
+        if self._verify_checksums:
+            with self._model_checksums_lock:
+                checksum = self._model_checksums.get(key)
+            if checksum is None:
+                address = self.get(schemas.Type.Model, key).address
+                checksum = address.checksum if address else None
+        return self._download(url, destination_file, checksum)
 
     def download_logs(self, task_key: str, destination_file: str = None) -> str:
         """Download the logs of a failed task. If destination_file is set, return the full
@@ -0,0 +1,231 @@
+import concurrent.futures
+import logging
+import os
+from typing import Optional
+
+import requests
+
+from substra.sdk import exceptions
+from substra.sdk.hasher import Hasher
+
+logger = logging.getLogger(__name__)
+
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+# files larger than a segment are downloaded by segments in parallel, if the server accepts range requests
+SEGMENT_SIZE = 64 * 1024 * 1024
+SEGMENT_WORKERS = 4
+# number of times a transfer is resumed after the connection dropped
+MAX_RESUMES = 5
+# number of times a file is downloaded again when its checksum does not match
+MAX_CHECKSUM_RETRIES = 2
+
+
+def _part_size(path: str) -> int:
+    return os.path.getsize(path) if os.path.exists(path) else 0
+
+
+def _content_length(response: requests.Response) -> Optional[int]:
+    try:
+        return int(response.headers["Content-Length"])
+    except (KeyError, ValueError):
+        return None
+
+
+def _accepts_ranges(response: requests.Response) -> bool:
+    # byte ranges apply to the encoded content: they can not be used to rebuild a compressed response
+    return (
+        response.headers.get("Accept-Ranges") == "bytes"
+        and response.headers.get("Content-Encoding", "identity") == "identity"
+    )
+
+
+def _get(client, url: str, start: int = 0, end: Optional[int] = None) -> requests.Response:
+    headers = {}
+    if start or end is not None:
+        headers["Range"] = f"bytes={start}-{'' if end is None else end - 1}"
+    return client.get_data(url, stream=True, headers=headers)
+
+
+def _hash_file(hasher: Hasher, path: str) -> None:
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b""):
+                hasher.update(chunk)
+
+
+def _write_response(response: requests.Response, path: str, start: int, hasher: Optional[Hasher] = None) -> None:
+    if response.status_code == 206:
+        mode = "ab"
+    elif start == 0:
+        # the server sent the whole file
+        mode = "wb"
+        if hasher is not None:
+            hasher.reset()
+    else:
+        raise exceptions.InvalidResponse(response, "The server does not support range requests")
+
+    with open(path, mode) as f:
+        for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+            f.write(chunk)
+            if hasher is not None:
+                hasher.update(chunk)
+
+
+def _download_range(
+    client,
+    url: str,
+    path: str,
+    start: int = 0,
+    end: Optional[int] = None,
+    response: requests.Response = None,
+    hasher: Optional[Hasher] = None,
+) -> None:
+    """Download the bytes of the file from `start` to `end` (excluded, None for the end of the file) into `path`.
+
+    The bytes already present in `path` are kept and the transfer starts after them. The transfer is also
+    resumed when the connection drops, or when the server closes it before sending the whole range.
+    The bytes written are fed to `hasher`, which must already hold the bytes present in `path`.
+    """
+    for _ in range(MAX_RESUMES + 1):
+        offset = start + _part_size(path)
+        if end is not None and offset >= end:
+            return
+        try:
+            if response is None:
+                response = _get(client, url, offset, end)
+            _write_response(response, path, start, hasher)
+            if end is None:
+                return
+        except (requests.exceptions.ChunkedEncodingError, requests.exceptions.ConnectionError) as e:
+            logger.warning(f"Download of {url} interrupted ({e}): resuming at byte {start + _part_size(path)}")
+        finally:
+            if response is not None:
+                response.close()
+                response = None
+
+    if end is not None and start + _part_size(path) >= end:
+        return
+    raise exceptions.SDKException(f"Download of {url} did not complete after {MAX_RESUMES} resumes")
+
+
+def _download_segments(
+    client,
+    url: str,
+    part_file: str,
+    size: int,
+    segment_size: int,
+    max_workers: int,
+    hasher: Optional[Hasher] = None,
+) -> None:
+    """Download the file by segments in parallel, then assemble them into `part_file`.
+
+    Each segment is stored in its own file, so that an interrupted download resumes every segment
+    where it stopped. The segments are fed to `hasher` in order while they are assembled.
+    """
+    bounds = [(start, min(start + segment_size, size)) for start in range(0, size, segment_size)]
+    segment_files = [f"{part_file}.{index}" for index in range(len(bounds))]
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(_download_range, client, url, path, start, end)
+            for path, (start, end) in zip(segment_files, bounds)
+        ]
+        try:
+            for future in futures:
+                future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+    if hasher is not None:
+        hasher.reset()
+    with open(part_file, "wb") as f:
+        for path in segment_files:
+            with open(path, "rb") as segment:
+                for chunk in iter(lambda: segment.read(DOWNLOAD_CHUNK_SIZE), b""):
+                    f.write(chunk)
+                    if hasher is not None:
+                        hasher.update(chunk)
+    for path in segment_files:
+        os.remove(path)
+
+
+def _download_part_file(client, url: str, part_file: str, segment_size: int, max_workers: int, hasher) -> None:
+    offset = _part_size(part_file)
+    try:
+        response = _get(client, url, offset)
+    except exceptions.HTTPError as e:
+        if not offset or e.status_code != 416:
+            raise
+        # the part file does not match the file on the server anymore
+        os.remove(part_file)
+        offset = 0
+        response = _get(client, url)
+
+    size = _content_length(response)
+    if (
+        response.status_code == 200
+        and max_workers > 1
+        and size is not None
+        and size > segment_size
+        and _accepts_ranges(response)
+    ):
+        response.close()
+        _download_segments(client, url, part_file, size, segment_size, max_workers, hasher)
+    else:
+        if hasher is not None and response.status_code == 206:
+            # the bytes downloaded by a previous call are only read to resume the hash
+            _hash_file(hasher, part_file)
+        end = offset + size if response.status_code == 206 and size is not None else None
+        _download_range(client, url, part_file, end=end, response=response, hasher=hasher)
+
+
+def download(
+    client,
+    url: str,
+    destination_file: str,
+    segment_size: int = SEGMENT_SIZE,
+    max_workers: int = SEGMENT_WORKERS,
+    checksum: Optional[str] = None,
+) -> str:
+    """Download the file at `url` to `destination_file`.
+
+    The file is first written to `<destination_file>.part`, which is moved to `destination_file` once
+    complete: if a previous download of the same file was interrupted, it is resumed from the part file.
+    Large files are downloaded by segments in parallel when the server accepts range requests.
+
+    If `checksum` is given, the SHA-256 hash of the file is computed while it is written and compared to it.
+    The hash is the one of the decoded content: a response compressed with a `Content-Encoding` is hashed
+    after decompression, as written to `destination_file`.
+    On mismatch, the file is downloaded again from scratch, up to `MAX_CHECKSUM_RETRIES` times.
+
+    Args:
+        client (rest_client.Client): client used to send the requests
+        url (str): URL of the file
+        destination_file (str): path of the downloaded file
+        segment_size (int, optional): size in bytes of the segments downloaded in parallel
+        max_workers (int, optional): maximum number of segments downloaded at the same time,
+            1 to download the file in a single request
+        checksum (str, optional): expected SHA-256 checksum of the decoded content of the file
+
+    Returns:
+        str: the path of the downloaded file
+
+    Raises:
+        exceptions.ChecksumMismatch: the checksum of the file does not match, after all the retries
+    """
+    part_file = f"{destination_file}.part"
+    for retry in range(MAX_CHECKSUM_RETRIES + 1):
+        hasher = Hasher() if checksum else None
+        _download_part_file(client, url, part_file, segment_size, max_workers, hasher)
+        if hasher is None or hasher.compute() == checksum:
+            break
+
+        error = exceptions.ChecksumMismatch(url, checksum, hasher.compute())
+        os.remove(part_file)
+        if retry == MAX_CHECKSUM_RETRIES:
+            raise error
+        logger.warning(f"{error}: downloading it again")
+
+    os.replace(part_file, destination_file)
+    return destination_file
@@ -0,0 +1,81 @@
+import io
+import os
+import uuid
+from typing import IO
+from typing import Dict
+from typing import Union
+
+
+def _filename(name: str, file: IO[bytes]) -> str:
+    # same file name as the one sent by `requests` for the `files` argument
+    path = getattr(file, "name", None)
+    if isinstance(path, str) and path and path[0] != "<" and path[-1] != ">":
+        return os.path.basename(path)
+    return name
+
+
+def _remaining_size(file: IO[bytes]) -> int:
+    position = file.tell()
+    size = file.seek(0, io.SEEK_END) - position
+    file.seek(position)
+    return size
+
+
+class MultipartEncoder:
+    """`multipart/form-data` body, read lazily from the files it contains.
+
+    The encoder is a file-like object with a known length: `requests` streams it to the server
+    by blocks, so the files are never loaded in memory at once. Its reading starts at the current
+    position of the files, which should be rewound before building a new encoder for a retry.
+
+    Args:
+        fields (dict): form fields, keys = field names, values = field values
+        files (dict): files to upload, keys = field names, values = binary file objects
+        boundary (str, optional): boundary between the parts. Defaults to a random one.
+    """
+
+    def __init__(
+        self,
+        fields: Dict[str, Union[str, bytes]],
+        files: Dict[str, IO[bytes]],
+        boundary: str = None,
+    ):
+        self.boundary = boundary or uuid.uuid4().hex
+        self._parts = []
+        for name, value in fields.items():
+            if isinstance(value, str):
+                value = value.encode()
+            self._parts.append(io.BytesIO(self._part_headers(name) + value + b"\r\n"))
+        for name, file in files.items():
+            self._parts.append(io.BytesIO(self._part_headers(name, _filename(name, file))))
+            self._parts.append(file)
+            self._parts.append(io.BytesIO(b"\r\n"))
+        self._parts.append(io.BytesIO(f"--{self.boundary}--\r\n".encode()))
+
+        self._length = sum(_remaining_size(part) for part in self._parts)
+        self._current = 0
+
+    def _part_headers(self, name: str, filename: str = None) -> bytes:
+        disposition = f'form-data; name="{name}"'
+        if filename is not None:
+            disposition += f'; filename="{filename}"'
+        return f"--{self.boundary}\r\nContent-Disposition: {disposition}\r\n\r\n".encode()
+
+    @property
+    def content_type(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __len__(self) -> int:
+        return self._length
+
+    def read(self, size: int = -1) -> bytes:
+        chunks = []
+        while self._current < len(self._parts) and size != 0:
+            chunk = self._parts[self._current].read(size)
+            if not chunk:
+                self._current += 1
+                continue
+            chunks.append(chunk)
+            if size > 0:
+                size -= len(chunk)
+        return b"".join(chunks)
@@ -1,22 +1,37 @@
+import collections
+import concurrent.futures
+import copy
+import itertools
 import json
 import logging
+import math
+import threading
 import time
+import urllib.parse
 from datetime import datetime
 from datetime import timedelta
 from datetime import timezone
 from typing import Dict
+from typing import Iterator
 from typing import List
+from typing import Optional
 from typing import Union
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from substra.sdk import exceptions
+from substra.sdk import metrics
 from substra.sdk import schemas
 from substra.sdk import utils
+from substra.sdk.backends.remote import multipart
 from substra.sdk.backends.remote import request_formatter
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_PAGE_WORKERS = 4
+
 
 def _warn_of_session_expiration(expiration: str, minimum_log_level=logging.INFO) -> None:
     log_level = minimum_log_level
@@ -34,6 +49,102 @@ def _warn_of_session_expiration(expiration: str, minimum_log_level=logging.INFO)
     logger.log(log_level, f"Your session will expire {expires_at}")
 
 
+class _ResponseCache:
+    """Bounded cache of JSON responses, revalidated with conditional requests.
+
+    The least recently used responses are evicted first. Only responses carrying an `ETag` or a
+    `Last-Modified` header are stored, as they are the only ones that can be revalidated.
+    """
+
+    def __init__(self, max_size: int):
+        self._max_size = max_size
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def validators(self, url: str) -> Dict[str, str]:
+        """Headers making the request conditional on the cached response being outdated."""
+        with self._lock:
+            entry = self._entries.get(url)
+        if entry is None:
+            return {}
+        headers = {}
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def get(self, url: str):
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None:
+                return None
+            self._entries.move_to_end(url)
+        # the content is copied so that callers can not alter the cached response
+        return copy.deepcopy(entry["content"])
+
+    def put(self, url: str, response: requests.Response, content) -> None:
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        with self._lock:
+            if not etag and not last_modified:
+                self._entries.pop(url, None)
+                return
+            self._entries[url] = {
+                "etag": etag,
+                "last_modified": last_modified,
+                "content": copy.deepcopy(content),
+            }
+            self._entries.move_to_end(url)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+
+def _get_next_page_urls(first_page: dict) -> Optional[List[str]]:
+    """Infer the URLs of all the pages following the first one, from its `count` and page size.
+
+    Returns None if the URLs cannot be inferred (e.g. the server does not use page number pagination).
+    """
+    url_next = first_page.get("next")
+    if not url_next:
+        return []
+
+    count = first_page.get("count")
+    page_size = len(first_page.get("results") or [])
+    if not count or not page_size:
+        return None
+
+    parsed_url = urllib.parse.urlsplit(url_next)
+    query = urllib.parse.parse_qs(parsed_url.query, keep_blank_values=True)
+    if query.get("page") != ["2"]:
+        return None
+
+    urls = []
+    for page in range(2, math.ceil(count / page_size) + 1):
+        query["page"] = [str(page)]
+        urls.append(urllib.parse.urlunsplit(parsed_url._replace(query=urllib.parse.urlencode(query, doseq=True))))
+    return urls
+
+
+def _request_body_size(response: Optional[requests.Response]) -> int:
+    body = getattr(getattr(response, "request", None), "body", None)
+    try:
+        return len(body) if body is not None else 0
+    except TypeError:  # body streamed from an iterator
+        return 0
+
+
+def _response_body_size(response: Optional[requests.Response], streamed: bool) -> int:
+    if response is None:
+        return 0
+    try:
+        return int(response.headers["Content-Length"])
+    except (KeyError, ValueError):
+        pass
+    # the content of a streamed response is not loaded in memory, it can not be measured here
+    return 0 if streamed else len(response.content or b"")
+
+
 class Client:
     """REST Client to communicate with Substra server."""
 
@@ -41,7 +152,17 @@ class Client:
     def base_url(self) -> str:
         return self._base_url
 
-    def __init__(self, url, insecure, token):
+    def __init__(
+        self,
+        url,
+        insecure,
+        token,
+        pool_maxsize=DEFAULT_POOL_MAXSIZE,
+        page_workers=DEFAULT_PAGE_WORKERS,
+        cache_size=0,
+        retry_policy: Optional[utils.RetryPolicy] = None,
+        metrics_registry: Optional[metrics.MetricsRegistry] = None,
+    ):
         self._default_kwargs = {
             "verify": not insecure,
         }
@@ -53,6 +174,31 @@ class Client:
             raise exceptions.SDKException("url required to connect to the Substra server")
         self._base_url = url[:-1] if url.endswith("/") else url
         self._token = None  # filled in by self.login
+        self._session = self._create_session(pool_maxsize)
+        # number of pages fetched concurrently when listing paginated assets, 1 to follow the pages one by one
+        self._page_workers = page_workers
+        # assets fetched by key are revalidated with conditional requests, cache disabled if cache_size is 0
+        self._cache = _ResponseCache(cache_size) if cache_size else None
+        # requests failing on a transient error (e.g. gateway unavailable) are retried according to this policy
+        self._retry_policy = retry_policy or utils.RetryPolicy()
+        self._metrics = metrics_registry or metrics.MetricsRegistry()
+
+    @staticmethod
+    def _create_session(pool_maxsize: int) -> requests.Session:
+        """Create the HTTP session shared by all the requests of this client.
+
+        Connections are kept alive and reused from the pool, which avoids a new TCP/TLS handshake
+        for each request (pagination, batches, polling).
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def close(self) -> None:
+        """Close the HTTP session and release the pooled connections."""
+        self._session.close()
 
     def login(self, username, password):
         # we do not use self._headers in order to avoid existing tokens to be sent alongside the
@@ -68,7 +214,9 @@ class Client:
             "password": password,
         }
         try:
-            r = requests.post(f"{self._base_url}/api-token-auth/", data=data, headers=headers, **self._default_kwargs)
+            r = self._session.post(
+                f"{self._base_url}/api-token-auth/", data=data, headers=headers, **self._default_kwargs
+            )
             r.raise_for_status()
         except requests.exceptions.RequestException as e:
             if isinstance(e, requests.exceptions.HTTPError):
@@ -109,7 +257,7 @@ class Client:
         if self._token is None:
             return
         try:
-            r = requests.delete(
+            r = self._session.delete(
                 f"{self._base_url}/active-api-tokens/",
                 params={"id": self._token["id"]},
                 headers=self._headers,
@@ -134,39 +282,56 @@ class Client:
         """Base request helper."""
 
         if request_name == "get":
-            fn = requests.get
+            fn = self._session.get
         elif request_name == "post":
-            fn = requests.post
+            fn = self._session.post
         elif request_name == "put":
-            fn = requests.put
+            fn = self._session.put
         else:
             raise NotImplementedError
 
         # override default request arguments with input arguments
         kwargs = dict(self._default_kwargs)
         kwargs.update(request_kwargs)
+        headers = {**self._headers, **kwargs.pop("headers", {})}
 
         # rewind files so that they are properly sent in retries as well
         if "files" in kwargs:
             for file in kwargs["files"].values():
                 file.seek(0)
+            # stream the files to the server instead of building the whole request body in memory
+            body = multipart.MultipartEncoder(kwargs.pop("data", None) or {}, kwargs.pop("files"))
+            kwargs["data"] = body
+            headers["Content-Type"] = body.content_type
 
         # do HTTP request and catch generic exceptions
         try:
-            r = fn(url, headers=self._headers, **kwargs)
+            r = fn(url, headers=headers, **kwargs)
             r.raise_for_status()
 
         except requests.exceptions.RequestException as e:
             raise exceptions.from_request_exception(e)
         return r
 
-    @utils.retry_on_exception(exceptions=(exceptions.GatewayUnavailable))
     def _request(self, request_name, url, **request_kwargs):
-        """Wrapper to __request to emit a log for each HTTP request."""
+        """Wrapper to __request to retry failed requests according to the retry policy."""
+        attempts = itertools.count()
+
+        def _request():
+            if next(attempts):
+                self._metrics.record_retry(request_name, url)
+            return self.__logged_request(request_name, url, **request_kwargs)
+
+        return self._retry_policy.call(_request)
+
+    def __logged_request(self, request_name, url, **request_kwargs):
+        """Wrapper to __request to emit a log and record metrics for each HTTP request."""
         ts = time.time()
         error = None
+        response = None
         try:
-            return self.__request(request_name, url, **request_kwargs)
+            response = self.__request(request_name, url, **request_kwargs)
+            return response
         except Exception as e:
             error = e.__class__.__name__
             raise
@@ -174,6 +339,14 @@ class Client:
             te = time.time()
             elaps = (te - ts) * 1000
             logger.debug(f"{request_name} {url}: done in {elaps:.2f}ms error={error}")
+            self._metrics.record_request(
+                request_name,
+                url,
+                te - ts,
+                error=error,
+                bytes_sent=_request_body_size(response),
+                bytes_received=_response_body_size(response, streamed=request_kwargs.get("stream", False)),
+            )
 
     def request(
         self,
@@ -204,10 +377,7 @@ class Client:
                 if paginated is False, a List otherwise.
         """
 
-        path = path or ""
-        url = f"{self._base_url}/{asset_type}/{path}"
-        if not url.endswith("/"):
-            url = url + "/"  # server requires a suffix /
+        url = self._build_url(asset_type, path)
 
         # first request
         response = self._request(
@@ -219,33 +389,96 @@ class Client:
         if not json_response:
             return response
 
+        json_resp = self._parse_json(response)
+        if not paginated:
+            return json_resp
+        # in case response is expected to be paginated, get all pages
+        # and extract full asset list from returned structure
+        return [item for page in self._iter_pages(request_name, json_resp, **request_kwargs) for item in page]
+
+    def _build_url(self, asset_type: str, path: str = None) -> str:
+        path = path or ""
+        url = f"{self._base_url}/{asset_type}/{path}"
+        if not url.endswith("/"):
+            url = url + "/"  # server requires a suffix /
+        return url
+
+    @staticmethod
+    def _parse_json(response):
         try:
-            json_resp = response.json()
-            if not paginated:
-                return json_resp
-            # in case response is expected to be paginated, get all pages
-            url_next = json_resp["next"]
-            while url_next:
-                resp = self._request(
-                    request_name,
-                    url_next,
-                    **request_kwargs,
-                )
-                json_resp["results"].extend(resp.json()["results"])
-                url_next = resp.json()["next"]
-            # extract full asset list from returned structure
-            return json_resp["results"]
+            return response.json()
         except ValueError as e:
             msg = f"Cannot parse response to JSON: {e}"
             raise exceptions.InvalidResponse(response, msg)
 
+    def _get_page(self, request_name, url, **request_kwargs) -> dict:
+        return self._parse_json(self._request(request_name, url, **request_kwargs))
+
+    def _iter_pages(
+        self, request_name, first_page: dict, prefetch: bool = True, **request_kwargs
+    ) -> Iterator[List[Dict]]:
+        """Yield the results of each page in order, starting with the already fetched first page.
+
+        When the page URLs can be inferred from the first page and `prefetch` is set, the next pages are
+        fetched concurrently, with at most `page_workers` pages in flight. Otherwise the `next` links are
+        followed one by one, each page being requested once the previous one is consumed.
+        """
+        page_urls = _get_next_page_urls(first_page) if prefetch else None
+        last_page = first_page
+        if not page_urls or self._page_workers <= 1:
+            yield first_page["results"]
+        else:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self._page_workers) as executor:
+                urls = iter(page_urls)
+                # the next pages are requested before the first one is handed to the caller
+                pending = collections.deque(
+                    executor.submit(self._get_page, request_name, url, **request_kwargs)
+                    for url in itertools.islice(urls, self._page_workers)
+                )
+                try:
+                    yield first_page["results"]
+                    while pending:
+                        last_page = pending.popleft().result()
+                        url = next(urls, None)
+                        if url:
+                            pending.append(executor.submit(self._get_page, request_name, url, **request_kwargs))
+                        yield last_page["results"]
+                finally:
+                    for future in pending:
+                        future.cancel()
+
+        # follow the links for pages which could not be inferred, or were added since the first request
+        url_next = last_page["next"]
+        while url_next:
+            last_page = self._get_page(request_name, url_next, **request_kwargs)
+            yield last_page["results"]
+            url_next = last_page["next"]
+
     def get(self, name, key):
-        """Get asset by key."""
-        return self.request(
-            "get",
-            name,
-            path=f"{key}",
-        )
+        """Get asset by key.
+
+        If the response cache is enabled, the request is conditional: when the asset has not changed
+        (304 Not Modified), the cached asset is returned.
+        """
+        if self._cache is None:
+            return self.request(
+                "get",
+                name,
+                path=f"{key}",
+            )
+
+        url = self._build_url(name, key)
+        response = self._request("get", url, headers=self._cache.validators(url))
+        if response.status_code == 304:
+            asset = self._cache.get(url)
+            if asset is not None:
+                return asset
+            # the cached response has been evicted in the meantime
+            response = self._request("get", url)
+
+        asset = self._parse_json(response)
+        self._cache.put(url, response, asset)
+        return asset
 
     def list(
         self,
@@ -274,6 +507,82 @@ class Client:
             List[Dict] : a List of assets (dicts)
         """
 
+        request_kwargs = self._list_request_kwargs(filters, order_by, ascending)
+        items = self.request("get", asset_type, path=path, paginated=paginated, **request_kwargs)
+
+        return items
+
+    def iter_list(
+        self,
+        asset_type: str,
+        filters: Dict[str, Union[List[str], str, dict]] = None,
+        order_by: str = None,
+        ascending: bool = False,
+        path: str = None,
+        prefetch: bool = True,
+    ) -> Iterator[List[Dict]]:
+        """Iterate over the pages of assets matching the filters.
+
+        The pages are requested lazily: the first one is fetched when the iteration starts, and the
+        following ones are prefetched while the previous ones are consumed.
+
+        Args:
+            prefetch (bool, optional): whether the next pages are requested before the previous ones are
+                consumed. If False, each page is requested once the previous one is consumed. Defaults to True.
+            others: cf [list](substra.sdk.backends.rest_client.list)
+
+        Yields:
+            List[Dict] : the assets (dicts) of each page
+        """
+        request_kwargs = self._list_request_kwargs(filters, order_by, ascending)
+        first_page = self._get_page("get", self._build_url(asset_type, path), **request_kwargs)
+        yield from self._iter_pages("get", first_page, prefetch=prefetch, **request_kwargs)
+
+    def list_range(
+        self,
+        asset_type: str,
+        filters: Dict[str, Union[List[str], str, dict]] = None,
+        order_by: str = None,
+        ascending: bool = False,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        path: str = None,
+    ) -> List[Dict]:
+        """List the assets matching the filters from `offset` to `offset + limit`.
+
+        The pages are requested one at a time, and only until the requested assets are received. The page
+        size is read from the first page: when the URLs of the next pages can be inferred from it, the pages
+        holding only skipped assets are not requested.
+
+        Args:
+            offset (int, optional): number of matching assets skipped. Defaults to 0.
+            limit (int, optional): maximum number of assets returned. Defaults to None (all the assets).
+            others: cf [list](substra.sdk.backends.rest_client.list)
+
+        Returns:
+            List[Dict] : a List of assets (dicts)
+        """
+        request_kwargs = self._list_request_kwargs(filters, order_by, ascending)
+        first_page = self._get_page("get", self._build_url(asset_type, path), **request_kwargs)
+
+        page_size = len(first_page.get("results") or [])
+        page_urls = _get_next_page_urls(first_page)
+        skipped_pages = offset // page_size if page_urls and page_size else 0
+        if skipped_pages > len(page_urls or []):
+            return []
+        if skipped_pages:
+            first_page = self._get_page("get", page_urls[skipped_pages - 1], **request_kwargs)
+            offset -= skipped_pages * page_size
+
+        pages = self._iter_pages("get", first_page, prefetch=False, **request_kwargs)
+        try:
+            items = itertools.chain.from_iterable(pages)
+            return list(itertools.islice(items, offset, None if limit is None else offset + limit))
+        finally:
+            pages.close()
+
+    @staticmethod
+    def _list_request_kwargs(filters, order_by, ascending) -> dict:
         request_kwargs = {"params": {}}
         if filters:
             request_kwargs["params"].update(request_formatter.format_search_filters_for_remote(filters))
@@ -281,9 +590,7 @@ class Client:
             request_kwargs["params"]["ordering"] = request_formatter.format_search_ordering_for_remote(
                 order_by, ascending
             )
-        items = self.request("get", asset_type, path=path, paginated=paginated, **request_kwargs)
-
-        return items
+        return request_kwargs
 
     def _add(self, name, **request_kwargs):
         """Add asset wrapper.
@@ -325,8 +632,8 @@ class Client:
                 raise e
 
             logger.warning(f"Request timeout, blocking till {name} is created: key={key}")
-            retry = utils.retry_on_exception(
-                exceptions=(exceptions.RequestTimeout),
+            retry = self._retry_policy.replace(
+                exceptions=(exceptions.RequestTimeout,),
                 timeout=float(retry_timeout),
             )
             # XXX as there is no guarantee that the request has been sent to the ledger
@@ -350,8 +657,8 @@ class Client:
                 raise e
 
             logger.warning(f"Request timeout, blocking till {name} is updated: key={key}")
-            retry = utils.retry_on_exception(
-                exceptions=(exceptions.RequestTimeout),
+            retry = self._retry_policy.replace(
+                exceptions=(exceptions.RequestTimeout,),
                 timeout=float(retry_timeout),
             )
             # XXX as there is no guarantee that the request has been sent to the ledger
@@ -0,0 +1,157 @@
+import concurrent.futures
+import logging
+import threading
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Set
+
+from substra.sdk import schemas
+
+logger = logging.getLogger(__name__)
+
+# upper bounds of the serialized size of the parts of a task, in bytes, keys and identifiers being uuids or short
+# names: the fixed fields, an input, an output and an organization authorized on an output
+_TASK_BYTES = 256
+_INPUT_BYTES = 160
+_OUTPUT_BYTES = 128
+_AUTHORIZED_ID_BYTES = 40
+
+
+def _parent_keys(task: schemas.TaskSpec) -> Set[str]:
+    return {input_ref.parent_task_key for input_ref in (task.inputs or []) if input_ref.parent_task_key}
+
+
+def _estimate_bytes(task: schemas.TaskSpec) -> int:
+    """Estimate the serialized size of a task without serializing it, the tasks being serialized only once when
+    their batch is sent."""
+    size = _TASK_BYTES + _INPUT_BYTES * len(task.inputs or [])
+    for identifier, output in (task.outputs or {}).items():
+        size += _OUTPUT_BYTES + len(identifier) + _AUTHORIZED_ID_BYTES * len(output.permissions.authorized_ids)
+    for name, value in (task.metadata or {}).items():
+        size += len(name) + len(value) + 6
+    return size + len(task.tag or "")
+
+
+def submit_batches(
+    batches: Iterable[List[schemas.TaskSpec]],
+    submit: Callable[[List[schemas.TaskSpec]], None],
+    max_in_flight: int = 1,
+) -> None:
+    """Submit batches of tasks, with up to `max_in_flight` batches sent at the same time.
+
+    A batch is only sent once all the batches containing parents of its tasks have been accepted. The tasks
+    being sorted by rank, the parents of a batch are always in the previous batches, and the batches are
+    sent in order. The batches are read from the iterable only when they can be sent, so that they can be
+    built according to the previous responses.
+
+    Args:
+        batches (Iterable[List[schemas.TaskSpec]]): batches of tasks, sorted by rank
+        submit (Callable): function sending a batch, called from a worker thread
+        max_in_flight (int, optional): maximum number of batches sent at the same time. Defaults to 1.
+
+    Raises:
+        Exception: the first error raised by `submit`, once the batches in flight are done
+    """
+    batches = iter(batches)
+    batch_index_of_task = {}
+    accepted = set()
+    in_flight = {}
+    next_batch, next_index, next_dependencies = None, 0, set()
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        while True:
+            while len(in_flight) < max_in_flight:
+                if next_batch is None:
+                    next_batch = next(batches, None)
+                    if next_batch is None:
+                        break
+                    next_dependencies = {
+                        batch_index_of_task[key]
+                        for task in next_batch
+                        for key in _parent_keys(task)
+                        if key in batch_index_of_task
+                    }
+                    batch_index_of_task.update({task.key: next_index for task in next_batch})
+                    next_dependencies.discard(next_index)
+                if not next_dependencies <= accepted:
+                    break
+                in_flight[executor.submit(submit, next_batch)] = next_index
+                next_batch = None
+                next_index += 1
+
+            if not in_flight:
+                return
+
+            done, _ = concurrent.futures.wait(in_flight, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                index = in_flight.pop(future)
+                # stop sending batches on error, the batches in flight are waited for when leaving the executor
+                future.result()
+                accepted.add(index)
+
+
+class AdaptiveBatchSizer:
+    """Size the batches of tasks from the latency of the server, with an additive increase and
+    multiplicative decrease (AIMD) of the number of tasks per batch.
+
+    Each batch answered within `target_latency` lets the next batches grow by `increase` tasks, each slower
+    batch halves them. A batch is also limited to `max_bytes` of serialized tasks, so that tasks with large
+    inputs (e.g. many data samples) are sent in smaller batches. The size of a task is estimated from its number of
+    inputs and outputs and the length of its metadata, so that it is only serialized once, when it is sent.
+
+    Args:
+        initial_size (int, optional): number of tasks of the first batch
+        min_size (int, optional): minimum number of tasks per batch
+        max_size (int, optional): maximum number of tasks per batch
+        increase (int, optional): number of tasks added to the batch size after a fast response
+        decrease_factor (float, optional): factor applied to the batch size after a slow response
+        target_latency (float, optional): response time, in seconds, above which the batches shrink
+        max_bytes (int, optional): maximum estimated serialized size of the tasks of a batch
+    """
+
+    def __init__(
+        self,
+        initial_size: int = 100,
+        min_size: int = 1,
+        max_size: int = 5000,
+        increase: int = 50,
+        decrease_factor: float = 0.5,
+        target_latency: float = 5.0,
+        max_bytes: int = 4 * 1024 * 1024,
+    ):
+        self.size = initial_size
+        self.min_size = min_size
+        self.max_size = max_size
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.target_latency = target_latency
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def record(self, latency: float) -> None:
+        """Adapt the batch size to the response time of a batch, in seconds."""
+        with self._lock:
+            if latency > self.target_latency:
+                self.size = max(self.min_size, int(self.size * self.decrease_factor))
+            else:
+                self.size = min(self.max_size, self.size + self.increase)
+            logger.debug(f"Batch answered in {latency:.2f}s, next batches of {self.size} tasks")
+
+    def batches(self, tasks: List[schemas.TaskSpec]) -> Iterator[List[schemas.TaskSpec]]:
+        """Split the tasks into batches, each one sized when it is read."""
+        start = 0
+        while start < len(tasks):
+            with self._lock:
+                size = self.size
+            end = start
+            batch_bytes = 0
+            while end < len(tasks) and end - start < size:
+                task_bytes = _estimate_bytes(tasks[end])
+                if end > start and batch_bytes + task_bytes > self.max_bytes:
+                    break
+                batch_bytes += task_bytes
+                end += 1
+            yield tasks[start:end]
+            start = end
@@ -1,16 +1,21 @@
 import dataclasses
 import functools
+import itertools
 import logging
 import os
 import pathlib
+import threading
 import time
 from collections.abc import Callable
+from datetime import datetime
 from typing import Any
 from typing import Dict
+from typing import Iterator
 from typing import List
 from typing import Literal
 from typing import Optional
 from typing import Sequence
+from typing import Tuple
 from typing import Union
 
 import yaml
@@ -18,8 +23,14 @@ from slugify import slugify
 
 from substra.sdk import backends
 from substra.sdk import exceptions
+from substra.sdk import fs
 from substra.sdk import models
 from substra.sdk import schemas
+from substra.sdk.metrics import MetricsRegistry
+from substra.sdk.performances import ColumnarPerformances
+from substra.sdk.performances import PerformanceRow
+from substra.sdk.utils import PollingPolicy
+from substra.sdk.utils import RetryPolicy
 from substra.sdk.utils import check_and_format_search_filters
 from substra.sdk.utils import check_search_ordering
 from substra.sdk.utils import is_valid_uuid
@@ -28,6 +39,7 @@ logger = logging.getLogger(__name__)
 
 DEFAULT_RETRY_TIMEOUT = 5 * 60
 DEFAULT_BATCH_SIZE = 500
+DEFAULT_MAX_IN_FLIGHT_BATCHES = 1
 DEFAULT_BACKEND_TYPE = schemas.BackendType.LOCAL_SUBPROCESS
 
 # Temporary output identifiers, to be removed once user can pass its own identifiers
@@ -35,6 +47,72 @@ MODEL_OUTPUT_IDENTIFIER = "model"
 HEAD_OUTPUT_IDENTIFIER = "local"
 TRUNK_OUTPUT_IDENTIFIER = "shared"
 
+# Statuses used to decide when to stop waiting for an asset, and whether it failed
+_WAIT_STATUSES = {
+    schemas.Type.ComputePlan: {
+        "status_failed": models.ComputePlanStatus.failed.value,
+        "status_canceled": models.ComputePlanStatus.canceled.value,
+        "statuses_stopped": (
+            models.ComputePlanStatus.done.value,
+            models.ComputePlanStatus.failed.value,
+            models.ComputePlanStatus.canceled.value,
+        ),
+    },
+    schemas.Type.Task: {
+        "status_failed": models.ComputeTaskStatus.failed.value,
+        "status_canceled": models.ComputeTaskStatus.canceled.value,
+        "statuses_stopped": (models.ComputeTaskStatus.done.value, models.ComputeTaskStatus.canceled.value),
+    },
+    schemas.Type.Function: {
+        "status_failed": models.FunctionStatus.failed.value,
+        "status_canceled": models.FunctionStatus.canceled.value,
+        "statuses_stopped": (
+            models.FunctionStatus.ready.value,
+            models.FunctionStatus.canceled.value,
+            models.FunctionStatus.failed.value,
+        ),
+    },
+}
+
+# File fields of the specs, and the corresponding fields of the assets compared to deduplicate them
+_DEDUP_FILE_FIELDS = {
+    schemas.Type.Function: {"file": "archive", "description": "description"},
+    schemas.Type.Dataset: {"data_opener": "opener", "description": "description"},
+}
+# Other fields compared to deduplicate the assets, named the same in the specs and the assets
+_DEDUP_FIELDS = {
+    schemas.Type.Function: ["name", "metadata", "permissions", "inputs", "outputs"],
+    schemas.Type.Dataset: ["name", "metadata", "permissions", "logs_permission"],
+}
+
+
+def _dedup_value(field: str, value, owner: str):
+    """Normalize a field of a spec or of an asset, so that the fields of an asset and of the spec creating it
+    are equal."""
+    if field in ("permissions", "logs_permission"):
+        # the permissions of the assets hold the process permission
+        permission = getattr(value, "process", value)
+        if permission.public:
+            return (True,)
+        # the owner is always authorized
+        return (False, tuple(sorted(set(permission.authorized_ids) | {owner})))
+    if field == "metadata":
+        return tuple(sorted((value or {}).items()))
+    if field in ("inputs", "outputs"):
+        return tuple(
+            sorted(
+                (item.identifier, schemas.AssetKind(item.kind).value, getattr(item, "optional", None), item.multiple)
+                for item in value or []
+            )
+        )
+    return value
+
+
+def _dedup_key(asset_type: schemas.Type, checksums: tuple, asset, owner: str) -> tuple:
+    return (checksums,) + tuple(
+        _dedup_value(field, getattr(asset, field), owner) for field in _DEDUP_FIELDS[asset_type]
+    )
+
 
 def logit(f):
     """Decorator used to log all high-level methods of the Substra client."""
@@ -54,6 +132,9 @@ def logit(f):
             te = time.time()
             elapsed = (te - ts) * 1000
             logger.info(f"{f.__name__}: done in {elapsed:.2f}ms; error={error}")
+            metrics_registry = getattr(args[0], "_metrics", None) if args else None
+            if metrics_registry is not None:
+                metrics_registry.record_call(f.__name__, te - ts, error=error)
 
     return wrapper
 
@@ -159,6 +240,11 @@ def get_client_configuration(
         "retry_timeout": int,
         "insecure": bool,
         "backend_type": schemas.BackendType,
+        "response_cache_size": int,
+        "cache_dir": str,
+        "cache_max_size": int,
+        "verify_checksums": bool,
+        "local_db_path": str,
     }
     return {
         attribute_name: _get_config_value(
@@ -224,6 +310,31 @@ class Client:
             executed locally. If a URL is given then the mode is a hybrid one: new assets are
             created locally but can access assets from the deployed Substra platform. The platform is in read-only mode
             and tasks are executed locally.
+        response_cache_size (int, optional): Number of assets fetched by key to keep in memory. Cached assets are
+            revalidated with conditional requests (`ETag` / `Last-Modified`), so that unchanged assets are not
+            downloaded again, e.g. when polling with the `wait_*` methods.
+            Defaults to 0 (no cache).
+        cache_dir (str, optional): Directory of the on-disk cache of the downloaded models, functions and datasets,
+            addressed by their checksum, so that a file is not downloaded again. The downloaded files are hard links
+            to the cached ones and must not be modified in place. The cache is not used if `verify_checksums` is
+            False. Defaults to None (no cache).
+        cache_max_size (int, optional): Maximum size of the on-disk cache, in bytes. The least recently used files
+            are evicted beyond it. Defaults to 10 GiB.
+        verify_checksums (bool, optional): If True, the SHA-256 checksum of the downloaded files is computed while
+            they are written and compared to the checksum of the asset; the file is downloaded again on mismatch.
+            The checksum is the one of the decoded content, i.e. after a `Content-Encoding` compression is removed.
+            Downloading a model then requires fetching its metadata first, with one more request, unless the model
+            was fetched before by the client. Defaults to True.
+        local_db_path (str, optional): Path of a SQLite file storing the assets of the local backend, so that they
+            persist after the process exits and can be re-opened for analysis. The clients given the same path share
+            the same assets.
+            Defaults to None (assets kept in memory).
+        retry_policy (RetryPolicy, optional): Policy applied to the requests failing on a transient error, such as
+            an unavailable gateway or too many requests. Can only be set in code.
+            Defaults to a [RetryPolicy](#RetryPolicy) with capped and jittered delays.
+        polling_policy (PollingPolicy, optional): Schedule and budget of the status requests sent by the `wait_*`
+            methods. Can only be set in code.
+            Defaults to a [PollingPolicy](#PollingPolicy) polling fast at first, then less and less often.
     """
 
     def __init__(
@@ -238,7 +349,20 @@ class Client:
         retry_timeout: Optional[int] = None,
         insecure: Optional[bool] = None,
         backend_type: Optional[schemas.BackendType] = None,
+        response_cache_size: Optional[int] = None,
+        cache_dir: Optional[str] = None,
+        cache_max_size: Optional[int] = None,
+        verify_checksums: Optional[bool] = None,
+        local_db_path: Optional[str] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        polling_policy: Optional[PollingPolicy] = None,
     ):
+        self._metrics = MetricsRegistry()
+        # specifications of the assets of the organization and their keys, cf `_add_deduplicated`
+        self._dedup_index = {}
+        self._dedup_owner = None
+        self._dedup_lock = threading.Lock()
+
         # The value "" (which is Falsy) is used to bypass configuration file
         if configuration_file is None:
             configuration_file = os.getenv("SUBSTRA_CLIENTS_CONFIGURATION_FILE_PATH")
@@ -265,6 +389,11 @@ class Client:
             "retry_timeout": retry_timeout,
             "insecure": insecure,
             "backend_type": backend_type,
+            "response_cache_size": response_cache_size,
+            "cache_dir": cache_dir,
+            "cache_max_size": cache_max_size,
+            "verify_checksums": verify_checksums,
+            "local_db_path": local_db_path,
         }
         config_dict = get_client_configuration(
             client_name=client_name, config_file=configuration_file, code_values=code_values
@@ -305,6 +434,16 @@ class Client:
             f"as defined in {config_dict['insecure'].origin} "
         )
 
+        self._response_cache_size = config_dict["response_cache_size"].value or 0
+        self._cache_dir = config_dict["cache_dir"].value
+        self._cache_max_size = config_dict["cache_max_size"].value
+        self._verify_checksums = (
+            config_dict["verify_checksums"].value if config_dict["verify_checksums"].value is not None else True
+        )
+        self._local_db_path = config_dict["local_db_path"].value
+        self._retry_policy = retry_policy
+        self._polling_policy = polling_policy or PollingPolicy()
+
         self._backend = self._get_backend(backend_type)
         if (
             self._url
@@ -321,10 +460,10 @@ class Client:
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
-        self.logout()
+        self.close()
 
     def __del__(self):
-        self.logout()
+        self.close()
 
     def _get_backend(self, backend_type: schemas.BackendType):
         # Three possibilities:
@@ -339,6 +478,12 @@ class Client:
                 insecure=self._insecure,
                 token=self._token,
                 retry_timeout=self._retry_timeout,
+                response_cache_size=self._response_cache_size,
+                cache_dir=self._cache_dir,
+                cache_max_size=self._cache_max_size,
+                verify_checksums=self._verify_checksums,
+                retry_policy=self._retry_policy,
+                metrics_registry=self._metrics,
             )
         if backend_type in [schemas.BackendType.LOCAL_DOCKER, schemas.BackendType.LOCAL_SUBPROCESS]:
             backend = None
@@ -353,10 +498,17 @@ class Client:
                     insecure=self._insecure,
                     token=self._token,
                     retry_timeout=self._retry_timeout,
+                    response_cache_size=self._response_cache_size,
+                    cache_dir=self._cache_dir,
+                    cache_max_size=self._cache_max_size,
+                    verify_checksums=self._verify_checksums,
+                    retry_policy=self._retry_policy,
+                    metrics_registry=self._metrics,
                 )
             return backends.get(
                 backend_type,
                 backend,
+                db_path=self._local_db_path,
             )
         raise exceptions.SDKException(
             f"Unknown value for the execution mode: {backend_type}, "
@@ -371,6 +523,11 @@ class Client:
         if isinstance(self._backend, backends.Local):
             return self._backend.temp_directory
 
+    @property
+    def polling_policy(self) -> PollingPolicy:
+        """Schedule and budget of the status requests sent by the `wait_*` methods."""
+        return self._polling_policy
+
     @property
     def backend_mode(self) -> schemas.BackendType:
         """Get the backend mode.
@@ -380,6 +537,22 @@ class Client:
         """
         return self._backend.backend_mode
 
+    def metrics(self) -> MetricsRegistry:
+        """Get the metrics recorded by this client: number, latency, retries, bytes sent and received and
+        errors of the HTTP requests per endpoint, and number, latency and errors of the calls per method.
+
+        Example:
+            ```python
+            client.metrics().to_dict()["requests"]["GET /task/{key}/"]["latency"]["sum"]
+            client.metrics().to_prometheus()
+            ```
+
+        Returns:
+            MetricsRegistry: the live registry of the metrics, which can be exported with `to_dict`
+                or `to_prometheus`, and emptied with `reset`
+        """
+        return self._metrics
+
     @logit
     def login(self, username, password):
         """Login to a remote server."""
@@ -399,6 +572,14 @@ class Client:
         self._backend.logout()
         self._token = None
 
+    def close(self) -> None:
+        """
+        Log out from a remote server, if Client.login was used, and close the connections
+        to the server. The connections are opened again if the client is used afterwards.
+        """
+        self.logout()
+        self._backend.close()
+
     @staticmethod
     def _get_spec(asset_type, data):
         if isinstance(data, asset_type):
@@ -472,32 +653,71 @@ class Client:
         )
 
     @logit
-    def add_dataset(self, data: Union[dict, schemas.DatasetSpec]):
+    def add_dataset(self, data: Union[dict, schemas.DatasetSpec], dedup: bool = False):
         """Create new dataset asset and return its key.
 
         Args:
             data (Union[dict, schemas.DatasetSpec]): If it is a dict, it must have the same
                 keys as specified in [schemas.DatasetSpec](sdk_schemas.md#DatasetSpec).
+            dedup (bool, optional): If True, return the key of the most recent dataset of this organization with
+                the same opener and description files, name, metadata and permissions, if any, instead of uploading them
+                again. Defaults to False.
 
         Returns:
             str: Key of the dataset
         """
         spec = self._get_spec(schemas.DatasetSpec, data)
-        return self._backend.add(spec)
+        return self._add_deduplicated(spec) if dedup else self._backend.add(spec)
 
     @logit
-    def add_function(self, data: Union[dict, schemas.FunctionSpec]) -> str:
+    def add_function(self, data: Union[dict, schemas.FunctionSpec], dedup: bool = False) -> str:
         """Create new function asset.
 
         Args:
             data (Union[dict, schemas.FunctionSpec]): If it is a dict, it must have the same keys
                 as specified in [schemas.FunctionSpec](sdk_schemas.md#FunctionSpec).
+            dedup (bool, optional): If True, return the key of the most recent function of this organization with
+                the same archive and description files, name, metadata, permissions, inputs and outputs, if any,
+                instead of uploading them again. Defaults to False.
 
         Returns:
             str: Key of the function
         """
         spec = self._get_spec(schemas.FunctionSpec, data)
-        return self._backend.add(spec)
+        return self._add_deduplicated(spec) if dedup else self._backend.add(spec)
+
+    def _add_deduplicated(self, spec: Union[schemas.DatasetSpec, schemas.FunctionSpec]) -> str:
+        """Add the asset, unless an asset of this organization has the same files and the same specification."""
+        asset_type = spec.__class__.type_
+        file_fields = _DEDUP_FILE_FIELDS[asset_type]
+
+        checksums = tuple(fs.hash_file_cached(getattr(spec, spec_field)) for spec_field in file_fields)
+
+        # the index is built, checked and updated under the lock, so that the same asset added from several
+        # threads at the same time, e.g. by the AsyncClient, is only created once
+        with self._dedup_lock:
+            if self._dedup_owner is None:
+                self._dedup_owner = self.organization_info().organization_id
+            owner = self._dedup_owner
+            if asset_type not in self._dedup_index:
+                # the assets of the organization are listed once, then the index is kept up to date
+                index = {}
+                for asset in self._iter(asset_type, filters={"owner": [owner]}):
+                    asset_checksums = tuple(getattr(asset, field).checksum for field in file_fields.values())
+                    index.setdefault(_dedup_key(asset_type, asset_checksums, asset, owner), asset.key)
+                self._dedup_index[asset_type] = index
+
+            dedup_key = _dedup_key(asset_type, checksums, spec, owner)
+            key = self._dedup_index[asset_type].get(dedup_key)
+            if key is not None:
+                logger.info(
+                    f"{asset_type.value} with the same specification already exists, not uploaded again: key='{key}'"
+                )
+                return key
+
+            key = self._backend.add(spec)
+            self._dedup_index[asset_type][dedup_key] = key
+            return key
 
     @logit
     def add_task(self, data: Union[dict, schemas.TaskSpec]) -> str:
@@ -518,7 +738,8 @@ class Client:
         self,
         data: Union[dict, schemas.ComputePlanSpec],
         auto_batching: bool = True,
-        batch_size: int = DEFAULT_BATCH_SIZE,
+        batch_size: Union[int, Literal["auto"]] = DEFAULT_BATCH_SIZE,
+        max_in_flight_batches: int = DEFAULT_MAX_IN_FLIGHT_BATCHES,
     ) -> models.ComputePlan:
         """Create new compute plan asset.
 
@@ -527,8 +748,12 @@ class Client:
                 keys as specified in [schemas.ComputePlanSpec](sdk_schemas.md#ComputePlanSpec).
             auto_batching (bool, optional): Set 'auto_batching' to False to upload all the tasks of
                 the compute plan at once. Defaults to True.
-            batch_size (int, optional): If 'auto_batching' is True, change `batch_size` to define
-                the number of tasks uploaded in each batch (default 500).
+            batch_size (Union[int, str], optional): If 'auto_batching' is True, change `batch_size` to define
+                the number of tasks uploaded in each batch (default 500). Set it to `"auto"` to size the batches
+                from the response time of the server and the size of the tasks.
+            max_in_flight_batches (int, optional): Maximum number of batches uploaded at the same time.
+                A batch is only uploaded once the batches containing the parents of its tasks have been
+                accepted. Defaults to 1: the batches are uploaded one after the other.
 
         Returns:
             models.ComputePlan: Created compute plan
@@ -537,6 +762,7 @@ class Client:
         spec_options = {
             "auto_batching": auto_batching,
             "batch_size": batch_size,
+            "max_in_flight_batches": max_in_flight_batches,
         }
 
         if not is_valid_uuid(spec.key):
@@ -553,12 +779,49 @@ class Client:
         in the [models.Function](sdk_models.md#Function) model"""
         return self._backend.get(schemas.Type.Function, key)
 
+    @logit
+    def get_functions(self, keys: List[str]) -> List[models.Function]:
+        """Get functions by keys, in the order of the given keys, the returned objects are described
+        in the [models.Function](sdk_models.md#Function) model.
+
+        The functions are fetched by chunks of keys, with several requests sent concurrently, instead of one
+        request per key.
+
+        Args:
+            keys (List[str]): keys of the functions
+
+        Returns:
+            List[models.Function]: the functions, in the order of the keys
+
+        Raises:
+            exceptions.AssetsNotFound: some keys do not match any function, they are listed in the `keys`
+                attribute of the exception
+        """
+        return self._get_many(schemas.Type.Function, keys)
+
     @logit
     def get_compute_plan(self, key: str) -> models.ComputePlan:
         """Get compute plan by key, the returned object is described
         in the [models.ComputePlan](sdk_models.md#ComputePlan) model"""
         return self._backend.get(schemas.Type.ComputePlan, key)
 
+    @logit
+    def get_compute_plans(self, keys: List[str]) -> List[models.ComputePlan]:
+        """Get compute plans by keys, in the order of the given keys, the returned objects are described
+        in the [models.ComputePlan](sdk_models.md#ComputePlan) model, cf `get_tasks`.
+
+        Args:
+            keys (List[str]): keys of the compute plans
+
+        Returns:
+            List[models.ComputePlan]: the compute plans, in the order of the keys
+
+        Raises:
+            exceptions.AssetsNotFound: some keys do not match any compute plan, they are listed in the `keys`
+                attribute of the exception
+        """
+        return self._get_many(schemas.Type.ComputePlan, keys)
+
     @logit
     def get_performances(self, key: str, *, wait_completion: bool = False) -> models.Performances:
         """Get the compute plan performances by key, the returned object is described
@@ -578,6 +841,87 @@ class Client:
         performances = self._backend.get_performances(key)
         return performances
 
+    def stream_performances(
+        self, key: str, *, timeout: Optional[float] = None, polling_period: Optional[float] = None
+    ) -> Iterator[PerformanceRow]:
+        """Stream the performances of a compute plan as its tasks are done.
+
+        Each poll only yields the performances of the tasks done since the previous one, until the compute plan
+        is finished: a dashboard refresh costs the new performances only. The tasks already streamed are tracked by
+        their end date, so that the state kept between two polls does not grow with the compute plan.
+
+        Example:
+            ```python
+            for row in client.stream_performances(cp_key):
+                print(row.round_idx, row.identifier, row.performance)
+            ```
+
+        Args:
+            key (str): the key of the compute plan
+            timeout (float, optional): maximum time to stream, in seconds. If set to None, streams until the
+                compute plan is finished.
+            polling_period (float, optional): constant time to wait between two polls, in seconds.
+                Defaults to None, to follow the polling policy of the client.
+
+        Yields:
+            PerformanceRow: the performances, with the compute plan key, task key, worker, task rank,
+                round index, identifier and value
+
+        Raises:
+            exceptions.FutureTimeoutError: The compute plan was not finished before the timeout.
+                Not raised when `timeout == None`
+        """
+        polls = _stream_polls(
+            polling_policy=self._polling_policy.with_period(polling_period),
+            timeout=timeout,
+            **_WAIT_STATUSES[schemas.Type.ComputePlan],
+        )
+        for delay, cursor in polls:
+            if delay:
+                time.sleep(delay)
+            # the status is read first, so that the performances of a finished compute plan are all listed
+            compute_plan = self.get_compute_plan(key)
+            yield from polls.send((compute_plan, *self.get_new_performances(key, cursor)))
+
+    @logit
+    def get_new_performances(self, key: str, cursor: Optional[dict] = None) -> Tuple[List[PerformanceRow], dict]:
+        """Get the performances of a compute plan added since the previous call, cf `stream_performances`.
+
+        Args:
+            key (str): the key of the compute plan
+            cursor (dict, optional): the cursor returned by the previous call. Defaults to None, to get all the
+                performances of the compute plan.
+
+        Returns:
+            Tuple[List[PerformanceRow], dict]: the new performances, and the cursor to pass to the next call,
+                which can be serialized to JSON
+        """
+        return self._backend.get_new_performances(key, cursor)
+
+    @logit
+    def get_performances_many(self, keys: List[str]) -> ColumnarPerformances:
+        """Get the performances of many compute plans, stored by columns.
+
+        The performances of the compute plans are fetched concurrently, and returned as a
+        [ColumnarPerformances](#ColumnarPerformances): NumPy arrays for the numeric columns and categorical
+        columns for the repeated strings, which convert to a pandas DataFrame without copying the arrays.
+        Requires numpy.
+
+        Example:
+            ```python
+            perf = client.get_performances_many(cp_keys)
+            df = perf.to_pandas()
+            print(df)
+            ```
+
+        Args:
+            keys (List[str]): the keys of the compute plans
+
+        Returns:
+            ColumnarPerformances: the performances of the compute plans
+        """
+        return self._backend.get_performances_many(keys)
+
     @logit
     def get_dataset(self, key: str) -> models.Dataset:
         """Get dataset by key, the returned object is described
@@ -590,6 +934,26 @@ class Client:
         in the [models.Task](sdk_models.md#Task) model"""
         return self._backend.get(schemas.Type.Task, key)
 
+    @logit
+    def get_tasks(self, keys: List[str]) -> List[models.Task]:
+        """Get tasks by keys, in the order of the given keys, the returned objects are described
+        in the [models.Task](sdk_models.md#Task) model.
+
+        The tasks are fetched by chunks of keys, with several requests sent concurrently, instead of one
+        request per key.
+
+        Args:
+            keys (List[str]): keys of the tasks
+
+        Returns:
+            List[models.Task]: the tasks, in the order of the keys
+
+        Raises:
+            exceptions.AssetsNotFound: some keys do not match any task, they are listed in the `keys`
+                attribute of the exception
+        """
+        return self._get_many(schemas.Type.Task, keys)
+
     @logit
     def get_logs(self, task_key: str) -> str:
         """Get task logs by task key, the returned object is a string
@@ -606,7 +970,34 @@ class Client:
         return self._backend.get(schemas.Type.Model, key)
 
     @logit
-    def list_model(self, filters: dict = None, ascending: bool = False) -> List[models.OutModel]:
+    def get_models(self, keys: List[str]) -> List[models.OutModel]:
+        """Get models by keys, in the order of the given keys, the returned objects are described
+        in the [models.OutModel](sdk_models.md#OutModel) model.
+
+        The models are fetched by chunks of keys, with several requests sent concurrently, instead of one
+        request per key.
+
+        Args:
+            keys (List[str]): keys of the models
+
+        Returns:
+            List[models.OutModel]: the models, in the order of the keys
+
+        Raises:
+            exceptions.AssetsNotFound: some keys do not match any model, they are listed in the `keys`
+                attribute of the exception
+        """
+        return self._get_many(schemas.Type.Model, keys)
+
+    @logit
+    def list_model(
+        self,
+        filters: dict = None,
+        ascending: bool = False,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+    ) -> List[models.OutModel]:
         """List models.
 
         The ``filters`` argument is a dictionnary, with those possible keys:\n
@@ -618,10 +1009,16 @@ class Client:
         Args:
             filters (dict, optional): List of key values pair to filter on. Default None.
             ascending (bool, optional): Sorts results by oldest creation_date first. Default False (descending order).
+            limit (int, optional): Maximum number of assets returned. Default None (all the assets).
+            offset (int, optional): Number of matching assets skipped. Default 0.
+            cursor (str, optional): Key of the last asset of the previous page, only the assets after it are
+                returned. Default None.
 
         Returns:
             models.OutModel the returned object is described in the [models.OutModel](sdk_models.md#OutModel) model"""
-        return self._list(schemas.Type.Model, filters, "creation_date", ascending)
+        return self._list(
+            schemas.Type.Model, filters, "creation_date", ascending, limit=limit, offset=offset, cursor=cursor
+        )
 
     @logit
     def get_data_sample(self, key: str) -> models.DataSample:
@@ -629,15 +1026,45 @@ class Client:
         in the [models.Datasample](sdk_models.md#DataSample) model"""
         return self._backend.get(schemas.Type.DataSample, key)
 
+    def _get_many(self, asset_type, keys: List[str]):
+        keys = list(keys)
+        assets = self._backend.get_many(asset_type, keys)
+        missing_keys = [key for key in dict.fromkeys(keys) if key not in assets]
+        if missing_keys:
+            raise exceptions.AssetsNotFound(asset_type.value, missing_keys)
+        return [assets[key] for key in keys]
+
     def _list(
-        self, asset_type, filters: dict = None, order_by: str = None, ascending: bool = False, paginated: bool = True
+        self,
+        asset_type,
+        filters: dict = None,
+        order_by: str = None,
+        ascending: bool = False,
+        paginated: bool = True,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        cursor: Optional[str] = None,
     ):
         filters = check_and_format_search_filters(asset_type, filters)
         check_search_ordering(order_by)
-        return self._backend.list(asset_type, filters, order_by, ascending)
+        return self._backend.list(
+            asset_type, filters, order_by, ascending, paginated=paginated, limit=limit, offset=offset, cursor=cursor
+        )
+
+    def _iter(self, asset_type, filters: dict = None, order_by: str = None, ascending: bool = False):
+        filters = check_and_format_search_filters(asset_type, filters)
+        check_search_ordering(order_by)
+        return self._backend.iter_list(asset_type, filters, order_by, ascending)
 
     @logit
-    def list_function(self, filters: dict = None, ascending: bool = False) -> List[models.Function]:
+    def list_function(
+        self,
+        filters: dict = None,
+        ascending: bool = False,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+    ) -> List[models.Function]:
         """List functions.
 
         The ``filters`` argument is a dictionary, with those possible keys:\n
@@ -658,17 +1085,29 @@ class Client:
         Args:
             filters (dict, optional): List of key values pair to filter on. Default None.
             ascending (bool, optional): Sorts results by oldest creation_date first. Default False (descending order).
+            limit (int, optional): Maximum number of assets returned. Default None (all the assets).
+            offset (int, optional): Number of matching assets skipped. Default 0.
+            cursor (str, optional): Key of the last asset of the previous page, only the assets after it are
+                returned. Default None.
 
         Returns:
             models.Function: the returned object is described in the [models.Function](sdk_models.md#Function) model
 
         """
 
-        return self._list(schemas.Type.Function, filters, "creation_date", ascending)
+        return self._list(
+            schemas.Type.Function, filters, "creation_date", ascending, limit=limit, offset=offset, cursor=cursor
+        )
 
     @logit
     def list_compute_plan(
-        self, filters: dict = None, order_by: str = "creation_date", ascending: bool = False
+        self,
+        filters: dict = None,
+        order_by: str = "creation_date",
+        ascending: bool = False,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        cursor: Optional[str] = None,
     ) -> List[models.ComputePlan]:
         """List compute plans.
 
@@ -694,16 +1133,29 @@ class Client:
             order_by (str, optional): Field to sort results by.
                 Possible values: `creation_date`, `start_date`, `end_date`. Default creation_date.
             ascending (bool, optional): Sorts results on order_by by ascending order. Default False (descending order).
+            limit (int, optional): Maximum number of assets returned. Default None (all the assets).
+            offset (int, optional): Number of matching assets skipped. Default 0.
+            cursor (str, optional): Key of the last asset of the previous page, only the assets after it are
+                returned. Default None.
 
         Returns:
             models.ComputePlan: the returned object is described
         in the [models.ComputePlan](sdk_models.md#ComputePlan) model
         """
 
-        return self._list(schemas.Type.ComputePlan, filters, order_by, ascending)
+        return self._list(
+            schemas.Type.ComputePlan, filters, order_by, ascending, limit=limit, offset=offset, cursor=cursor
+        )
 
     @logit
-    def list_data_sample(self, filters: dict = None, ascending: bool = False) -> List[models.DataSample]:
+    def list_data_sample(
+        self,
+        filters: dict = None,
+        ascending: bool = False,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+    ) -> List[models.DataSample]:
         """List data samples.
 
             The ``filters`` argument is a dictionary, with those possible keys:\n
@@ -716,15 +1168,28 @@ class Client:
         Args:
             filters (dict, optional): List of key values pair to filter on. Default None.
             ascending (bool, optional): Sorts results on order_by by ascending order. Default False (descending order).
+            limit (int, optional): Maximum number of assets returned. Default None (all the assets).
+            offset (int, optional): Number of matching assets skipped. Default 0.
+            cursor (str, optional): Key of the last asset of the previous page, only the assets after it are
+                returned. Default None.
 
         Returns:
             models.DataSample: the returned object is described in the
                 [models.DataSample](sdk_models.md#DataSample) model
         """
-        return self._list(schemas.Type.DataSample, filters, "creation_date", ascending)
+        return self._list(
+            schemas.Type.DataSample, filters, "creation_date", ascending, limit=limit, offset=offset, cursor=cursor
+        )
 
     @logit
-    def list_dataset(self, filters: dict = None, ascending: bool = False) -> List[models.Dataset]:
+    def list_dataset(
+        self,
+        filters: dict = None,
+        ascending: bool = False,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+    ) -> List[models.Dataset]:
         """List datasets.
 
          The ``filters`` argument is a dictionary, with those possible keys:\n
@@ -745,6 +1210,10 @@ class Client:
         Args:
             filters (dict, optional): List of key values pair to filter on. Default None.
             ascending (bool, optional): Sorts results by oldest creation_date first. Default False (descending order).
+            limit (int, optional): Maximum number of assets returned. Default None (all the assets).
+            offset (int, optional): Number of matching assets skipped. Default 0.
+            cursor (str, optional): Key of the last asset of the previous page, only the assets after it are
+                returned. Default None.
 
         Returns:
             models.Dataset: the returned object is described
@@ -753,11 +1222,19 @@ class Client:
 
         """
 
-        return self._list(schemas.Type.Dataset, filters, "creation_date", ascending)
+        return self._list(
+            schemas.Type.Dataset, filters, "creation_date", ascending, limit=limit, offset=offset, cursor=cursor
+        )
 
     @logit
     def list_task(
-        self, filters: dict = None, order_by: str = "creation_date", ascending: bool = False
+        self,
+        filters: dict = None,
+        order_by: str = "creation_date",
+        ascending: bool = False,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        cursor: Optional[str] = None,
     ) -> List[models.Task]:
         """List tasks.
 
@@ -782,6 +1259,10 @@ class Client:
             order_by (str, optional): Field to sort results by.
                 Possible values: `creation_date`, `start_date`, `end_date`. Default creation_date.
             ascending (bool, optional): Sorts results on order_by by ascending order. Default False (descending order).
+            limit (int, optional): Maximum number of assets returned. Default None (all the assets).
+            offset (int, optional): Number of matching assets skipped. Default 0.
+            cursor (str, optional): Key of the last asset of the previous page, only the assets after it are
+                returned. Default None.
 
         Returns:
             models.Task: the returned object is described in the
@@ -789,7 +1270,116 @@ class Client:
 
 
         """
-        return self._list(schemas.Type.Task, filters, order_by, ascending)
+        return self._list(schemas.Type.Task, filters, order_by, ascending, limit=limit, offset=offset, cursor=cursor)
+
+    def iter_function(self, filters: dict = None, ascending: bool = False) -> Iterator[models.Function]:
+        """Iterate over functions, page by page.
+
+        Same as `list_function`, but the functions are yielded as soon as their page is received instead of
+        being gathered in a list, so that the memory usage stays bounded.
+
+        Args:
+            filters (dict, optional): List of key values pair to filter on, cf `list_function`. Default None.
+            ascending (bool, optional): Sorts results by oldest creation_date first. Default False (descending order).
+
+        Yields:
+            models.Function: the returned object is described in the [models.Function](sdk_models.md#Function) model
+        """
+        return self._iter(schemas.Type.Function, filters, "creation_date", ascending)
+
+    def iter_compute_plan(
+        self, filters: dict = None, order_by: str = "creation_date", ascending: bool = False
+    ) -> Iterator[models.ComputePlan]:
+        """Iterate over compute plans, page by page.
+
+        Same as `list_compute_plan`, but the compute plans are yielded as soon as their page is received instead of
+        being gathered in a list, so that the memory usage stays bounded.
+
+        Args:
+            filters (dict, optional): List of key values pair to filter on, cf `list_compute_plan`. Default None.
+            order_by (str, optional): Field to sort results by.
+                Possible values: `creation_date`, `start_date`, `end_date`. Default creation_date.
+            ascending (bool, optional): Sorts results on order_by by ascending order. Default False (descending order).
+
+        Yields:
+            models.ComputePlan: the returned object is described
+        in the [models.ComputePlan](sdk_models.md#ComputePlan) model
+        """
+        return self._iter(schemas.Type.ComputePlan, filters, order_by, ascending)
+
+    def iter_data_sample(self, filters: dict = None, ascending: bool = False) -> Iterator[models.DataSample]:
+        """Iterate over data samples, page by page.
+
+        Same as `list_data_sample`, but the data samples are yielded as soon as their page is received instead of
+        being gathered in a list, so that the memory usage stays bounded.
+
+        Args:
+            filters (dict, optional): List of key values pair to filter on, cf `list_data_sample`. Default None.
+            ascending (bool, optional): Sorts results by oldest creation_date first. Default False (descending order).
+
+        Yields:
+            models.DataSample: the returned object is described in the
+                [models.DataSample](sdk_models.md#DataSample) model
+        """
+        return self._iter(schemas.Type.DataSample, filters, "creation_date", ascending)
+
+    def iter_dataset(self, filters: dict = None, ascending: bool = False) -> Iterator[models.Dataset]:
+        """Iterate over datasets, page by page.
+
+        Same as `list_dataset`, but the datasets are yielded as soon as their page is received instead of
+        being gathered in a list, so that the memory usage stays bounded.
+
+        Args:
+            filters (dict, optional): List of key values pair to filter on, cf `list_dataset`. Default None.
+            ascending (bool, optional): Sorts results by oldest creation_date first. Default False (descending order).
+
+        Yields:
+            models.Dataset: the returned object is described
+        in the [models.Dataset](sdk_models.md#Dataset) model
+        """
+        return self._iter(schemas.Type.Dataset, filters, "creation_date", ascending)
+
+    def iter_model(self, filters: dict = None, ascending: bool = False) -> Iterator[models.OutModel]:
+        """Iterate over models, page by page.
+
+        Same as `list_model`, but the models are yielded as soon as their page is received instead of
+        being gathered in a list, so that the memory usage stays bounded.
+
+        Args:
+            filters (dict, optional): List of key values pair to filter on, cf `list_model`. Default None.
+            ascending (bool, optional): Sorts results by oldest creation_date first. Default False (descending order).
+
+        Yields:
+            models.OutModel: the returned object is described in the [models.OutModel](sdk_models.md#OutModel) model
+        """
+        return self._iter(schemas.Type.Model, filters, "creation_date", ascending)
+
+    def iter_task(
+        self, filters: dict = None, order_by: str = "creation_date", ascending: bool = False
+    ) -> Iterator[models.Task]:
+        """Iterate over tasks, page by page.
+
+        Same as `list_task`, but the tasks are yielded as soon as their page is received instead of
+        being gathered in a list, so that the memory usage stays bounded. The next pages are fetched
+        while the first tasks are being processed.
+
+        Example:
+            ```python
+            for task in client.iter_task(filters={"compute_plan_key": [cp_key]}):
+                print(task.key, task.status)
+            ```
+
+        Args:
+            filters (dict, optional): List of key values pair to filter on, cf `list_task`. Default None.
+            order_by (str, optional): Field to sort results by.
+                Possible values: `creation_date`, `start_date`, `end_date`. Default creation_date.
+            ascending (bool, optional): Sorts results on order_by by ascending order. Default False (descending order).
+
+        Yields:
+            models.Task: the returned object is described in the
+                [models.Task](sdk_models.md#Task) model
+        """
+        return self._iter(schemas.Type.Task, filters, order_by, ascending)
 
     @logit
     def list_task_input_assets(self, key: str) -> List[models.InputAsset]:
@@ -834,7 +1424,8 @@ class Client:
         key: str,
         tasks: Union[dict, schemas.UpdateComputePlanTasksSpec],
         auto_batching: bool = True,
-        batch_size: int = DEFAULT_BATCH_SIZE,
+        batch_size: Union[int, Literal["auto"]] = DEFAULT_BATCH_SIZE,
+        max_in_flight_batches: int = DEFAULT_MAX_IN_FLIGHT_BATCHES,
     ) -> models.ComputePlan:
         """Update compute plan.
 
@@ -845,8 +1436,12 @@ class Client:
                 [schemas.UpdateComputePlanTasksSpec](sdk_schemas.md#UpdateComputePlanTasksSpec).
             auto_batching (bool, optional): Set 'auto_batching' to False to upload all
                 the tasks of the compute plan at once. Defaults to True.
-            batch_size (int, optional): If 'auto_batching' is True, change `batch_size`
-                to define the number of tasks uploaded in each batch (default 500).
+            batch_size (Union[int, str], optional): If 'auto_batching' is True, change `batch_size`
+                to define the number of tasks uploaded in each batch (default 500). Set it to `"auto"` to
+                size the batches from the response time of the server and the size of the tasks.
+            max_in_flight_batches (int, optional): Maximum number of batches uploaded at the same time.
+                A batch is only uploaded once the batches containing the parents of its tasks have been
+                accepted. Defaults to 1: the batches are uploaded one after the other.
 
         Returns:
             models.ComputePlan: updated compute plan, as described in the
@@ -858,9 +1453,43 @@ class Client:
         spec_options = {
             "auto_batching": auto_batching,
             "batch_size": batch_size,
+            "max_in_flight_batches": max_in_flight_batches,
         }
         return self._backend.add_compute_plan_tasks(spec, spec_options=spec_options)
 
+    @logit
+    def resume_compute_plan_submission(
+        self,
+        data: Union[dict, schemas.ComputePlanSpec],
+        auto_batching: bool = True,
+        batch_size: Union[int, Literal["auto"]] = DEFAULT_BATCH_SIZE,
+        max_in_flight_batches: int = DEFAULT_MAX_IN_FLIGHT_BATCHES,
+    ) -> models.ComputePlan:
+        """Finish the submission of a compute plan, e.g. after a crash or a timeout during `add_compute_plan`.
+
+        The compute plan is created if it does not exist. The keys of its existing tasks are listed, and only the
+        tasks of the specification which are not registered yet are submitted, so that no task is duplicated.
+
+        Args:
+            data (Union[dict, schemas.ComputePlanSpec]): specification of the compute plan, as given to
+                `add_compute_plan`. If it is a dict, it must have the same keys as specified in
+                [schemas.ComputePlanSpec](sdk_schemas.md#ComputePlanSpec).
+            auto_batching (bool, optional): cf `add_compute_plan`. Defaults to True.
+            batch_size (Union[int, str], optional): cf `add_compute_plan`. Defaults to 500.
+            max_in_flight_batches (int, optional): cf `add_compute_plan`. Defaults to 1.
+
+        Returns:
+            models.ComputePlan: the compute plan, as described in the
+            [models.ComputePlan](sdk_models.md#ComputePlan) model
+        """
+        spec = self._get_spec(schemas.ComputePlanSpec, data)
+        spec_options = {
+            "auto_batching": auto_batching,
+            "batch_size": batch_size,
+            "max_in_flight_batches": max_in_flight_batches,
+        }
+        return self._backend.resume_compute_plan_submission(spec, spec_options=spec_options)
+
     @logit
     def update_compute_plan(self, key: str, name: str):
         spec = self._get_spec(schemas.UpdateComputePlanSpec, {"name": name})
@@ -933,6 +1562,9 @@ class Client:
         To load and use the model, please refer to the 'load_model' and 'predict' functions of the
         class.
 
+        If `verify_checksums` is enabled, the metadata of the model are fetched first to read its checksum,
+        with one more request, unless the model was fetched before by the client, e.g. by `get_model`.
+
         Args:
             key (str): Model key to download
             destination_folder (str): Destination folder
@@ -1003,7 +1635,12 @@ class Client:
 
     @logit
     def wait_compute_plan(
-        self, key: str, *, timeout: Optional[float] = None, polling_period: float = 2.0, raise_on_failure: bool = True
+        self,
+        key: str,
+        *,
+        timeout: Optional[float] = None,
+        polling_period: Optional[float] = None,
+        raise_on_failure: bool = True,
     ) -> models.ComputePlan:
         """Wait for the execution of the given compute plan to finish.
 
@@ -1012,7 +1649,8 @@ class Client:
         Args:
             key (str): the key of the compute plan to wait for
             timeout (float, optional): maximum time to wait, in seconds. If set to None, will hang until completion.
-            polling_period (float): time to wait between two checks, in seconds. Defaults to 2.0.
+            polling_period (float, optional): constant time to wait between two checks, in seconds.
+                Defaults to None, to follow the polling policy of the client.
             raise_on_failure (bool): whether to raise an exception if the execution fails. Defaults to True.
 
         Returns:
@@ -1023,29 +1661,23 @@ class Client:
             exceptions.FutureTimeoutError: The compute plan took more than the duration set in the timeout to complete.
                 Not raised when `timeout == None`
         """
-        asset_getter = self.get_compute_plan
-        status_failed = models.ComputePlanStatus.failed.value
-        status_canceled = models.ComputePlanStatus.canceled.value
-        statuses_stopped = (
-            models.ComputePlanStatus.done.value,
-            models.ComputePlanStatus.failed.value,
-            models.ComputePlanStatus.canceled.value,
-        )
-
         return self._wait(
             key=key,
-            asset_getter=asset_getter,
+            asset_getter=self.get_compute_plan,
             polling_period=polling_period,
             raise_on_failure=raise_on_failure,
-            status_canceled=status_canceled,
-            status_failed=status_failed,
-            statuses_stopped=statuses_stopped,
             timeout=timeout,
+            **_WAIT_STATUSES[schemas.Type.ComputePlan],
         )
 
     @logit
     def wait_task(
-        self, key: str, *, timeout: Optional[float] = None, polling_period: float = 2.0, raise_on_failure: bool = True
+        self,
+        key: str,
+        *,
+        timeout: Optional[float] = None,
+        polling_period: Optional[float] = None,
+        raise_on_failure: bool = True,
     ) -> models.Task:
         """Wait for the execution of the given task to finish.
 
@@ -1054,7 +1686,8 @@ class Client:
         Args:
             key (str): the key of the task to wait for.
             timeout (float, optional): maximum time to wait, in seconds. If set to None, will hang until completion.
-            polling_period (float): time to wait between two checks, in seconds. Defaults to 2.0.
+            polling_period (float, optional): constant time to wait between two checks, in seconds.
+                Defaults to None, to follow the polling policy of the client.
             raise_on_failure (bool): whether to raise an exception if the execution fails. Defaults to True.
 
         Returns:
@@ -1065,24 +1698,23 @@ class Client:
             exceptions.FutureTimeoutError: The task took more than the duration set in the timeout to complete.
                 Not raised when `timeout == None`
         """
-        asset_getter = self.get_task
-        status_canceled = models.ComputeTaskStatus.canceled.value
-        status_failed = models.ComputeTaskStatus.failed.value
-        statuses_stopped = (models.ComputeTaskStatus.done.value, models.ComputeTaskStatus.canceled.value)
         return self._wait(
             key=key,
-            asset_getter=asset_getter,
+            asset_getter=self.get_task,
             polling_period=polling_period,
             raise_on_failure=raise_on_failure,
-            status_canceled=status_canceled,
-            status_failed=status_failed,
-            statuses_stopped=statuses_stopped,
             timeout=timeout,
+            **_WAIT_STATUSES[schemas.Type.Task],
         )
 
     @logit
     def wait_function(
-        self, key: str, *, timeout: Optional[float] = None, polling_period: float = 1.0, raise_on_failure: bool = True
+        self,
+        key: str,
+        *,
+        timeout: Optional[float] = None,
+        polling_period: Optional[float] = None,
+        raise_on_failure: bool = True,
     ) -> models.Function:
         """Wait for the build of the given function to finish.
 
@@ -1091,7 +1723,8 @@ class Client:
         Args:
             key (str): the key of the task to wait for.
             timeout (float, optional): maximum time to wait, in seconds. If set to None, will hang until completion.
-            polling_period (float): time to wait between two checks, in seconds. Defaults to 2.0.
+            polling_period (float, optional): constant time to wait between two checks, in seconds.
+                Defaults to None, to follow the polling policy of the client.
             raise_on_failure (bool): whether to raise an exception if the execution fails. Defaults to True.
 
         Returns:
@@ -1102,58 +1735,337 @@ class Client:
             exceptions.FutureTimeoutError: The function took more than the duration set in the timeout to build.
                 Not raised when `timeout == None`
         """
-        asset_getter = self.get_function
-        status_canceled = models.FunctionStatus.canceled.value
-        status_failed = models.FunctionStatus.failed.value
-        statuses_stopped = (
-            models.FunctionStatus.ready.value,
-            models.FunctionStatus.canceled.value,
-            models.FunctionStatus.failed.value,
-        )
         return self._wait(
             key=key,
-            asset_getter=asset_getter,
+            asset_getter=self.get_function,
             polling_period=polling_period,
             raise_on_failure=raise_on_failure,
-            status_canceled=status_canceled,
-            status_failed=status_failed,
-            statuses_stopped=statuses_stopped,
             timeout=timeout,
+            **_WAIT_STATUSES[schemas.Type.Function],
+        )
+
+    def iter_wait_compute_plans(
+        self, keys: List[str], *, timeout: Optional[float] = None, polling_period: Optional[float] = None
+    ) -> Iterator[models.ComputePlan]:
+        """Wait for the execution of the given compute plans to finish, yielding each one as soon as it is finished.
+
+        The statuses of all the unfinished compute plans are fetched with a single listing per polling period,
+        instead of one request per compute plan. The failed and canceled compute plans are yielded like the
+        others: check their status.
+
+        Args:
+            keys (List[str]): the keys of the compute plans to wait for
+            timeout (float, optional): maximum time to wait for all the compute plans, in seconds.
+                If set to None, will hang until completion.
+            polling_period (float, optional): constant time to wait between two checks, in seconds.
+                Defaults to None, to follow the polling policy of the client.
+
+        Yields:
+            models.ComputePlan: the compute plans, in the order they finish
+
+        Raises:
+            exceptions.AssetsNotFound: Some of the compute plans do not exist.
+            exceptions.FutureTimeoutError: Some compute plans were not finished before the timeout, their keys
+                are listed in its `keys` attribute. Not raised when `timeout == None`
+        """
+        return self._iter_wait(
+            asset_type=schemas.Type.ComputePlan,
+            keys=keys,
+            polling_period=polling_period,
+            timeout=timeout,
+            **_WAIT_STATUSES[schemas.Type.ComputePlan],
+        )
+
+    def iter_wait_tasks(
+        self, keys: List[str], *, timeout: Optional[float] = None, polling_period: Optional[float] = None
+    ) -> Iterator[models.Task]:
+        """Wait for the execution of the given tasks to finish, yielding each one as soon as it is finished.
+
+        The statuses of all the unfinished tasks are fetched with a single listing per polling period,
+        instead of one request per task. The failed and canceled tasks are yielded like the others: check
+        their status.
+
+        Args:
+            keys (List[str]): the keys of the tasks to wait for
+            timeout (float, optional): maximum time to wait for all the tasks, in seconds.
+                If set to None, will hang until completion.
+            polling_period (float, optional): constant time to wait between two checks, in seconds.
+                Defaults to None, to follow the polling policy of the client.
+
+        Yields:
+            models.Task: the tasks, in the order they finish
+
+        Raises:
+            exceptions.AssetsNotFound: Some of the tasks do not exist.
+            exceptions.FutureTimeoutError: Some tasks were not finished before the timeout, their keys are
+                listed in its `keys` attribute. Not raised when `timeout == None`
+        """
+        return self._iter_wait(
+            asset_type=schemas.Type.Task,
+            keys=keys,
+            polling_period=polling_period,
+            timeout=timeout,
+            **_WAIT_STATUSES[schemas.Type.Task],
+        )
+
+    @logit
+    def wait_compute_plans(
+        self,
+        keys: List[str],
+        *,
+        timeout: Optional[float] = None,
+        polling_period: Optional[float] = None,
+        raise_on_failure: bool = True,
+    ) -> List[models.ComputePlan]:
+        """Wait for the execution of the given compute plans to finish, cf `iter_wait_compute_plans`.
+
+        Args:
+            keys (List[str]): the keys of the compute plans to wait for
+            timeout (float, optional): maximum time to wait for all the compute plans, in seconds.
+                If set to None, will hang until completion.
+            polling_period (float, optional): constant time to wait between two checks, in seconds.
+                Defaults to None, to follow the polling policy of the client.
+            raise_on_failure (bool): whether to raise an exception if some executions fail. Defaults to True.
+
+        Returns:
+            List[models.ComputePlan]: the compute plans after completion, in the order of the keys
+
+        Raises:
+            exceptions.AssetsNotFound: Some of the compute plans do not exist.
+            exceptions.FutureFailureError: Some compute plans failed or have been cancelled, they are listed in
+                its `assets` attribute. Raised once all the compute plans are finished.
+            exceptions.FutureTimeoutError: Some compute plans were not finished before the timeout, their keys
+                are listed in its `keys` attribute. Not raised when `timeout == None`
+        """
+        finished = {
+            asset.key: asset
+            for asset in self.iter_wait_compute_plans(keys, timeout=timeout, polling_period=polling_period)
+        }
+        return _gather_wait_results(
+            keys, finished, raise_on_failure=raise_on_failure, **_WAIT_STATUSES[schemas.Type.ComputePlan]
         )
 
+    @logit
+    def wait_tasks(
+        self,
+        keys: List[str],
+        *,
+        timeout: Optional[float] = None,
+        polling_period: Optional[float] = None,
+        raise_on_failure: bool = True,
+    ) -> List[models.Task]:
+        """Wait for the execution of the given tasks to finish, cf `iter_wait_tasks`.
+
+        Args:
+            keys (List[str]): the keys of the tasks to wait for
+            timeout (float, optional): maximum time to wait for all the tasks, in seconds.
+                If set to None, will hang until completion.
+            polling_period (float, optional): constant time to wait between two checks, in seconds.
+                Defaults to None, to follow the polling policy of the client.
+            raise_on_failure (bool): whether to raise an exception if some executions fail. Defaults to True.
+
+        Returns:
+            List[models.Task]: the tasks after completion, in the order of the keys
+
+        Raises:
+            exceptions.AssetsNotFound: Some of the tasks do not exist.
+            exceptions.FutureFailureError: Some tasks failed or have been cancelled, they are listed in its
+                `assets` attribute. Raised once all the tasks are finished.
+            exceptions.FutureTimeoutError: Some tasks were not finished before the timeout, their keys are
+                listed in its `keys` attribute. Not raised when `timeout == None`
+        """
+        finished = {
+            asset.key: asset for asset in self.iter_wait_tasks(keys, timeout=timeout, polling_period=polling_period)
+        }
+        return _gather_wait_results(
+            keys, finished, raise_on_failure=raise_on_failure, **_WAIT_STATUSES[schemas.Type.Task]
+        )
+
+    def _iter_wait(
+        self,
+        *,
+        asset_type: schemas.Type,
+        keys: List[str],
+        polling_period: Optional[float],
+        timeout: Optional[float] = None,
+        **kwargs,
+    ) -> Iterator:
+        polls = _iter_wait_polls(
+            asset_type=asset_type,
+            keys=keys,
+            polling_policy=self._polling_policy.with_period(polling_period),
+            timeout=timeout,
+            **kwargs,
+        )
+        for delay, pending_keys in polls:
+            if delay:
+                time.sleep(delay)
+            yield from polls.send(self._get_many(asset_type, pending_keys))
+
     def _wait(
         self,
         *,
         key: str,
         asset_getter,
-        polling_period: float,
-        raise_on_failure: bool,
-        status_failed: str,
-        status_canceled: str,
-        statuses_stopped: Sequence[str],
+        polling_period: Optional[float],
         timeout: Optional[float] = None,
+        **kwargs,
     ):
-        tstart = time.time()
-        while True:
+        polls = _wait_polls(polling_policy=self._polling_policy.with_period(polling_period), timeout=timeout, **kwargs)
+        for delay in polls:
+            if delay:
+                time.sleep(delay)
             asset = asset_getter(key)
+            polls.send(asset)
+        return asset
 
-            if asset.status in statuses_stopped:
-                break
 
-            if asset.status == models.ComputeTaskStatus.failed.value and asset.error_type is not None:
-                # when dealing with a failed task, wait for the error_type field of the task to be set
-                # i.e. wait for the registration of the failure report
-                break
+# The polling loops of the wait methods are generators without I/O, shared by Client and AsyncClient, which send
+# the requests and sleep, blocking or not. Each iteration yields the time to sleep before the next poll, is sent
+# the response of the poll and yields the assets to hand out, until the wait is over.
 
-            if timeout and time.time() - tstart > timeout:
-                raise exceptions.FutureTimeoutError(f"Future timeout on {asset}")
 
-            time.sleep(polling_period)
+def _wait_polls(
+    *,
+    polling_policy: PollingPolicy,
+    timeout: Optional[float],
+    raise_on_failure: bool,
+    status_failed: str,
+    status_canceled: str,
+    statuses_stopped: Sequence[str],
+):
+    """Polls of a single asset: is sent the asset."""
+    tstart = time.time()
+    request_time = 0.0
+    delay = 0.0
+    for poll in itertools.count():
+        ts = time.time()
+        asset = yield delay
+        request_time += max(time.time() - ts - delay, 0.0)
 
-        if raise_on_failure and asset.status == status_failed:
-            raise exceptions.FutureFailureError(f"Future execution failed on {asset}")
+        if _is_wait_over(asset, statuses_stopped):
+            if raise_on_failure:
+                _raise_on_wait_failure(asset, status_failed=status_failed, status_canceled=status_canceled)
+            yield
+            return
 
-        if raise_on_failure and asset.status == status_canceled:
-            raise exceptions.FutureFailureError(f"Future execution canceled on {asset}")
+        if timeout and time.time() - tstart > timeout:
+            raise exceptions.FutureTimeoutError(f"Future timeout on {asset}")
+        polling_policy.check_budget(poll + 1, request_time, str(asset))
 
-        return asset
+        delay = _polling_delay(polling_policy, poll, _estimated_end_date([asset]), tstart, timeout)
+        yield
+
+
+def _iter_wait_polls(
+    *,
+    asset_type: schemas.Type,
+    keys: List[str],
+    polling_policy: PollingPolicy,
+    timeout: Optional[float],
+    statuses_stopped: Sequence[str],
+    **kwargs,
+):
+    """Polls of many assets: yields the keys of the assets to poll with the delay, is sent the assets and
+    yields the finished ones."""
+    pending_keys = list(dict.fromkeys(keys))
+    tstart = time.time()
+    request_time = 0.0
+    delay = 0.0
+    for poll in itertools.count():
+        ts = time.time()
+        assets = yield delay, pending_keys
+        request_time += max(time.time() - ts - delay, 0.0)
+
+        unfinished_assets = [asset for asset in assets if not _is_wait_over(asset, statuses_stopped)]
+        pending_keys = [asset.key for asset in unfinished_assets]
+        yield [asset for asset in assets if _is_wait_over(asset, statuses_stopped)]
+        if not pending_keys:
+            return
+
+        description = f"{len(pending_keys)} {asset_type.value}: {', '.join(pending_keys[:10])}"
+        if timeout and time.time() - tstart > timeout:
+            raise exceptions.FutureTimeoutError(f"Future timeout on {description}", keys=pending_keys)
+        polling_policy.check_budget(poll + 1, request_time, description, keys=pending_keys)
+
+        delay = _polling_delay(polling_policy, poll, _estimated_end_date(unfinished_assets), tstart, timeout)
+
+
+def _stream_polls(
+    *,
+    polling_policy: PollingPolicy,
+    timeout: Optional[float],
+    statuses_stopped: Sequence[str],
+    **kwargs,
+):
+    """Polls of the performances of a compute plan: yields the cursor of the performances to get with the delay,
+    is sent the compute plan, its new performances and the next cursor, and yields the new performances."""
+    tstart = time.time()
+    cursor = None
+    delay = 0.0
+    poll = 0
+    while True:
+        compute_plan, rows, cursor = yield delay, cursor
+        yield rows
+
+        if compute_plan.status in statuses_stopped:
+            return
+        if timeout and time.time() - tstart > timeout:
+            raise exceptions.FutureTimeoutError(f"Future timeout on {compute_plan}")
+
+        # poll fast again when performances are coming
+        poll = 0 if rows else poll + 1
+        delay = _polling_delay(polling_policy, poll, None, tstart, timeout)
+
+
+def _estimated_end_date(assets) -> Optional[datetime]:
+    """Earliest estimated end date of the assets, None if one of them has none."""
+    estimated_end_dates = [getattr(asset, "estimated_end_date", None) for asset in assets]
+    if not estimated_end_dates or None in estimated_end_dates:
+        return None
+    return min(estimated_end_dates)
+
+
+def _polling_delay(
+    polling_policy: PollingPolicy,
+    poll: int,
+    estimated_end_date: Optional[datetime],
+    tstart: float,
+    timeout: Optional[float],
+) -> float:
+    delay = polling_policy.delay(poll, estimated_end_date)
+    if timeout:
+        # check the status one last time at the timeout rather than sleeping past it
+        delay = min(delay, max(tstart + timeout - time.time(), 0))
+    return delay
+
+
+def _is_wait_over(asset, statuses_stopped: Sequence[str]) -> bool:
+    if asset.status in statuses_stopped:
+        return True
+
+    # when dealing with a failed task, wait for the error_type field of the task to be set
+    # i.e. wait for the registration of the failure report
+    return asset.status == models.ComputeTaskStatus.failed.value and asset.error_type is not None
+
+
+def _raise_on_wait_failure(asset, *, status_failed: str, status_canceled: str) -> None:
+    if asset.status == status_failed:
+        raise exceptions.FutureFailureError(f"Future execution failed on {asset}")
+
+    if asset.status == status_canceled:
+        raise exceptions.FutureFailureError(f"Future execution canceled on {asset}")
+
+
+def _gather_wait_results(
+    keys: List[str], finished: dict, *, raise_on_failure: bool, status_failed: str, status_canceled: str, **kwargs
+) -> list:
+    if raise_on_failure:
+        failed = [asset for asset in finished.values() if asset.status in (status_failed, status_canceled)]
+        if failed:
+            details = ", ".join(f"{asset.key} ({asset.status.value})" for asset in failed[:10])
+            raise exceptions.FutureFailureError(
+                f"Future execution failed or canceled on {len(failed)} assets: {details}", assets=failed
+            )
+
+    return [finished[key] for key in keys]
@@ -1,4 +1,7 @@
+import email.utils
 import logging
+import time
+from typing import Optional
 from typing import Union
 
 import requests
@@ -15,6 +18,9 @@ class LoadDataException(SDKException):
 
 
 class RequestException(SDKException):
+    # delay in seconds requested by the server before retrying, from the `Retry-After` header
+    retry_after: Optional[float] = None
+
     def __init__(self, msg, status_code):
         self.msg = msg
         self.status_code = status_code
@@ -57,6 +63,10 @@ class GatewayUnavailable(HTTPError):
     pass
 
 
+class TooManyRequests(HTTPError):
+    pass
+
+
 class InvalidRequest(HTTPError):
     def __init__(self, msg, status_code, errors=None):
         super().__init__(msg, status_code)
@@ -87,6 +97,17 @@ class NotFound(HTTPError):
     pass
 
 
+class AssetsNotFound(NotFound):
+    """Some of the requested assets do not exist."""
+
+    def __init__(self, asset_type, keys):
+        self.keys = keys
+        msg = f"{len(keys)} {asset_type} not found: {', '.join(keys[:10])}"
+        if len(keys) > 10:
+            msg += ", ..."
+        super().__init__(msg, 404)
+
+
 class RequestTimeout(HTTPError):
     def __init__(self, key, status_code):
         self.key = key
@@ -168,6 +189,22 @@ class UsernamePasswordLoginDisabledException(RequestException):
         )
 
 
+def _parse_retry_after(response: requests.Response) -> Optional[float]:
+    """Parse the `Retry-After` header, given either as a number of seconds or as an HTTP date."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, date.timestamp() - time.time())
+
+
 def from_request_exception(
     e: requests.exceptions.RequestException,
 ) -> Union[RequestException, requests.exceptions.RequestException]:
@@ -189,6 +226,7 @@ def from_request_exception(
         404: NotFound,
         408: RequestTimeout,
         409: AlreadyExists,
+        429: TooManyRequests,
         500: InternalServerError,
         502: GatewayUnavailable,
         503: GatewayUnavailable,
@@ -196,7 +234,9 @@ def from_request_exception(
     }
     if isinstance(e, requests.exceptions.HTTPError):
         logger.error(f"Requests error status {e.response.status_code}: {e.response.text}")
-        return http_status_mapping.get(e.response.status_code, HTTPError).from_request_exception(e)
+        exception = http_status_mapping.get(e.response.status_code, HTTPError).from_request_exception(e)
+        exception.retry_after = _parse_retry_after(e.response)
+        return exception
 
     return e
 
@@ -219,6 +259,16 @@ class UserException(SDKException):
     pass
 
 
+class ChecksumMismatch(SDKException):
+    """The checksum of a downloaded file does not match the checksum of the asset."""
+
+    def __init__(self, url, expected, actual):
+        self.url = url
+        self.expected = expected
+        self.actual = actual
+        super().__init__(f"Checksum of the file downloaded from {url} is {actual}, expected {expected}")
+
+
 class EmptyInModelException(SDKException):
     """No in_models when needed"""
 
@@ -291,8 +341,22 @@ class FutureError(Exception):
 
 
 class FutureTimeoutError(FutureError):
-    """Future execution timed out."""
+    """Future execution timed out.
+
+    When waiting for many assets, `keys` lists the assets which were not finished.
+    """
+
+    def __init__(self, message, keys=None):
+        self.keys = keys or []
+        super().__init__(message)
 
 
 class FutureFailureError(FutureError):
-    """Future execution failed."""
+    """Future execution failed.
+
+    When waiting for many assets, `assets` lists the assets which failed or were canceled.
+    """
+
+    def __init__(self, message, assets=None):
+        self.assets = assets or []
+        super().__init__(message)
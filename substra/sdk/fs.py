@@ -1,9 +1,14 @@
 import os
+import threading
 
 from substra.sdk.hasher import Hasher
 
 _BLOCK_SIZE = 64 * 1024
 
+# hashes of the files by path, with the size and modification time of the hashed file
+_HASH_CACHE = {}
+_HASH_CACHE_LOCK = threading.Lock()
+
 
 def hash_file(path):
     """Hash a file."""
@@ -18,6 +23,21 @@ def hash_file(path):
     return hasher.compute()
 
 
+def hash_file_cached(path):
+    """Hash a file, reusing the hash computed for the same path if its size and modification time
+    did not change."""
+    real_path = os.path.realpath(path)
+    stat = os.stat(real_path)
+    with _HASH_CACHE_LOCK:
+        size, mtime, file_hash = _HASH_CACHE.get(real_path, (None, None, None))
+    if (size, mtime) == (stat.st_size, stat.st_mtime_ns):
+        return file_hash
+    file_hash = hash_file(real_path)
+    with _HASH_CACHE_LOCK:
+        _HASH_CACHE[real_path] = (stat.st_size, stat.st_mtime_ns, file_hash)
+    return file_hash
+
+
 def hash_directory(path, followlinks=False):
     """Hash a directory."""
 
@@ -8,6 +8,9 @@ class Hasher:
             for v in values:
                 self.update(v)
 
+    def reset(self):
+        self._h = hashlib.sha256()
+
     def update(self, v):
         if isinstance(v, str):
             v = v.encode("utf-8")
@@ -0,0 +1,266 @@
+import bisect
+import collections
+import re
+import threading
+import urllib.parse
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+
+# upper bounds, in seconds, of the latency histogram buckets
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# upper bounds of the histogram buckets of the number of tasks per batch
+DEFAULT_BATCH_SIZE_BUCKETS = (1, 10, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+_UUID_PATTERN = re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}")
+
+
+def normalize_endpoint(url: str) -> str:
+    """Path of the URL, with the asset keys replaced by `{key}` so that the requests to the same
+    route are aggregated, e.g. `https://substra.org/task/<uuid>/` -> `/task/{key}/`.
+    """
+    path = urllib.parse.urlsplit(url).path or "/"
+    return _UUID_PATTERN.sub("{key}", path)
+
+
+class Histogram:
+    """Histogram of observed values, with cumulative buckets as in Prometheus."""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative_counts(self) -> Dict[str, int]:
+        """Number of observed values lower or equal to each bucket bound, `+Inf` included."""
+        result = {}
+        total = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            result["+Inf" if bound == float("inf") else f"{bound:g}"] = total
+        return result
+
+    def to_dict(self) -> dict:
+        return {"count": self.count, "sum": self.sum, "buckets": self.cumulative_counts()}
+
+
+class _Stats:
+    def __init__(self, buckets):
+        self.latency = Histogram(buckets)
+        self.errors = collections.Counter()
+        self.retries = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+
+class MetricsRegistry:
+    """Thread-safe registry of the metrics of a client.
+
+    It aggregates, per HTTP endpoint (method and route), the number of requests, their latency, the retries,
+    the bytes sent and received and the classes of the errors; and per client method, the number of calls,
+    their latency and the classes of the errors.
+
+    Example:
+        ```python
+        client.list_task()
+        print(client.metrics().to_dict()["requests"]["GET /task/"]["latency"]["sum"])
+        print(client.metrics().to_prometheus())
+        ```
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_LATENCY_BUCKETS):
+        self._buckets = buckets
+        self._lock = threading.Lock()
+        self._requests: Dict[Tuple[str, str], _Stats] = {}
+        self._calls: Dict[str, _Stats] = {}
+        self._batch_sizes = Histogram(DEFAULT_BATCH_SIZE_BUCKETS)
+        self._batch_latency = Histogram(buckets)
+
+    def _request_stats(self, method: str, url: str) -> _Stats:
+        key = (method.upper(), normalize_endpoint(url))
+        if key not in self._requests:
+            self._requests[key] = _Stats(self._buckets)
+        return self._requests[key]
+
+    def record_request(
+        self,
+        method: str,
+        url: str,
+        duration: float,
+        *,
+        error: Optional[str] = None,
+        bytes_sent: int = 0,
+        bytes_received: int = 0,
+    ) -> None:
+        """Record an HTTP request, its duration in seconds and the class name of the error it raised if any."""
+        with self._lock:
+            stats = self._request_stats(method, url)
+            stats.latency.observe(duration)
+            stats.bytes_sent += bytes_sent
+            stats.bytes_received += bytes_received
+            if error:
+                stats.errors[error] += 1
+
+    def record_retry(self, method: str, url: str) -> None:
+        """Record the retry of an HTTP request."""
+        with self._lock:
+            self._request_stats(method, url).retries += 1
+
+    def record_call(self, name: str, duration: float, *, error: Optional[str] = None) -> None:
+        """Record a call to a client method, its duration in seconds and the class name of the error it raised
+        if any."""
+        with self._lock:
+            if name not in self._calls:
+                self._calls[name] = _Stats(self._buckets)
+            stats = self._calls[name]
+            stats.latency.observe(duration)
+            if error:
+                stats.errors[error] += 1
+
+    def record_batch(self, n_tasks: int, duration: float) -> None:
+        """Record a batch of tasks submitted to the server, and its duration in seconds."""
+        with self._lock:
+            self._batch_sizes.observe(n_tasks)
+            self._batch_latency.observe(duration)
+
+    def reset(self) -> None:
+        """Forget all the recorded metrics."""
+        with self._lock:
+            self._requests.clear()
+            self._calls.clear()
+            self._batch_sizes = Histogram(DEFAULT_BATCH_SIZE_BUCKETS)
+            self._batch_latency = Histogram(self._buckets)
+
+    def to_dict(self) -> dict:
+        """Snapshot of the metrics.
+
+        Returns:
+            dict: `requests` maps each endpoint (e.g. `GET /task/{key}/`) to its `count`, `latency`
+                histogram (in seconds), `retries`, `bytes_sent`, `bytes_received` and `errors` per class name;
+                `calls` maps each client method to its `count`, `latency` histogram and `errors`;
+                `batches` holds the histograms of the number of `tasks` and of the `latency` of the batches of
+                tasks submitted.
+        """
+        with self._lock:
+            requests = {
+                f"{method} {endpoint}": {
+                    "count": stats.latency.count,
+                    "latency": stats.latency.to_dict(),
+                    "retries": stats.retries,
+                    "bytes_sent": stats.bytes_sent,
+                    "bytes_received": stats.bytes_received,
+                    "errors": dict(stats.errors),
+                }
+                for (method, endpoint), stats in sorted(self._requests.items())
+            }
+            calls = {
+                name: {
+                    "count": stats.latency.count,
+                    "latency": stats.latency.to_dict(),
+                    "errors": dict(stats.errors),
+                }
+                for name, stats in sorted(self._calls.items())
+            }
+            batches = {"tasks": self._batch_sizes.to_dict(), "latency": self._batch_latency.to_dict()}
+        return {"requests": requests, "calls": calls, "batches": batches}
+
+    def to_prometheus(self, prefix: str = "substra") -> str:
+        """Export the metrics in the Prometheus text exposition format."""
+        lines = []
+
+        def family(name, type_, help_, samples):
+            lines.append(f"# HELP {prefix}_{name} {help_}")
+            lines.append(f"# TYPE {prefix}_{name} {type_}")
+            for suffix, labels, value in samples:
+                formatted_labels = ",".join(f'{label}="{_escape(str(v))}"' for label, v in labels.items())
+                if formatted_labels:
+                    formatted_labels = f"{{{formatted_labels}}}"
+                lines.append(f"{prefix}_{name}{suffix}{formatted_labels} {value:g}")
+
+        def histogram_samples(labels, histogram):
+            for bound, count in histogram.cumulative_counts().items():
+                yield "_bucket", {**labels, "le": bound}, count
+            yield "_sum", labels, histogram.sum
+            yield "_count", labels, histogram.count
+
+        with self._lock:
+            requests = [
+                ({"method": method, "endpoint": endpoint}, stats)
+                for (method, endpoint), stats in sorted(self._requests.items())
+            ]
+            calls = [({"method": name}, stats) for name, stats in sorted(self._calls.items())]
+
+            family(
+                "http_request_duration_seconds",
+                "histogram",
+                "Duration of the HTTP requests sent to the Substra server.",
+                [sample for labels, stats in requests for sample in histogram_samples(labels, stats.latency)],
+            )
+            family(
+                "http_request_retries_total",
+                "counter",
+                "Number of retried HTTP requests.",
+                [("", labels, stats.retries) for labels, stats in requests],
+            )
+            family(
+                "http_request_errors_total",
+                "counter",
+                "Number of failed HTTP requests, per error class.",
+                [
+                    ("", {**labels, "error": error}, count)
+                    for labels, stats in requests
+                    for error, count in sorted(stats.errors.items())
+                ],
+            )
+            family(
+                "http_request_sent_bytes_total",
+                "counter",
+                "Size of the bodies of the HTTP requests.",
+                [("", labels, stats.bytes_sent) for labels, stats in requests],
+            )
+            family(
+                "http_response_received_bytes_total",
+                "counter",
+                "Size of the bodies of the HTTP responses.",
+                [("", labels, stats.bytes_received) for labels, stats in requests],
+            )
+            family(
+                "client_call_duration_seconds",
+                "histogram",
+                "Duration of the calls to the client methods.",
+                [sample for labels, stats in calls for sample in histogram_samples(labels, stats.latency)],
+            )
+            family(
+                "client_call_errors_total",
+                "counter",
+                "Number of failed calls to the client methods, per error class.",
+                [
+                    ("", {**labels, "error": error}, count)
+                    for labels, stats in calls
+                    for error, count in sorted(stats.errors.items())
+                ],
+            )
+            family(
+                "task_batch_size",
+                "histogram",
+                "Number of tasks of the batches submitted.",
+                list(histogram_samples({}, self._batch_sizes)),
+            )
+            family(
+                "task_batch_duration_seconds",
+                "histogram",
+                "Duration of the submission of the batches of tasks.",
+                list(histogram_samples({}, self._batch_latency)),
+            )
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
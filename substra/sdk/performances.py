@@ -0,0 +1,141 @@
+import sys
+from datetime import datetime
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+
+
+class PerformanceRow(NamedTuple):
+    """Performance of a task"""
+
+    compute_plan_key: str
+    task_key: str
+    worker: str
+    task_rank: Optional[int]
+    round_idx: Optional[int]
+    identifier: str
+    performance: float
+
+
+def select_new_tasks(done_tasks: Iterable, cursor: Optional[dict]) -> Tuple[list, dict]:
+    """Select the tasks done since the `cursor` returned by the previous call, cf `get_new_performances`.
+
+    `done_tasks` are the done tasks of a compute plan, from the most recently done one: they are only read until
+    the tasks done before the cursor. The new tasks are returned from the least recently done one.
+
+    The cursor is not modified, a new one is returned. It holds the end date of the most recently done tasks, as
+    an ISO 8601 string, and the sorted keys of the tasks done at that date only, so that it stays small and can be
+    serialized to JSON.
+    """
+    cursor = cursor or {"end_date": None, "task_keys": []}
+    end_date = datetime.fromisoformat(cursor["end_date"]) if cursor["end_date"] is not None else None
+    seen = set(cursor["task_keys"])
+    new_tasks = []
+    for task in done_tasks:
+        if end_date is not None and task.end_date is not None and task.end_date < end_date:
+            break
+        if task.key not in seen:
+            new_tasks.append(task)
+
+    end_dates = [task.end_date for task in new_tasks if task.end_date is not None]
+    if end_dates and (end_date is None or max(end_dates) > end_date):
+        end_date = max(end_dates)
+        seen = set()
+    # the tasks done at the cursor date are listed again by the next call
+    seen.update(task.key for task in new_tasks if task.end_date == end_date)
+    new_cursor = {
+        "end_date": end_date.isoformat() if end_date is not None else None,
+        "task_keys": sorted(seen),
+    }
+    return new_tasks[::-1], new_cursor
+
+
+def _import_numpy():
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError("numpy is required for the columnar performances: `pip install numpy`") from e
+    return numpy
+
+
+class Categorical:
+    """Column of repeated strings, stored as integer codes into a list of interned categories."""
+
+    def __init__(self, codes, categories: List[str]):
+        self.codes = codes
+        self.categories = categories
+
+    @classmethod
+    def from_values(cls, values: Iterable[str]) -> "Categorical":
+        np = _import_numpy()
+        index = {}
+        codes = [index.setdefault(sys.intern(value), len(index)) for value in values]
+        return cls(np.asarray(codes, dtype=np.int32), list(index))
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def to_list(self) -> List[str]:
+        return [self.categories[code] for code in self.codes]
+
+
+class ColumnarPerformances:
+    """Performances of many compute plans, stored by columns.
+
+    `task_rank`, `round_idx` and `performance` are float NumPy arrays; `task_rank` is NaN for the tasks without
+    a rank and `round_idx` for the tasks which are not part of a round. `compute_plan_key`, `worker` and
+    `identifier` are [Categorical](#Categorical) columns. `to_pandas` builds a DataFrame over the same arrays.
+
+    Example:
+        ```python
+        perf = client.get_performances_many(cp_keys)
+        df = perf.to_pandas()
+        print(df.groupby(["compute_plan_key", "identifier"])["performance"].max())
+        ```
+    """
+
+    def __init__(self, columns: Dict[str, object]):
+        self.columns = columns
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[PerformanceRow]) -> "ColumnarPerformances":
+        np = _import_numpy()
+        rows = list(rows)
+        compute_plan_keys, task_keys, workers, ranks, round_idxs, identifiers, perfs = zip(*rows) if rows else ([],) * 7
+        return cls(
+            {
+                "compute_plan_key": Categorical.from_values(compute_plan_keys),
+                "task_key": np.asarray(task_keys, dtype=object),
+                "worker": Categorical.from_values(workers),
+                "task_rank": np.asarray([np.nan if rank is None else rank for rank in ranks], dtype=np.float64),
+                "round_idx": np.asarray(
+                    [np.nan if round_idx is None else round_idx for round_idx in round_idxs], dtype=np.float64
+                ),
+                "identifier": Categorical.from_values(identifiers),
+                "performance": np.asarray(perfs, dtype=np.float64),
+            }
+        )
+
+    def __len__(self) -> int:
+        return len(self.columns["task_key"])
+
+    def __getattr__(self, name):
+        try:
+            return self.__dict__["columns"][name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def to_pandas(self):
+        """Convert the performances to a pandas DataFrame, sharing the arrays of the columns."""
+        import pandas as pd
+
+        data = {}
+        for name, column in self.columns.items():
+            if isinstance(column, Categorical):
+                data[name] = pd.Categorical.from_codes(column.codes, categories=column.categories)
+            else:
+                data[name] = column
+        return pd.DataFrame(data, copy=False)
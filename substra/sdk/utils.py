@@ -1,3 +1,4 @@
+import collections
 import contextlib
 import copy
 import functools
@@ -5,14 +6,24 @@ import io
 import logging
 import ntpath
 import os
+import random
 import re
+import tempfile
 import time
 import uuid
 import zipfile
+from datetime import datetime
+from datetime import timezone
+from typing import Optional
 
 from substra.sdk import exceptions
 from substra.sdk import models
 
+# zipped folders are kept in memory up to this size, and written to a temporary file beyond
+ZIP_SPOOL_MAX_SIZE = 8 * 1024 * 1024
+# maximum total size of the zipped folders kept in memory at the same time
+ZIP_SPOOL_TOTAL_MAX_SIZE = 64 * 1024 * 1024
+
 
 def path_leaf(path):
     head, tail = ntpath.split(path)
@@ -61,6 +72,14 @@ def zip_folder_in_memory(path, followlinks=False):
     return fp
 
 
+def zip_folder_to_spooled_file(path, followlinks=False, max_size=ZIP_SPOOL_MAX_SIZE):
+    """Zip the folder in memory, or in a temporary file if the archive is larger than `max_size` bytes."""
+    fp = tempfile.SpooledTemporaryFile(max_size=max_size)
+    zip_folder(fp, path, followlinks=followlinks)
+    fp.seek(0)
+    return fp
+
+
 @contextlib.contextmanager
 def extract_data_sample_files(data, followlinks=False):
     # handle data sample specific case; paths and path cases
@@ -78,10 +97,19 @@ def extract_data_sample_files(data, followlinks=False):
         del data["paths"]
 
     files = {}
+    in_memory_size = 0
     for k, f in folders.items():
         if not os.path.isdir(f):
             raise exceptions.LoadDataException(f"Paths '{f}' is not an existing directory")
-        files[k] = zip_folder_in_memory(f, followlinks=followlinks)
+        files[k] = zip_folder_to_spooled_file(f, followlinks=followlinks)
+        size = files[k].seek(0, io.SEEK_END)
+        files[k].seek(0)
+        if size <= ZIP_SPOOL_MAX_SIZE:
+            in_memory_size += size
+            if in_memory_size > ZIP_SPOOL_TOTAL_MAX_SIZE:
+                # bound the memory used by the archives, whatever the number of folders
+                files[k].rollover()
+                in_memory_size -= size
 
     try:
         yield (data, files)
@@ -180,9 +208,239 @@ def check_search_ordering(order_by):
         )
 
 
+class RetryPolicy:
+    """Policy deciding whether and when a failed call is retried.
+
+    The delay between two attempts grows exponentially from `initial_delay`, capped to `max_delay`. With
+    full jitter, the actual delay is drawn uniformly between 0 and this value, so that many clients failing
+    at the same time do not retry all at once. A delay requested by the server through the `Retry-After`
+    header takes precedence if it is longer. No retry is attempted past the `timeout` deadline.
+
+    Example:
+        ```python
+        from substra.sdk import Client, RetryPolicy, exceptions
+
+        retry_policy = RetryPolicy(
+            exceptions={exceptions.GatewayUnavailable: None, exceptions.ConnectionError: 3},
+            max_delay=10,
+            timeout=60,
+        )
+        client = Client(url=url, token=token, backend_type="remote", retry_policy=retry_policy)
+        ```
+
+    Args:
+        exceptions (Union[Iterable[type], Dict[type, Optional[int]]], optional): exception types that trigger
+            a retry. A dict maps each exception type to the maximum number of retries on this exception
+            (None for no limit other than the timeout).
+            Defaults to `exceptions.GatewayUnavailable` and `exceptions.TooManyRequests`.
+        timeout (float, optional): deadline in seconds, from the first attempt, after which no retry is
+            attempted. None or False for no deadline. Defaults to 300.
+        initial_delay (float, optional): delay before the first retry, in seconds. Defaults to 1.
+        backoff (float, optional): factor applied to the delay after each retry. Defaults to 2.
+        max_delay (float, optional): maximum delay between two attempts, in seconds. Defaults to 30.
+        jitter (bool, optional): whether to draw the delay uniformly between 0 and its computed value.
+            Defaults to True.
+        respect_retry_after (bool, optional): whether to wait at least the delay requested by the server
+            in the `Retry-After` header. Defaults to True.
+    """
+
+    def __init__(
+        self,
+        exceptions=(exceptions.GatewayUnavailable, exceptions.TooManyRequests),
+        timeout: Optional[float] = 300,
+        initial_delay: float = 1,
+        backoff: float = 2,
+        max_delay: float = 30,
+        jitter: bool = True,
+        respect_retry_after: bool = True,
+    ):
+        if isinstance(exceptions, type):
+            exceptions = (exceptions,)
+        if not isinstance(exceptions, dict):
+            exceptions = {exception: None for exception in exceptions}
+        self.exceptions = dict(exceptions)
+        self.timeout = timeout if timeout is not False else None
+        self.initial_delay = initial_delay
+        self.backoff = backoff
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.respect_retry_after = respect_retry_after
+
+    def replace(self, **kwargs) -> "RetryPolicy":
+        """Copy of this policy, with the given arguments overridden."""
+        arguments = {
+            "exceptions": self.exceptions,
+            "timeout": self.timeout,
+            "initial_delay": self.initial_delay,
+            "backoff": self.backoff,
+            "max_delay": self.max_delay,
+            "jitter": self.jitter,
+            "respect_retry_after": self.respect_retry_after,
+        }
+        arguments.update(kwargs)
+        return RetryPolicy(**arguments)
+
+    def max_retries(self, exception: Exception) -> Optional[int]:
+        """Maximum number of retries on the given exception, 0 if it does not trigger a retry."""
+        for exception_type, max_retries in self.exceptions.items():
+            if isinstance(exception, exception_type):
+                return max_retries
+        return 0
+
+    def delay(self, retry: int, exception: Optional[Exception] = None) -> float:
+        """Delay in seconds before the given retry (starting at 0)."""
+        delay = self.initial_delay * self.backoff**retry
+        if self.max_delay is not None:
+            delay = min(delay, self.max_delay)
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        retry_after = getattr(exception, "retry_after", None)
+        if self.respect_retry_after and retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def call(self, f, *args, **kwargs):
+        """Call `f` with the given arguments, retrying it according to this policy."""
+        tstart = time.time()
+        retries = collections.Counter()
+
+        while True:
+            try:
+                return f(*args, **kwargs)
+
+            except tuple(self.exceptions) as e:
+                max_retries = self.max_retries(e)
+                if max_retries is not None and retries[type(e)] >= max_retries:
+                    raise
+                delay = self.delay(sum(retries.values()), e)
+                if self.timeout is not None and time.time() - tstart + delay > self.timeout:
+                    raise
+                retries[type(e)] += 1
+                logging.warning(f"Function {getattr(f, '__name__', f)} failed: retrying in {delay:.2f}s")
+                time.sleep(delay)
+
+    def __call__(self, f):
+        @functools.wraps(f)
+        def wrapper(*args, **kwargs):
+            return self.call(f, *args, **kwargs)
+
+        return wrapper
+
+    def __repr__(self):
+        return (
+            f"RetryPolicy(exceptions={self.exceptions}, timeout={self.timeout}, "
+            f"initial_delay={self.initial_delay}, backoff={self.backoff}, max_delay={self.max_delay}, "
+            f"jitter={self.jitter}, respect_retry_after={self.respect_retry_after})"
+        )
+
+
+class PollingPolicy:
+    """Schedule of the status requests sent by the `wait_*` methods of the client.
+
+    The period between two requests starts at `initial_period` so that short executions are noticed
+    quickly, and grows exponentially up to `max_period` for long ones. When the estimated end date of a
+    compute plan is known, the next request is only sent `eta_margin` seconds before it, within
+    `max_eta_period`.
+
+    The wait is stopped with a `FutureTimeoutError` once it has sent `max_requests` requests, or spent
+    `max_request_time` seconds waiting for their responses.
+
+    Example:
+        ```python
+        from substra.sdk import Client, PollingPolicy
+
+        polling_policy = PollingPolicy(max_period=60, max_requests=1000)
+        client = Client(url=url, token=token, backend_type="remote", polling_policy=polling_policy)
+        ```
+
+    Args:
+        initial_period (float, optional): delay before the second request, in seconds. Defaults to 0.5.
+        backoff (float, optional): factor applied to the period after each request. Defaults to 1.5.
+        max_period (float, optional): maximum period between two requests, in seconds, outside of the
+            estimated duration of the compute plan. Defaults to 30.
+        eta_margin (float, optional): time before the estimated end date at which the status is requested,
+            in seconds. None to ignore the estimated end dates. Defaults to 5.
+        max_eta_period (float, optional): maximum period between two requests when waiting for the estimated
+            end date, in seconds. Defaults to 600.
+        max_requests (int, optional): maximum number of requests sent by a wait. Defaults to None (no limit).
+        max_request_time (float, optional): maximum total duration of the requests sent by a wait, in seconds.
+            Defaults to None (no limit).
+    """
+
+    def __init__(
+        self,
+        initial_period: float = 0.5,
+        backoff: float = 1.5,
+        max_period: float = 30,
+        eta_margin: Optional[float] = 5,
+        max_eta_period: float = 600,
+        max_requests: Optional[int] = None,
+        max_request_time: Optional[float] = None,
+    ):
+        self.initial_period = initial_period
+        self.backoff = backoff
+        self.max_period = max_period
+        self.eta_margin = eta_margin
+        self.max_eta_period = max_eta_period
+        self.max_requests = max_requests
+        self.max_request_time = max_request_time
+
+    def replace(self, **kwargs) -> "PollingPolicy":
+        """Copy of this policy, with the given arguments overridden."""
+        arguments = {
+            "initial_period": self.initial_period,
+            "backoff": self.backoff,
+            "max_period": self.max_period,
+            "eta_margin": self.eta_margin,
+            "max_eta_period": self.max_eta_period,
+            "max_requests": self.max_requests,
+            "max_request_time": self.max_request_time,
+        }
+        arguments.update(kwargs)
+        return PollingPolicy(**arguments)
+
+    def with_period(self, period: Optional[float]) -> "PollingPolicy":
+        """This policy with a constant period if `period` is set, keeping its budget."""
+        if period is None:
+            return self
+        return self.replace(initial_period=period, backoff=1, max_period=period, eta_margin=None)
+
+    def delay(self, poll: int, estimated_end_date: Optional[datetime] = None) -> float:
+        """Delay in seconds after the given request (starting at 0)."""
+        delay = min(self.initial_period * self.backoff**poll, self.max_period)
+        if self.eta_margin is not None and estimated_end_date is not None:
+            if estimated_end_date.tzinfo is None:
+                estimated_end_date = estimated_end_date.replace(tzinfo=timezone.utc)
+            remaining = (estimated_end_date - datetime.now(timezone.utc)).total_seconds() - self.eta_margin
+            delay = max(delay, min(remaining, self.max_eta_period))
+        return delay
+
+    def check_budget(self, requests: int, request_time: float, description: str, keys: list = None) -> None:
+        """Raise a `FutureTimeoutError` if the requests sent so far exceed the budget of the policy."""
+        if self.max_requests is not None and requests >= self.max_requests:
+            raise exceptions.FutureTimeoutError(
+                f"Polling budget of {self.max_requests} requests exceeded on {description}", keys=keys
+            )
+        if self.max_request_time is not None and request_time >= self.max_request_time:
+            raise exceptions.FutureTimeoutError(
+                f"Polling budget of {self.max_request_time}s of requests exceeded on {description}", keys=keys
+            )
+
+    def __repr__(self):
+        return (
+            f"PollingPolicy(initial_period={self.initial_period}, backoff={self.backoff}, "
+            f"max_period={self.max_period}, eta_margin={self.eta_margin}, max_eta_period={self.max_eta_period}, "
+            f"max_requests={self.max_requests}, max_request_time={self.max_request_time})"
+        )
+
+
 def retry_on_exception(exceptions, timeout=300):
     """Retry function in case of exception(s).
 
+    The delay between two attempts starts at 1 second and doubles after each retry, without limit nor jitter,
+    and the function is retried as long as the timeout is not exceeded. See [RetryPolicy](#RetryPolicy) for
+    capped and jittered delays.
+
     Args:
         exceptions (list): list of exception types that trigger a retry
         timeout (int, optional): timeout in seconds
@@ -603,6 +603,9 @@ COMPUTE_PLAN = {
 }
 
 COMPUTE_PLAN_PERF = {
+    "count": 3,
+    "next": None,
+    "previous": None,
     "results": [
         {
             "compute_task": {
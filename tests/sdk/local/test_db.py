@@ -0,0 +1,284 @@
+import concurrent.futures
+import datetime
+
+import pytest
+
+import substra
+from substra.sdk import exceptions
+from substra.sdk import models
+from substra.sdk import schemas
+from substra.sdk.backends.local import backend as local_backend
+from substra.sdk.backends.local import db
+from substra.sdk.backends.local import models as models_local
+
+from ... import datastore
+
+
+def test_get_many():
+    in_memory_db = db.InMemoryDb()
+    tasks = [models.Task(**{**datastore.TRAINTASK, "key": str(i)}) for i in range(3)]
+    for task in tasks:
+        in_memory_db.add(task)
+
+    assets = in_memory_db.get_many(models.Task.type_, ["2", "missing", "0"])
+
+    assert assets == {"2": tasks[2], "0": tasks[0]}
+
+
+def test_list_with_indexed_filters():
+    in_memory_db = db.InMemoryDb()
+    tasks = [models.Task(**{**datastore.TRAINTASK, "key": str(i), "compute_plan_key": f"cp-{i % 2}"}) for i in range(6)]
+    for task in tasks:
+        in_memory_db.add(task)
+
+    assets = in_memory_db.list(models.Task.type_, {"compute_plan_key": ["cp-1"]})
+    assert assets == [tasks[1], tasks[3], tasks[5]]
+
+    assets = in_memory_db.list(models.Task.type_, {"compute_plan_key": ["cp-1"], "key": ["5", "1", "2"]})
+    assert assets == [tasks[1], tasks[5]]
+
+    assets = in_memory_db.list(models.Task.type_, {"compute_plan_key": ["cp-1"], "key": ["2"]})
+    assert assets == []
+
+
+def test_update_reindexes_asset_modified_in_place():
+    in_memory_db = db.InMemoryDb()
+    task = models.Task(**{**datastore.TRAINTASK, "status": models.ComputeTaskStatus.waiting_for_executor_slot})
+    in_memory_db.add(task)
+
+    task.status = models.ComputeTaskStatus.done
+    in_memory_db.update(task)
+
+    assert in_memory_db.list(models.Task.type_, {"status": [str(models.ComputeTaskStatus.done)]}) == [task]
+    assert (
+        in_memory_db.list(models.Task.type_, {"status": [str(models.ComputeTaskStatus.waiting_for_executor_slot)]})
+        == []
+    )
+
+
+def test_sqlite_db_persists_assets(tmp_path):
+    sqlite_db = db.SqliteDb(str(tmp_path / "db.sqlite"))
+    tasks = [models.Task(**{**datastore.TRAINTASK, "key": str(i), "metadata": {"round_idx": str(i)}}) for i in range(3)]
+    for task in tasks:
+        sqlite_db.add(task)
+    with pytest.raises(exceptions.KeyAlreadyExistsError):
+        sqlite_db.add(tasks[0])
+
+    tasks[1].status = models.ComputeTaskStatus.failed
+    sqlite_db.update(tasks[1])
+    sqlite_db.close()
+
+    sqlite_db = db.SqliteDb(str(tmp_path / "db.sqlite"))
+    assert sqlite_db.get(models.Task.type_, "1") == tasks[1]
+    assert sqlite_db.get_many(models.Task.type_, ["2", "missing", "0"]) == {"2": tasks[2], "0": tasks[0]}
+    assert sqlite_db.list(models.Task.type_, {"status": [str(models.ComputeTaskStatus.failed)]}) == [tasks[1]]
+    assert sqlite_db.list(
+        models.Task.type_,
+        {
+            "key": ["0", "2"],
+            "metadata": [{"key": "round_idx", "type": models.MetadataFilterType.is_equal, "value": "2"}],
+        },
+    ) == [tasks[2]]
+    with pytest.raises(exceptions.NotFound):
+        sqlite_db.get(models.Task.type_, "missing")
+
+
+def test_sqlite_db_keeps_the_task_of_the_task_assets(tmp_path):
+    sqlite_db = db.SqliteDb(str(tmp_path / "db.sqlite"))
+    output = models_local.OutputAssetLocal(
+        compute_task_key="task", identifier="performance", kind=schemas.AssetKind.performance, asset=0.5
+    )
+    sqlite_db.add(output)
+
+    outputs = sqlite_db.list(models.OutputAsset.type_, {"compute_task_key": ["task"]})
+    assert [(output.compute_task_key, output.identifier, output.asset) for output in outputs] == [
+        ("task", "performance", 0.5)
+    ]
+
+
+@pytest.mark.parametrize(
+    "metadata_filter,expected_keys",
+    [
+        ({"key": "round_idx", "type": models.MetadataFilterType.exists}, ["0", "1", "2", "3"]),
+        ({"key": "round_idx", "type": models.MetadataFilterType.is_equal, "value": "1"}, ["1"]),
+        ({"key": "round_idx", "type": models.MetadataFilterType.contains, "value": "1"}, ["1", "3"]),
+        ({"key": "missing", "type": models.MetadataFilterType.exists}, []),
+    ],
+)
+def test_list_with_metadata_filters(metadata_filter, expected_keys):
+    in_memory_db = db.InMemoryDb()
+    for i, round_idx in enumerate(["0", "1", "2", "11"]):
+        in_memory_db.add(models.Task(**{**datastore.TRAINTASK, "key": str(i), "metadata": {"round_idx": round_idx}}))
+    in_memory_db.add(models.Task(**{**datastore.TRAINTASK, "key": "4", "metadata": {}}))
+
+    assets = in_memory_db.list(models.Task.type_, {"metadata": [metadata_filter]})
+
+    assert [asset.key for asset in assets] == expected_keys
+
+
+def test_update_reindexes_metadata():
+    in_memory_db = db.InMemoryDb()
+    task = models.Task(**{**datastore.TRAINTASK, "metadata": {"round_idx": "0"}})
+    in_memory_db.add(task)
+
+    task.metadata = {"round_idx": "1"}
+    in_memory_db.update(task)
+
+    filters = {"metadata": [{"key": "round_idx", "type": models.MetadataFilterType.is_equal, "value": "0"}]}
+    assert in_memory_db.list(models.Task.type_, filters) == []
+    filters["metadata"][0]["value"] = "1"
+    assert in_memory_db.list(models.Task.type_, filters) == [task]
+
+
+def _reference_list(tasks, order_by, ascending, offset, limit, cursor, compute_plan_key):
+    assets = [task for task in tasks if compute_plan_key is None or task.compute_plan_key == compute_plan_key]
+    if order_by:
+        assets.sort(key=lambda task: getattr(task, order_by), reverse=not ascending)
+    if cursor is not None:
+        keys = [task.key for task in assets]
+        assets = assets[keys.index(cursor) + 1 :]
+    return assets[offset : None if limit is None else offset + limit]
+
+
+@pytest.mark.parametrize(
+    "make_db", [lambda tmp_path: db.InMemoryDb(), lambda tmp_path: db.SqliteDb(str(tmp_path / "db"))]
+)
+@pytest.mark.parametrize("order_by", [None, "creation_date", "rank"])
+@pytest.mark.parametrize("ascending", [True, False])
+@pytest.mark.parametrize("compute_plan_key", [None, "cp-1"])
+def test_list_pages(make_db, order_by, ascending, compute_plan_key, tmp_path):
+    local_db = make_db(tmp_path)
+    tasks = [
+        models.Task(
+            **{
+                **datastore.TRAINTASK,
+                "key": str(i),
+                "rank": i % 3,
+                "compute_plan_key": f"cp-{i % 2}",
+                "creation_date": datetime.datetime(2023, 1, 1 + (i * 7) % 5),
+            }
+        )
+        for i in range(10)
+    ]
+    for task in tasks:
+        local_db.add(task)
+
+    filters = {"compute_plan_key": [compute_plan_key]} if compute_plan_key else {}
+    cursor_key = "4" if compute_plan_key is None else "5"
+    for offset, limit, cursor in [
+        (0, None, None),
+        (0, 3, None),
+        (2, 3, None),
+        (0, 4, cursor_key),
+        (1, None, cursor_key),
+    ]:
+        assets = local_db.list(
+            models.Task.type_,
+            filters,
+            order_by=order_by,
+            ascending=ascending,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+        )
+        expected = _reference_list(tasks, order_by, ascending, offset, limit, cursor, compute_plan_key)
+        assert [asset.key for asset in assets] == [task.key for task in expected]
+
+
+def test_update_moves_asset_in_sorted_index():
+    in_memory_db = db.InMemoryDb()
+    tasks = [models.Task(**{**datastore.TRAINTASK, "key": str(i), "rank": i}) for i in range(3)]
+    for task in tasks:
+        in_memory_db.add(task)
+
+    tasks[0].rank = 5
+    in_memory_db.update(tasks[0])
+
+    assets = in_memory_db.list(models.Task.type_, {}, order_by="rank", limit=2)
+    assert [asset.key for asset in assets] == ["0", "2"]
+
+
+def test_list_ordered_by_a_field_without_sorted_index():
+    in_memory_db = db.InMemoryDb()
+    tasks = [models.Task(**{**datastore.TRAINTASK, "key": str(i), "worker": f"worker-{2 - i}"}) for i in range(3)]
+    for task in tasks:
+        in_memory_db.add(task)
+
+    assets = in_memory_db.list(models.Task.type_, {}, order_by="worker", ascending=True)
+    assert [asset.key for asset in assets] == ["2", "1", "0"]
+    assert in_memory_db.list(models.Function.type_, {}, order_by="name") == []
+    # listing does not create sorted indexes
+    assert set(in_memory_db._sorted_indexes[models.Task.type_]) == set(db.SORTED_FIELDS)
+    assert models.Function.type_ not in in_memory_db._sorted_indexes
+
+
+@pytest.mark.parametrize(
+    "make_db", [lambda tmp_path: db.InMemoryDb(), lambda tmp_path: db.SqliteDb(str(tmp_path / "db"))]
+)
+def test_concurrent_access(make_db, tmp_path):
+    local_db = make_db(tmp_path)
+    local_db.add(models.ComputePlan(**{**datastore.COMPUTE_PLAN, "task_count": 0}))
+    n_threads, n_tasks = 8, 10
+
+    def increment_task_count(compute_plan):
+        compute_plan.task_count += 1
+
+    def run(thread_index):
+        for i in range(n_tasks):
+            task = models.Task(**{**datastore.TRAINTASK, "key": f"{thread_index}-{i}", "rank": i})
+            local_db.add(task)
+            local_db.modify(models.ComputePlan.type_, datastore.COMPUTE_PLAN["key"], increment_task_count)
+            task.status = models.ComputeTaskStatus.failed
+            local_db.update(task)
+            local_db.list(
+                models.Task.type_, {"status": [str(models.ComputeTaskStatus.failed)]}, order_by="rank", limit=10
+            )
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=n_threads) as executor:
+        list(executor.map(run, range(n_threads)))
+
+    compute_plan = local_db.get(models.ComputePlan.type_, datastore.COMPUTE_PLAN["key"])
+    assert compute_plan.task_count == n_threads * n_tasks
+    failed_tasks = local_db.list(models.Task.type_, {"status": [str(models.ComputeTaskStatus.failed)]})
+    assert len(failed_tasks) == n_threads * n_tasks
+    assert len(local_db.list(models.Task.type_, {}, order_by="rank")) == n_threads * n_tasks
+
+
+def test_assets_returned_are_copies():
+    in_memory_db = db.InMemoryDb()
+    task = models.Task(**datastore.TRAINTASK)
+    in_memory_db.add(task)
+
+    task.status = models.ComputeTaskStatus.failed
+    in_memory_db.get(models.Task.type_, task.key).rank = 42
+
+    assert in_memory_db.get(models.Task.type_, task.key) == models.Task(**datastore.TRAINTASK)
+
+
+def test_local_organizations_created_concurrently(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        clients = list(
+            executor.map(lambda _: substra.Client(backend_type=substra.BackendType.LOCAL_SUBPROCESS), range(8))
+        )
+
+    assert len({client.organization_info().organization_id for client in clients}) == 8
+
+
+def test_local_iter_list_pages_with_the_cursor(tmp_path, monkeypatch, mocker):
+    monkeypatch.chdir(tmp_path)
+    client = substra.Client(
+        backend_type=substra.BackendType.LOCAL_SUBPROCESS, local_db_path=str(tmp_path / "db.sqlite")
+    )
+    backend = client._backend
+    for i in range(5):
+        creation_date = datetime.datetime(2023, 1, 1 + i)
+        backend._db._db.add(models.Task(**{**datastore.TRAINTASK, "key": str(i), "creation_date": creation_date}))
+    monkeypatch.setattr(local_backend, "_LIST_PAGE_SIZE", 2)
+    list_spy = mocker.spy(backend, "list")
+
+    tasks = client.iter_task(ascending=True)
+
+    assert [task.key for task in tasks] == ["0", "1", "2", "3", "4"]
+    assert [call.kwargs["cursor"] for call in list_spy.call_args_list] == [None, "1", "3"]
+    assert all(call.kwargs["limit"] == 2 for call in list_spy.call_args_list)
@@ -367,6 +367,54 @@ class TestsDebug:
 
         assert json_perf_path.is_file()
 
+    def test_stream_performances(self, asset_factory, clients):
+        client = clients[0]
+
+        dataset_key = client.add_dataset(asset_factory.create_dataset())
+        sample_key = client.add_data_sample(asset_factory.create_data_sample(datasets=[dataset_key]))
+        metric_key = client.add_function(asset_factory.create_function(category=FunctionCategory.metric))
+        predict_function_key = client.add_function(asset_factory.create_function(category=FunctionCategory.predict))
+        function_key = client.add_function(asset_factory.create_function(FunctionCategory.simple))
+
+        cp = asset_factory.create_compute_plan()
+        organization_id = client.organization_info().organization_id
+        traintask = substra.sdk.schemas.ComputePlanTaskSpec(
+            function_key=function_key,
+            task_id=str(uuid.uuid4()),
+            inputs=FLTaskInputGenerator.task(opener_key=dataset_key, data_sample_keys=[sample_key]),
+            outputs=FLTaskOutputGenerator.traintask(),
+            worker=organization_id,
+        )
+        predicttask = substra.sdk.schemas.ComputePlanTaskSpec(
+            function_key=predict_function_key,
+            task_id=str(uuid.uuid4()),
+            inputs=FLTaskInputGenerator.task(opener_key=dataset_key, data_sample_keys=[sample_key])
+            + FLTaskInputGenerator.train_to_predict(traintask.task_id),
+            outputs=FLTaskOutputGenerator.predicttask(),
+            worker=organization_id,
+        )
+        testtask = substra.sdk.schemas.ComputePlanTaskSpec(
+            function_key=metric_key,
+            task_id=str(uuid.uuid4()),
+            inputs=FLTaskInputGenerator.task(opener_key=dataset_key, data_sample_keys=[sample_key])
+            + FLTaskInputGenerator.predict_to_test(predicttask.task_id),
+            outputs=FLTaskOutputGenerator.testtask(),
+            worker=organization_id,
+        )
+        cp.tasks = [traintask, predicttask, testtask]
+        client.add_compute_plan(cp)
+
+        rows = list(client.stream_performances(cp.key))
+        perf = client.get_performances(cp.key)
+
+        assert [row.task_key for row in rows] == perf.task_key == [testtask.task_id]
+        assert [row.performance for row in rows] == perf.performance
+        # the cursor only holds the last done tasks
+        rows, cursor = client.get_new_performances(cp.key)
+        assert len(rows) == 1
+        assert cursor["task_keys"] == [testtask.task_id]
+        assert client.get_new_performances(cp.key, cursor) == ([], cursor)
+
 
 class TestsList:
     "Test client.list... functions"
@@ -1,12 +1,21 @@
+import concurrent.futures
+import threading
+import time
+import uuid
+
 import pydantic
 import pytest
 
 import substra
+from substra.sdk import fs
 from substra.sdk import models
 from substra.sdk.exceptions import ComputePlanKeyFormatError
 
 from .. import datastore
+from ..utils import make_paginated_response
 from ..utils import mock_requests
+from ..utils import mock_requests_responses
+from ..utils import mock_response
 
 
 def test_add_dataset(client, dataset_query, mocker):
@@ -97,3 +106,224 @@ def test_add_compute_plan_wrong_key_format(client):
     with pytest.raises(ComputePlanKeyFormatError):
         data = {"key": "wrong_format", "name": "A perfectly valid name"}
         client.add_compute_plan(data)
+
+
+def _compute_plan_data(n_tasks):
+    # a chain of tasks, each one using the model of the previous one
+    tasks = []
+    for i in range(n_tasks):
+        inputs = []
+        if tasks:
+            inputs = [
+                {
+                    "identifier": "model",
+                    "parent_task_key": tasks[-1]["task_id"],
+                    "parent_task_output_identifier": "model",
+                }
+            ]
+        tasks.append(
+            {"task_id": str(uuid.uuid4()), "function_key": "function-key", "worker": "worker", "inputs": inputs}
+        )
+    return {"key": str(uuid.uuid4()), "name": "compute plan", "tasks": tasks}
+
+
+def test_add_compute_plan_by_batches(client, mocker):
+    data = _compute_plan_data(5)
+    m_post = mocker.patch(
+        "substra.sdk.backends.remote.rest_client.requests.Session.post",
+        side_effect=lambda url, **kwargs: mock_response({**datastore.COMPUTE_PLAN, "key": data["key"]}),
+    )
+
+    client.add_compute_plan(data, batch_size=2, max_in_flight_batches=3)
+
+    urls = [call.args[0] for call in m_post.call_args_list]
+    assert urls[0] == "http://foo.io/compute_plan/"
+    assert urls[1:] == ["http://foo.io/task/bulk_create/"] * 3
+    sent_keys = [task["key"] for call in m_post.call_args_list[1:] for task in call.kwargs["json"]["tasks"]]
+    assert sent_keys == [task["task_id"] for task in data["tasks"]]
+
+
+def test_add_compute_plan_uploads_one_batch_at_a_time_by_default(client, mocker):
+    data = _compute_plan_data(6)
+    for task in data["tasks"]:
+        task["inputs"] = []
+    in_flight = []
+    max_in_flight = []
+    lock = threading.Lock()
+
+    def post(url, **kwargs):
+        with lock:
+            in_flight.append(None)
+            max_in_flight.append(len(in_flight))
+        time.sleep(0.01)
+        with lock:
+            in_flight.pop()
+        return mock_response({**datastore.COMPUTE_PLAN, "key": data["key"]})
+
+    m_post = mocker.patch("substra.sdk.backends.remote.rest_client.requests.Session.post", side_effect=post)
+
+    client.add_compute_plan(data, batch_size=2)
+
+    assert m_post.call_count == 4
+    assert max(max_in_flight) == 1
+
+
+def test_add_compute_plan_with_adaptive_batches(client, mocker):
+    data = _compute_plan_data(5)
+    m_post = mocker.patch(
+        "substra.sdk.backends.remote.rest_client.requests.Session.post",
+        side_effect=lambda url, **kwargs: mock_response({**datastore.COMPUTE_PLAN, "key": data["key"]}),
+    )
+
+    client.add_compute_plan(data, batch_size="auto")
+
+    sent_keys = [task["key"] for call in m_post.call_args_list[1:] for task in call.kwargs["json"]["tasks"]]
+    assert sent_keys == [task["task_id"] for task in data["tasks"]]
+    batches = client.metrics().to_dict()["batches"]
+    assert batches["tasks"]["count"] == m_post.call_count - 1
+    assert batches["tasks"]["sum"] == 5
+
+
+def test_resume_compute_plan_submission(client, mocker):
+    data = _compute_plan_data(5)
+    existing_tasks = [{"key": task["task_id"]} for task in data["tasks"][:3]]
+
+    def get(url, **kwargs):
+        if url.startswith("http://foo.io/task/"):
+            return mock_response(make_paginated_response(existing_tasks))
+        return mock_response({**datastore.COMPUTE_PLAN, "key": data["key"]})
+
+    mocker.patch("substra.sdk.backends.remote.rest_client.requests.Session.get", side_effect=get)
+    m_post = mock_requests(mocker, "post", response={})
+
+    client.resume_compute_plan_submission(data, batch_size=2)
+
+    urls = [call.args[0] for call in m_post.call_args_list]
+    assert urls == ["http://foo.io/task/bulk_create/"]
+    sent_keys = [task["key"] for task in m_post.call_args.kwargs["json"]["tasks"]]
+    assert sent_keys == [task["task_id"] for task in data["tasks"][3:]]
+
+
+def test_add_compute_plan_resubmits_missing_tasks_of_existing_batch(client, mocker):
+    data = _compute_plan_data(4)
+    task_keys = [task["task_id"] for task in data["tasks"]]
+    m_post = mocker.patch(
+        "substra.sdk.backends.remote.rest_client.requests.Session.post",
+        side_effect=[
+            mock_response({**datastore.COMPUTE_PLAN, "key": data["key"]}),
+            mock_response({"key": task_keys}, status=409),
+            mock_response({}),
+        ],
+    )
+    # the first task of the batch was registered before the error
+    mock_requests(mocker, "get", response=make_paginated_response([{**datastore.TRAINTASK, "key": task_keys[0]}]))
+
+    client.add_compute_plan(data, batch_size=4)
+
+    sent_keys = [task["key"] for task in m_post.call_args.kwargs["json"]["tasks"]]
+    assert sent_keys == task_keys[1:]
+
+
+ORGANIZATION_INFO = {
+    "host": "http://foo.io",
+    "organization_id": "MyOrg1MSP",
+    "organization_name": "MyOrg1",
+    "config": {"model_export_enabled": True},
+    "channel": "mychannel",
+    "version": "1.0.0",
+    "orchestrator_version": "1.0.0",
+}
+
+
+def _function_with_files(function_query):
+    """The function created on the server from `function_query`."""
+    function = {**datastore.FUNCTION, "name": function_query.name}
+    function["inputs"] = {
+        input.identifier: {"kind": input.kind.value, "optional": input.optional, "multiple": input.multiple}
+        for input in function_query.inputs
+    }
+    function["outputs"] = {
+        output.identifier: {"kind": output.kind.value, "multiple": output.multiple} for output in function_query.outputs
+    }
+    for spec_field, field in (("file", "archive"), ("description", "description")):
+        function[field] = {**function[field], "checksum": fs.hash_file(getattr(function_query, spec_field))}
+    return function
+
+
+def test_add_function_dedup_returns_existing_key(client, function_query, mocker):
+    function = _function_with_files(function_query)
+    m_get = mock_requests_responses(
+        mocker,
+        "get",
+        [mock_response(ORGANIZATION_INFO), mock_response(make_paginated_response([function]))],
+    )
+    m_post = mock_requests(mocker, "post", response=datastore.FUNCTION)
+
+    assert client.add_function(function_query, dedup=True) == function["key"]
+    assert client.add_function(function_query, dedup=True) == function["key"]
+
+    m_post.assert_not_called()
+    # the functions of the organization are only listed once
+    assert m_get.call_count == 2
+    assert m_get.call_args.kwargs["params"]["owner"] == "MyOrg1MSP"
+
+
+def test_add_function_dedup_from_many_threads(client, function_query, mocker):
+    mock_requests_responses(
+        mocker,
+        "get",
+        [mock_response(ORGANIZATION_INFO), mock_response(make_paginated_response([]))],
+    )
+
+    def post(url, **kwargs):
+        time.sleep(0.01)
+        return mock_response(datastore.FUNCTION)
+
+    m_post = mocker.patch("substra.sdk.backends.remote.rest_client.requests.Session.post", side_effect=post)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+        keys = list(executor.map(lambda _: client.add_function(function_query, dedup=True), range(4)))
+
+    assert keys == [datastore.FUNCTION["key"]] * 4
+    # the index is only built once, and the function only created once
+    m_post.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        {"outputs": [{"identifier": "other_model", "kind": "ASSET_MODEL", "multiple": False}]},
+        {"permissions": {"public": False, "authorized_ids": ["MyOrg2MSP"]}},
+        {"name": "other_name"},
+        {"metadata": {"round": "1"}},
+    ],
+)
+def test_add_function_dedup_compares_the_specification(client, function_query, mocker, change):
+    function = _function_with_files(function_query)
+    mock_requests_responses(
+        mocker,
+        "get",
+        [mock_response(ORGANIZATION_INFO), mock_response(make_paginated_response([function]))],
+    )
+    m_post = mock_requests(mocker, "post", response=datastore.FUNCTION)
+    other_query = type(function_query)(**{**function_query.model_dump(), **change})
+
+    assert client.add_function(function_query, dedup=True) == function["key"]
+    client.add_function(other_query, dedup=True)
+
+    # the same archive with another specification is a new function
+    m_post.assert_called_once()
+
+
+def test_add_function_dedup_uploads_new_files(client, function_query, mocker):
+    mock_requests_responses(
+        mocker,
+        "get",
+        [mock_response(ORGANIZATION_INFO), mock_response(make_paginated_response([datastore.FUNCTION]))],
+    )
+    m_post = mock_requests(mocker, "post", response=datastore.FUNCTION)
+
+    assert client.add_function(function_query, dedup=True) == datastore.FUNCTION["key"]
+    assert client.add_function(function_query, dedup=True) == datastore.FUNCTION["key"]
+
+    m_post.assert_called_once()
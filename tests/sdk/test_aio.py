@@ -0,0 +1,215 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from substra.sdk import Client
+from substra.sdk import exceptions
+from substra.sdk import models
+from substra.sdk.aio import AsyncClient
+from substra.sdk.models import ComputePlanStatus
+from substra.sdk.models import ComputeTaskStatus
+
+from .. import datastore
+from ..utils import make_paginated_response
+from ..utils import mock_requests
+from ..utils import mock_requests_responses
+from ..utils import mock_response
+
+
+@pytest.fixture
+def async_client():
+    return AsyncClient(url="http://foo.io", backend_type="remote", token="foo")
+
+
+def test_async_get(async_client, mocker):
+    m = mock_requests(mocker, "get", response=datastore.TRAINTASK)
+
+    task = asyncio.run(async_client.get_task("magic-key"))
+
+    assert task == models.Task(**datastore.TRAINTASK)
+    m.assert_called_once()
+
+
+def test_async_get_many_concurrently(async_client, mocker):
+    items = [{**datastore.TRAINTASK, "key": str(i)} for i in range(20)]
+    m = mock_requests_responses(mocker, "get", [mock_response(item) for item in items])
+
+    async def get_all():
+        return await asyncio.gather(*[async_client.get_task(item["key"]) for item in items])
+
+    tasks = asyncio.run(get_all())
+
+    assert sorted(task.key for task in tasks) == sorted(item["key"] for item in items)
+    assert m.call_count == len(items)
+
+
+def test_async_iter(async_client, mocker):
+    items = datastore.TASK_LIST
+    mock_requests(mocker, "get", response=make_paginated_response(items))
+
+    async def collect():
+        return [task async for task in async_client.iter_task()]
+
+    assert asyncio.run(collect()) == [models.Task(**item) for item in items]
+
+
+def test_async_wait_compute_plan(async_client, mocker):
+    responses = [
+        mock_response({**datastore.COMPUTE_PLAN, "status": ComputePlanStatus.doing}),
+        mock_response({**datastore.COMPUTE_PLAN, "status": ComputePlanStatus.done}),
+    ]
+    m = mock_requests_responses(mocker, "get", responses)
+
+    compute_plan = asyncio.run(async_client.wait_compute_plan(datastore.COMPUTE_PLAN["key"], polling_period=0))
+
+    assert compute_plan.status == ComputePlanStatus.done
+    assert m.call_count == 2
+
+
+def test_async_wait_task_canceled(async_client, mocker):
+    mock_requests(mocker, "get", response={**datastore.TRAINTASK, "status": ComputeTaskStatus.canceled})
+
+    with pytest.raises(exceptions.FutureFailureError):
+        asyncio.run(async_client.wait_task(datastore.TRAINTASK["key"]))
+
+
+def test_async_wait_timeout(async_client, mocker):
+    mock_requests(mocker, "get", response={**datastore.TRAINTASK, "status": ComputeTaskStatus.executing})
+
+    with pytest.raises(exceptions.FutureTimeoutError):
+        asyncio.run(async_client.wait_task(datastore.TRAINTASK["key"], timeout=1e-10))
+
+
+def test_async_wait_tasks(async_client, mocker):
+    tasks = [{**datastore.TRAINTASK, "key": str(i), "status": ComputeTaskStatus.executing} for i in range(2)]
+    responses = [
+        mock_response(make_paginated_response([tasks[0], {**tasks[1], "status": ComputeTaskStatus.done}])),
+        mock_response(make_paginated_response([{**tasks[0], "status": ComputeTaskStatus.done}])),
+    ]
+    m = mock_requests_responses(mocker, "get", responses)
+
+    finished = asyncio.run(async_client.wait_tasks([task["key"] for task in tasks], polling_period=0))
+
+    assert [task.key for task in finished] == ["0", "1"]
+    assert m.call_count == 2
+
+
+def test_async_client_is_built_in_a_worker_thread(mocker):
+    build_threads = []
+    client_class = mocker.patch(
+        "substra.sdk.aio.Client",
+        side_effect=lambda **kwargs: build_threads.append(threading.current_thread()) or mocker.MagicMock(),
+    )
+
+    async_client = AsyncClient(url="http://foo.io", backend_type="remote", token="foo")
+    client_class.assert_not_called()
+    assert async_client.client is None
+
+    async def get_tasks():
+        await asyncio.gather(async_client.get_task("a"), async_client.get_task("b"))
+
+    asyncio.run(get_tasks())
+
+    client_class.assert_called_once_with(url="http://foo.io", backend_type="remote", token="foo")
+    assert build_threads[0] is not threading.main_thread()
+
+
+def test_async_calls_are_bounded_by_max_workers(mocker):
+    in_flight = []
+    max_in_flight = []
+    lock = threading.Lock()
+
+    def get(*args, **kwargs):
+        with lock:
+            in_flight.append(None)
+            max_in_flight.append(len(in_flight))
+        time.sleep(0.01)
+        with lock:
+            in_flight.pop()
+        return mock_response(datastore.TRAINTASK)
+
+    mocker.patch("substra.sdk.backends.remote.rest_client.requests.Session.get", side_effect=get)
+    async_client = AsyncClient(max_workers=2, url="http://foo.io", backend_type="remote", token="foo")
+
+    async def get_all():
+        await asyncio.gather(*[async_client.get_task(str(i)) for i in range(8)])
+
+    asyncio.run(get_all())
+
+    assert max(max_in_flight) <= 2
+
+
+def test_async_close_closes_the_session(async_client, mocker):
+    mock_requests(mocker, "get", response=datastore.TRAINTASK)
+    asyncio.run(async_client.get_task("magic-key"))
+    session_close = mocker.patch.object(async_client.client._backend._client._session, "close")
+
+    asyncio.run(async_client.close())
+
+    session_close.assert_called_once()
+
+
+def test_async_iter_closes_abandoned_iterators(async_client, mocker):
+    closed = threading.Event()
+    iterators = []
+
+    def tasks():
+        try:
+            yield from [models.Task(**item) for item in datastore.TASK_LIST]
+        finally:
+            closed.set()
+
+    def iter_task(*args, **kwargs):
+        # the iterator is still referenced, it is only closed explicitly
+        iterators.append(tasks())
+        return iterators[-1]
+
+    mocker.patch.object(Client, "iter_task", side_effect=iter_task)
+
+    async def first_task():
+        async for task in async_client.iter_task():
+            return task
+
+    assert asyncio.run(first_task()) == models.Task(**datastore.TASK_LIST[0])
+    assert closed.wait(timeout=5)
+
+
+def test_async_stream_performances(async_client, mocker):
+    tasks_by_poll = [
+        [{**datastore.TESTTASK, "key": "task-1", "end_date": "2021-10-12T09:30:00Z", "metadata": {"round_idx": "1"}}],
+        [{**datastore.TESTTASK, "key": "task-2", "end_date": "2021-10-12T09:35:00Z", "metadata": {"round_idx": "2"}}],
+    ]
+    statuses = iter([ComputePlanStatus.doing, ComputePlanStatus.done])
+    current = {"poll": -1}
+
+    def get(url, params=None, **kwargs):
+        tasks = [task for poll in tasks_by_poll[: current["poll"] + 1] for task in poll]
+        if url.endswith("/perf/"):
+            perfs = [
+                {
+                    "compute_task": {**task, "round_idx": task["metadata"]["round_idx"]},
+                    "identifier": "performance",
+                    "perf": 0.5,
+                }
+                for task in tasks
+                if task["key"] in params["compute_task_key"].split(",")
+            ]
+            return mock_response(make_paginated_response(perfs))
+        if "/compute_plan/" in url:
+            current["poll"] += 1
+            return mock_response({**datastore.COMPUTE_PLAN, "status": next(statuses)})
+        return mock_response(make_paginated_response(sorted(tasks, key=lambda task: task["end_date"], reverse=True)))
+
+    mocker.patch("substra.sdk.backends.remote.rest_client.requests.Session.get", side_effect=get)
+    sleep = mocker.patch("substra.sdk.client.time.sleep")
+
+    async def collect():
+        return [row async for row in async_client.stream_performances("magic-key", polling_period=0)]
+
+    rows = asyncio.run(collect())
+
+    assert [(row.task_key, row.round_idx, row.performance) for row in rows] == [("task-1", 1, 0.5), ("task-2", 2, 0.5)]
+    # the event loop is not blocked between the polls
+    sleep.assert_not_called()
@@ -0,0 +1,166 @@
+import hashlib
+import os
+
+import pytest
+
+from substra.sdk import Client
+from substra.sdk import exceptions
+from substra.sdk.backends.remote import artifact_cache
+
+from .. import datastore
+from ..utils import mock_requests_responses
+from ..utils import mock_response
+
+
+def _write(path, content):
+    path.write_bytes(content)
+    return str(path), hashlib.sha256(content).hexdigest()
+
+
+def test_put_and_get_hardlink(tmp_path):
+    cache = artifact_cache.ArtifactCache(str(tmp_path / "cache"))
+    source, checksum = _write(tmp_path / "source", b"foo")
+    cache.put(checksum, source)
+
+    destination = tmp_path / "destination"
+    assert cache.get(checksum, str(destination))
+    assert destination.read_bytes() == b"foo"
+    assert os.stat(destination).st_ino == os.stat(source).st_ino
+    assert not cache.get("0" * 64, str(tmp_path / "other"))
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = artifact_cache.ArtifactCache(str(tmp_path / "cache"), max_size=8)
+    checksums = []
+    for index, content in enumerate([b"aaaa", b"bbbb", b"cccc"]):
+        source, checksum = _write(tmp_path / f"source{index}", content)
+        cache.put(checksum, source)
+        os.remove(source)
+        checksums.append(checksum)
+        # the first file is used again before the third one is added
+        if index == 1:
+            cache.get(checksums[0], str(tmp_path / "used"))
+            os.remove(tmp_path / "used")
+
+    assert cache.size() == 8
+    assert cache.get(checksums[0], str(tmp_path / "a"))
+    assert not cache.get(checksums[1], str(tmp_path / "b"))
+    assert cache.get(checksums[2], str(tmp_path / "c"))
+
+
+def test_does_not_evict_files_linked_from_a_download(tmp_path):
+    cache = artifact_cache.ArtifactCache(str(tmp_path / "cache"), max_size=4)
+    linked, linked_checksum = _write(tmp_path / "linked", b"aaaa")
+    cache.put(linked_checksum, linked)
+    checksums = []
+    for index, content in enumerate([b"bbbb", b"cccc"]):
+        source, checksum = _write(tmp_path / f"source{index}", content)
+        cache.put(checksum, source)
+        os.remove(source)
+        checksums.append(checksum)
+
+    # the linked file frees no space, the least recently used file holding its own space is evicted instead
+    assert os.path.exists(cache._path(linked_checksum))
+    assert not os.path.exists(cache._path(checksums[0]))
+    assert os.path.exists(cache._path(checksums[1]))
+
+
+def test_get_does_not_touch_the_linked_files(tmp_path):
+    cache = artifact_cache.ArtifactCache(str(tmp_path / "cache"))
+    source, checksum = _write(tmp_path / "source", b"foo")
+    cache.put(checksum, source)
+    os.utime(source, (1, 1))
+
+    assert cache.get(checksum, str(tmp_path / "destination"))
+    assert os.stat(source).st_mtime == 1
+
+
+def test_order_of_use_is_kept_between_instances(tmp_path, mocker):
+    directory = str(tmp_path / "cache")
+    cache = artifact_cache.ArtifactCache(directory, max_size=8)
+    checksums = []
+    for index, content in enumerate([b"aaaa", b"bbbb"]):
+        source, checksum = _write(tmp_path / f"source{index}", content)
+        cache.put(checksum, source)
+        os.remove(source)
+        checksums.append(checksum)
+    cache.get(checksums[0], str(tmp_path / "used"))
+    os.remove(tmp_path / "used")
+
+    cache = artifact_cache.ArtifactCache(directory, max_size=8)
+    walk = mocker.spy(artifact_cache.os, "walk")
+    source, checksum = _write(tmp_path / "source", b"cccc")
+    cache.put(checksum, source)
+
+    # the eviction does not walk the cache directory
+    walk.assert_not_called()
+    assert cache.size() == 8
+    assert os.path.exists(cache._path(checksums[0]))
+    assert not os.path.exists(cache._path(checksums[1]))
+
+
+@pytest.mark.parametrize("checksum", ["../../outside", "0" * 63, "A" * 64, None])
+def test_fetch_bypasses_the_cache_for_invalid_checksums(tmp_path, checksum):
+    cache = artifact_cache.ArtifactCache(str(tmp_path / "cache"))
+    destination = tmp_path / "destination"
+
+    def download(path):
+        with open(path, "wb") as f:
+            f.write(b"foo")
+
+    assert cache.fetch(checksum, str(destination), download) == str(destination)
+    assert destination.read_bytes() == b"foo"
+    assert cache.size() == 0
+    assert not cache.get(checksum, str(tmp_path / "other"))
+
+
+def test_fetch_does_not_cache_failed_download(tmp_path):
+    cache = artifact_cache.ArtifactCache(str(tmp_path / "cache"))
+
+    def download(path):
+        raise exceptions.ChecksumMismatch("http://foo.io", "0" * 64, "1" * 64)
+
+    with pytest.raises(exceptions.ChecksumMismatch):
+        cache.fetch("0" * 64, str(tmp_path / "destination"), download)
+    assert cache.size() == 0
+
+
+def test_client_downloads_a_function_once(tmp_path, mocker):
+    content = b"function archive"
+    function = {**datastore.FUNCTION}
+    function["archive"] = {**function["archive"], "checksum": hashlib.sha256(content).hexdigest()}
+    client = Client(url="http://foo.io", backend_type="remote", token="foo", cache_dir=str(tmp_path / "cache"))
+    file_response = mock_response()
+    file_response.iter_content.return_value = [content]
+    m = mock_requests_responses(mocker, "get", [mock_response(function), file_response, mock_response(function)])
+
+    (tmp_path / "first").mkdir()
+    (tmp_path / "second").mkdir()
+    first = client.download_function("foo", tmp_path / "first")
+    second = client.download_function("foo", tmp_path / "second")
+
+    assert first.read_bytes() == second.read_bytes() == content
+    # the second download only fetches the metadata of the function
+    assert m.call_count == 3
+
+
+def test_client_without_checksum_verification_bypasses_the_cache(tmp_path, mocker):
+    content = b"function archive"
+    function = {**datastore.FUNCTION}
+    function["archive"] = {**function["archive"], "checksum": hashlib.sha256(b"other content").hexdigest()}
+    client = Client(
+        url="http://foo.io",
+        backend_type="remote",
+        token="foo",
+        cache_dir=str(tmp_path / "cache"),
+        verify_checksums=False,
+    )
+    file_response = mock_response()
+    file_response.iter_content.return_value = [content]
+    mock_requests_responses(mocker, "get", [mock_response(function), file_response])
+
+    path = client.download_function("foo", tmp_path)
+
+    assert path.read_bytes() == content
+    # the unverified file is not stored under the checksum of the asset
+    assert artifact_cache.ArtifactCache(str(tmp_path / "cache")).size() == 0
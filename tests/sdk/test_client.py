@@ -119,6 +119,17 @@ def test_client_with_password(mocker):
     rest_client_logout.assert_called_once()
 
 
+def test_client_closes_the_session(mocker):
+    with Client(backend_type="remote", url="example.com", token="token0") as client:
+        session_close = mocker.patch.object(client._backend._client._session, "close")
+    session_close.assert_called_once()
+
+    client = Client(backend_type="subprocess", url="example.com", token="token0")
+    session_close = mocker.patch.object(client._backend._db._remote._client._session, "close")
+    client.close()
+    session_close.assert_called_once()
+
+
 def test_client_token_supercedes_password(mocker):
     mocker.patch("substra.sdk.Client.login", side_effect=stub_login)
     client = Client(
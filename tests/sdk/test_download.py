@@ -1,10 +1,16 @@
+import gzip
+import hashlib
+import io
 import os
 from unittest.mock import patch
 
 import pytest
+import requests
+import urllib3
 
 import substra
 from substra.sdk import Client
+from substra.sdk.backends.remote import download
 
 from .. import datastore
 from ..utils import mock_requests
@@ -13,26 +19,30 @@ from ..utils import mock_response
 
 
 @pytest.mark.parametrize(
-    "asset_type",
+    "asset_type, file_field",
     [
-        ("dataset"),
-        ("function"),
-        ("model"),
+        ("dataset", "opener"),
+        ("function", "archive"),
+        ("model", "address"),
     ],
 )
-def test_download_asset(asset_type, tmp_path, client, mocker):
+def test_download_asset(asset_type, file_field, tmp_path, client, mocker):
+    content = b"foo"
     item = getattr(datastore, asset_type.upper())
+    item = {**item, file_field: {**item[file_field], "checksum": hashlib.sha256(content).hexdigest()}}
+    file_response = mock_response()
+    file_response.iter_content.return_value = [content]
     responses = [
         mock_response(item),  # metadata
-        mock_response("foo"),  # data
+        file_response,  # data
     ]
     m = mock_requests_responses(mocker, "get", responses)
 
     method = getattr(client, f"download_{asset_type}")
     temp_file = method("foo", tmp_path)
 
-    assert os.path.exists(temp_file)
-    m.assert_called()
+    assert temp_file.read_bytes() == content
+    assert m.call_count == 2
 
 
 @pytest.mark.parametrize("asset_type", ["dataset", "function", "model", "logs"])
@@ -50,16 +60,10 @@ def test_download_asset_not_found(asset_type, tmp_path, client, mocker):
 def test_download_content_not_found(asset_type, tmp_path, client, mocker):
     item = getattr(datastore, asset_type.upper())
 
-    expected_call_count = 2
     responses = [
         mock_response(item),  # metadata
         mock_response("foo", status=404),  # description
     ]
-
-    if asset_type == "model":
-        responses = [responses[1]]  # No metadata for model download
-        expected_call_count = 1
-
     m = mock_requests_responses(mocker, "get", responses)
 
     method = getattr(client, f"download_{asset_type}")
@@ -67,7 +71,7 @@ def test_download_content_not_found(asset_type, tmp_path, client, mocker):
     with pytest.raises(substra.sdk.exceptions.NotFound):
         method("key", tmp_path)
 
-    assert m.call_count == expected_call_count
+    assert m.call_count == 2
 
 
 @pytest.mark.parametrize(
@@ -109,3 +113,218 @@ def test_download_logs(tmp_path, client, mocker):
     response.iter_content.assert_called_once()
 
     assert (tmp_path / f"task_logs_{task_key}.txt").read_bytes() == logs
+
+
+def _serve_file(content, accept_ranges=True):
+    """Answer the GET requests like a server hosting `content`."""
+
+    def get(url, headers=None, **kwargs):
+        range_header = (headers or {}).get("Range")
+        response_headers = {"Accept-Ranges": "bytes"} if accept_ranges else {}
+        if range_header and accept_ranges:
+            start, end = range_header[len("bytes=") :].split("-")
+            body = content[int(start) : int(end) + 1 if end else None]
+            response = mock_response(status=206, headers={**response_headers, "Content-Length": str(len(body))})
+        else:
+            body = content
+            response = mock_response(headers={**response_headers, "Content-Length": str(len(body))})
+        response.iter_content.return_value = [body]
+        return response
+
+    return get
+
+
+def test_download_resumes_from_part_file(tmp_path, client, mocker):
+    content = b"Lorem ipsum dolor sit amet"
+    destination = tmp_path / "model"
+    (tmp_path / "model.part").write_bytes(content[:5])
+    m = mocker.patch("substra.sdk.backends.remote.rest_client.requests.Session.get", side_effect=_serve_file(content))
+
+    download.download(client._backend._client, "http://foo.io/model/key/file/", str(destination))
+
+    assert destination.read_bytes() == content
+    assert not (tmp_path / "model.part").exists()
+    assert m.call_args.kwargs["headers"]["Range"] == "bytes=5-"
+
+
+def test_download_restarts_when_server_ignores_ranges(tmp_path, client, mocker):
+    content = b"Lorem ipsum dolor sit amet"
+    destination = tmp_path / "model"
+    (tmp_path / "model.part").write_bytes(b"stale")
+    mocker.patch(
+        "substra.sdk.backends.remote.rest_client.requests.Session.get",
+        side_effect=_serve_file(content, accept_ranges=False),
+    )
+
+    download.download(client._backend._client, "http://foo.io/model/key/file/", str(destination))
+
+    assert destination.read_bytes() == content
+
+
+def test_download_resumes_after_dropped_connection(tmp_path, client, mocker):
+    content = b"Lorem ipsum dolor sit amet"
+    destination = tmp_path / "model"
+    serve = _serve_file(content)
+
+    def dropped(*args, **kwargs):
+        yield content[:10]
+        raise requests.exceptions.ChunkedEncodingError("connection dropped")
+
+    first_response = serve("http://foo.io/model/key/file/")
+    first_response.iter_content.side_effect = dropped
+    responses = iter([first_response])
+    mocker.patch(
+        "substra.sdk.backends.remote.rest_client.requests.Session.get",
+        side_effect=lambda url, **kwargs: next(responses, None) or serve(url, **kwargs),
+    )
+
+    download.download(client._backend._client, "http://foo.io/model/key/file/", str(destination))
+
+    assert destination.read_bytes() == content
+
+
+def test_download_by_parallel_segments(tmp_path, client, mocker):
+    content = bytes(range(256)) * 4
+    destination = tmp_path / "model"
+    m = mocker.patch("substra.sdk.backends.remote.rest_client.requests.Session.get", side_effect=_serve_file(content))
+
+    download.download(
+        client._backend._client, "http://foo.io/model/key/file/", str(destination), segment_size=100, max_workers=3
+    )
+
+    assert destination.read_bytes() == content
+    assert sorted(os.listdir(tmp_path)) == ["model"]
+    # one request to get the size of the file, then one per segment
+    assert m.call_count == 1 + 11
+
+
+def test_download_verifies_checksum_of_resumed_file(tmp_path, client, mocker):
+    content = b"Lorem ipsum dolor sit amet"
+    destination = tmp_path / "model"
+    (tmp_path / "model.part").write_bytes(content[:5])
+    mocker.patch("substra.sdk.backends.remote.rest_client.requests.Session.get", side_effect=_serve_file(content))
+
+    download.download(
+        client._backend._client,
+        "http://foo.io/model/key/file/",
+        str(destination),
+        checksum=hashlib.sha256(content).hexdigest(),
+    )
+
+    assert destination.read_bytes() == content
+
+
+def test_download_verifies_checksum_of_segments(tmp_path, client, mocker):
+    content = bytes(range(256)) * 4
+    destination = tmp_path / "model"
+    mocker.patch("substra.sdk.backends.remote.rest_client.requests.Session.get", side_effect=_serve_file(content))
+
+    download.download(
+        client._backend._client,
+        "http://foo.io/model/key/file/",
+        str(destination),
+        segment_size=100,
+        max_workers=3,
+        checksum=hashlib.sha256(content).hexdigest(),
+    )
+
+    assert destination.read_bytes() == content
+
+
+def test_download_retries_on_checksum_mismatch(tmp_path, client, mocker):
+    content = b"Lorem ipsum dolor sit amet"
+    destination = tmp_path / "model"
+    serve = _serve_file(content)
+    corrupted = _serve_file(b"corrupted")("http://foo.io/model/key/file/")
+    responses = iter([corrupted])
+    m = mocker.patch(
+        "substra.sdk.backends.remote.rest_client.requests.Session.get",
+        side_effect=lambda url, **kwargs: next(responses, None) or serve(url, **kwargs),
+    )
+
+    download.download(
+        client._backend._client,
+        "http://foo.io/model/key/file/",
+        str(destination),
+        checksum=hashlib.sha256(content).hexdigest(),
+    )
+
+    assert destination.read_bytes() == content
+    # the second download starts from scratch
+    assert m.call_count == 2
+    assert "Range" not in (m.call_args.kwargs.get("headers") or {})
+
+
+def test_download_raises_on_checksum_mismatch(tmp_path, client, mocker):
+    destination = tmp_path / "model"
+    mocker.patch("substra.sdk.backends.remote.rest_client.requests.Session.get", side_effect=_serve_file(b"corrupted"))
+
+    with pytest.raises(substra.sdk.exceptions.ChecksumMismatch):
+        download.download(client._backend._client, "http://foo.io/model/key/file/", str(destination), checksum="0" * 64)
+
+    assert os.listdir(tmp_path) == []
+
+
+def _gzip_response(content):
+    """A response compressed with `Content-Encoding: gzip`, decoded by requests while it is read."""
+    body = gzip.compress(content)
+    response = requests.Response()
+    response.status_code = 200
+    response.headers.update({"Content-Encoding": "gzip", "Content-Length": str(len(body))})
+    response.raw = urllib3.HTTPResponse(
+        body=io.BytesIO(body), headers=response.headers, status=200, preload_content=False, decode_content=True
+    )
+    return response
+
+
+def test_download_verifies_checksum_of_decoded_content(tmp_path, client, mocker):
+    content = b"Lorem ipsum dolor sit amet" * 100
+    destination = tmp_path / "model"
+    mocker.patch(
+        "substra.sdk.backends.remote.rest_client.requests.Session.get",
+        side_effect=lambda url, **kwargs: _gzip_response(content),
+    )
+
+    download.download(
+        client._backend._client,
+        "http://foo.io/model/key/file/",
+        str(destination),
+        segment_size=100,
+        max_workers=3,
+        checksum=hashlib.sha256(content).hexdigest(),
+    )
+
+    assert destination.read_bytes() == content
+
+
+def test_download_model_without_verification_does_not_fetch_metadata(tmp_path, mocker):
+    content = b"model"
+    client = Client(url="http://foo.io", backend_type="remote", token="foo", verify_checksums=False)
+    file_response = mock_response()
+    file_response.iter_content.return_value = [content]
+    m = mock_requests_responses(mocker, "get", [file_response])
+
+    path = client.download_model("key", tmp_path)
+
+    assert path.read_bytes() == content
+    m.assert_called_once()
+    assert m.call_args.args[0].endswith("/model/key/file/")
+
+
+def test_download_model_reuses_the_fetched_checksum(tmp_path, client, mocker):
+    content = b"model"
+    model = {
+        **datastore.MODEL,
+        "address": {**datastore.MODEL["address"], "checksum": hashlib.sha256(content).hexdigest()},
+    }
+    file_response = mock_response()
+    file_response.iter_content.return_value = [content]
+    m = mock_requests_responses(mocker, "get", [mock_response(model), file_response])
+
+    client.get_model(model["key"])
+    path = client.download_model(model["key"], tmp_path)
+
+    assert path.read_bytes() == content
+    # the metadata of the model are not fetched again to verify the file
+    assert m.call_count == 2
+    assert m.call_args.args[0].endswith(f"/model/{model['key']}/file/")
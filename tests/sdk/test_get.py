@@ -1,3 +1,6 @@
+import json
+
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -6,6 +9,7 @@ from substra.sdk import models
 from substra.sdk import schemas
 
 from .. import datastore
+from ..utils import make_paginated_response
 from ..utils import mock_requests
 from ..utils import mock_requests_responses
 from ..utils import mock_response
@@ -134,3 +138,173 @@ def test_get_performances(client, mocker):
     assert list(df.columns) == list(results.keys())
     assert all(len(v) == df.shape[0] for v in results.values())
     assert m.call_count == 2
+
+
+def _serve_assets_by_key(items):
+    """Answer the list requests filtered on keys like the server."""
+
+    def get(url, params=None, **kwargs):
+        keys = params["key"].split(",")
+        results = [items[key] for key in keys if key in items]
+        return mock_response({"count": len(results), "next": None, "previous": None, "results": results})
+
+    return get
+
+
+@pytest.mark.parametrize(
+    "asset_type, item",
+    [
+        ("task", datastore.TRAINTASK),
+        ("function", datastore.FUNCTION),
+        ("model", datastore.MODEL),
+        ("compute_plan", datastore.COMPUTE_PLAN),
+    ],
+)
+def test_get_many(asset_type, item, client, mocker):
+    mocker.patch("substra.sdk.backends.remote.backend.GET_MANY_CHUNK_SIZE", 3)
+    items = {str(i): {**item, "key": str(i)} for i in range(10)}
+    m = mocker.patch(
+        "substra.sdk.backends.remote.rest_client.requests.Session.get", side_effect=_serve_assets_by_key(items)
+    )
+    keys = ["7", "2", "9", "0", "5", "1", "2"]
+
+    assets = getattr(client, f"get_{asset_type}s")(keys)
+
+    assert [asset.key for asset in assets] == keys
+    assert assets[0] == models.SCHEMA_TO_MODEL[schemas.Type(asset_type)](**items["7"])
+    # duplicated keys are fetched once
+    assert m.call_count == 2
+
+
+def test_get_many_missing_keys(client, mocker):
+    items = {str(i): {**datastore.TRAINTASK, "key": str(i)} for i in range(3)}
+    mocker.patch(
+        "substra.sdk.backends.remote.rest_client.requests.Session.get", side_effect=_serve_assets_by_key(items)
+    )
+
+    with pytest.raises(substra.exceptions.AssetsNotFound) as e:
+        client.get_tasks(["0", "missing", "2", "other"])
+
+    assert e.value.keys == ["missing", "other"]
+
+
+def test_get_performances_many(client, mocker):
+    perf_item = datastore.COMPUTE_PLAN_PERF
+    m = mock_requests_responses(mocker, "get", [mock_response(perf_item), mock_response(perf_item)])
+
+    performances = client.get_performances_many(["cp-1", "cp-2"])
+
+    assert len(performances) == 6
+    assert m.call_count == 2
+    assert performances.task_rank.tolist() == [1, 2, 3] * 2
+    assert performances.performance.tolist() == [result["perf"] for result in perf_item["results"]] * 2
+    assert np.isnan(performances.round_idx).all()
+    assert sorted(performances.compute_plan_key.categories) == ["cp-1", "cp-2"]
+    assert performances.worker.categories == ["MyOrg1MSP"]
+
+    df = performances.to_pandas()
+    assert df.shape == (6, 7)
+    assert df["identifier"].dtype == "category"
+    assert np.shares_memory(df["performance"].to_numpy(), performances.performance)
+
+
+def test_get_performances_many_normalizes_round_idx_and_rank(client, mocker):
+    results = [
+        {**result, "compute_task": {**result["compute_task"], "round_idx": "3", "rank": None}}
+        for result in datastore.COMPUTE_PLAN_PERF["results"]
+    ]
+    mock_requests_responses(mocker, "get", [mock_response({**datastore.COMPUTE_PLAN_PERF, "results": results})])
+
+    performances = client.get_performances_many(["cp-1"])
+
+    assert performances.round_idx.tolist() == [3.0] * 3
+    assert performances.task_rank.dtype == np.float64
+    assert np.isnan(performances.task_rank).all()
+
+
+def _perf_result(task):
+    compute_task = {
+        "key": task["key"],
+        "worker": task["worker"],
+        "rank": task["rank"],
+        "round_idx": task["metadata"].get("round_idx"),
+    }
+    return {"compute_task": compute_task, "identifier": "performance", "perf": 0.5}
+
+
+def _serve_compute_plan_progress(tasks_by_poll, statuses):
+    """Answer like a server where the tasks of `tasks_by_poll[i]` are done at the i-th poll."""
+    polls = iter(range(len(statuses)))
+    current = {"poll": 0}
+
+    def get(url, params=None, **kwargs):
+        tasks = [task for poll in tasks_by_poll[: current["poll"] + 1] for task in poll]
+        if url.endswith("/perf/"):
+            task_keys = params["compute_task_key"].split(",")
+            return mock_response(make_paginated_response([_perf_result(t) for t in tasks if t["key"] in task_keys]))
+        if "/compute_plan/" in url:
+            current["poll"] = next(polls)
+            return mock_response({**datastore.COMPUTE_PLAN, "status": statuses[current["poll"]]})
+        tasks = sorted(tasks, key=lambda task: task["end_date"], reverse=True)
+        return mock_response(make_paginated_response(tasks))
+
+    return get
+
+
+def test_stream_performances(client, mocker):
+    first = {**datastore.TESTTASK, "key": "task-1", "end_date": "2021-10-12T09:30:00Z", "metadata": {"round_idx": "1"}}
+    second = {**datastore.TESTTASK, "key": "task-2", "end_date": "2021-10-12T09:35:00Z", "metadata": {"round_idx": "2"}}
+    m = mocker.patch(
+        "substra.sdk.backends.remote.rest_client.requests.Session.get",
+        side_effect=_serve_compute_plan_progress([[first], [second]], ["PLAN_STATUS_DOING", "PLAN_STATUS_DONE"]),
+    )
+    mocker.patch("substra.sdk.client.time.sleep")
+
+    rows = list(client.stream_performances("magic-key"))
+
+    assert [(row.task_key, row.round_idx, row.performance) for row in rows] == [("task-1", 1, 0.5), ("task-2", 2, 0.5)]
+    # the performances of the new tasks are listed once per poll
+    perf_calls = [call for call in m.call_args_list if call.args[0].endswith("/perf/")]
+    assert [call.kwargs["params"]["compute_task_key"] for call in perf_calls] == ["task-1", "task-2"]
+
+
+def test_get_new_performances_returns_a_new_serializable_cursor(client, mocker):
+    tasks = [
+        {**datastore.TESTTASK, "key": key, "end_date": "2021-10-12T09:30:00Z", "metadata": {}} for key in ("b", "a")
+    ]
+    m = mocker.patch(
+        "substra.sdk.backends.remote.rest_client.requests.Session.get",
+        side_effect=_serve_compute_plan_progress([tasks], ["PLAN_STATUS_DOING"]),
+    )
+    cursor = {"end_date": None, "task_keys": []}
+
+    rows, new_cursor = client.get_new_performances("magic-key", cursor)
+
+    assert [row.task_key for row in rows] == ["a", "b"]
+    assert cursor == {"end_date": None, "task_keys": []}
+    assert json.loads(json.dumps(new_cursor)) == new_cursor
+    assert new_cursor["task_keys"] == ["a", "b"]
+    # the performances of the tasks are listed with one request
+    assert len([call for call in m.call_args_list if call.args[0].endswith("/perf/")]) == 1
+
+    rows, _ = client.get_new_performances("magic-key", json.loads(json.dumps(new_cursor)))
+    assert rows == []
+
+
+def test_get_new_performances_cursor_holds_the_last_done_tasks(client, mocker):
+    tasks_by_poll = [
+        [{**datastore.TESTTASK, "key": key, "end_date": "2021-10-12T09:30:00Z", "metadata": {}} for key in "ab"],
+        [{**datastore.TESTTASK, "key": "c", "end_date": "2021-10-12T09:35:00Z", "metadata": {}}],
+    ]
+    mocker.patch(
+        "substra.sdk.backends.remote.rest_client.requests.Session.get",
+        side_effect=_serve_compute_plan_progress(tasks_by_poll, ["PLAN_STATUS_DOING", "PLAN_STATUS_DOING"]),
+    )
+
+    client.get_compute_plan("magic-key")
+    _, cursor = client.get_new_performances("magic-key")
+    client.get_compute_plan("magic-key")
+    rows, cursor = client.get_new_performances("magic-key", cursor)
+
+    assert [row.task_key for row in rows] == ["c"]
+    assert cursor == {"end_date": "2021-10-12T09:35:00+00:00", "task_keys": ["c"]}
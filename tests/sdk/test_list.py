@@ -1,3 +1,5 @@
+import urllib.parse
+
 import pytest
 
 from substra.sdk import exceptions
@@ -7,6 +9,8 @@ from substra.sdk import schemas
 from .. import datastore
 from ..utils import make_paginated_response
 from ..utils import mock_requests
+from ..utils import mock_requests_responses
+from ..utils import mock_response
 
 
 @pytest.mark.parametrize(
@@ -146,3 +150,111 @@ def test_list_asset_with_ordering_failure(client, mocker):
 
     m.assert_not_called()
     assert str(exc_info.value).startswith("Please review the documentation")
+
+
+@pytest.mark.parametrize(
+    "asset_type",
+    [
+        "dataset",
+        "function",
+        "compute_plan",
+        "data_sample",
+        "model",
+    ],
+)
+def test_iter_asset(asset_type, client, mocker):
+    item = getattr(datastore, asset_type.upper())
+    method = getattr(client, f"iter_{asset_type}")
+
+    mocked_response = make_paginated_response([item])
+    m = mock_requests(mocker, "get", response=mocked_response)
+
+    assets = method()
+    m.assert_not_called()
+
+    assert list(assets) == [models.SCHEMA_TO_MODEL[schemas.Type(asset_type)](**item)]
+    m.assert_called_once()
+
+
+def test_iter_task_yields_pages_lazily(client, mocker):
+    items = datastore.TASK_LIST
+    responses = [
+        mock_response(response={"count": 2, "next": "http://foo.io/task/?page=2", "results": items[:1]}),
+        mock_response(response={"count": 2, "next": None, "results": items[1:2]}),
+    ]
+    m = mock_requests_responses(mocker, "get", responses)
+
+    tasks = client.iter_task(filters={"owner": ["foo"]})
+
+    assert next(tasks) == models.Task(**items[0])
+    assert list(tasks) == [models.Task(**items[1])]
+    assert m.call_count == 2
+
+
+def test_iter_asset_with_filters_failure(client, mocker):
+    m = mock_requests(mocker, "get", response=[datastore.FUNCTION])
+
+    with pytest.raises(exceptions.FilterFormatError):
+        client.iter_function({"foo"})
+
+    m.assert_not_called()
+
+
+def _serve_task_pages(items, page_size):
+    """Answer the task listings like a server paging `items` by page number."""
+
+    def get(url, params=None, **kwargs):
+        page = int(urllib.parse.parse_qs(urllib.parse.urlsplit(url).query).get("page", ["1"])[0])
+        results = items[(page - 1) * page_size : page * page_size]
+        is_last = page * page_size >= len(items)
+        next_url = None if is_last else f"http://foo.io/task/?page={page + 1}"
+        return mock_response(response={"count": len(items), "next": next_url, "previous": None, "results": results})
+
+    return get
+
+
+@pytest.mark.parametrize(
+    "limit,offset,cursor,expected",
+    [
+        (2, 0, None, ["0", "1"]),
+        (3, 2, None, ["2", "3", "4"]),
+        (None, 4, None, ["4", "5"]),
+        (2, 0, "2", ["3", "4"]),
+        (None, 1, "2", ["4", "5"]),
+        (2, 0, "missing", []),
+    ],
+)
+def test_list_task_pages(limit, offset, cursor, expected, client, mocker):
+    items = [{**datastore.TRAINTASK, "key": str(i)} for i in range(6)]
+    mocker.patch(
+        "substra.sdk.backends.remote.rest_client.requests.Session.get", side_effect=_serve_task_pages(items, 2)
+    )
+
+    tasks = client.list_task(limit=limit, offset=offset, cursor=cursor)
+
+    assert [task.key for task in tasks] == expected
+
+
+@pytest.mark.parametrize(
+    "limit,offset,cursor,expected_pages",
+    [
+        (2, 0, None, [1]),
+        (3, 0, None, [1, 2]),
+        (2, 4, None, [1, 3]),
+        (None, 8, None, [1]),
+        (1, 0, "2", [1, 2]),
+    ],
+)
+def test_list_task_pages_requested(limit, offset, cursor, expected_pages, client, mocker):
+    items = [{**datastore.TRAINTASK, "key": str(i)} for i in range(8)]
+    m = mocker.patch(
+        "substra.sdk.backends.remote.rest_client.requests.Session.get", side_effect=_serve_task_pages(items, 2)
+    )
+
+    client.list_task(limit=limit, offset=offset, cursor=cursor)
+
+    pages = [
+        int(urllib.parse.parse_qs(urllib.parse.urlsplit(c.args[0]).query).get("page", ["1"])[0])
+        for c in m.call_args_list
+    ]
+    assert pages == expected_pages
@@ -0,0 +1,71 @@
+import pytest
+
+from substra.sdk import exceptions
+from substra.sdk import metrics
+
+from .. import datastore
+from ..utils import mock_requests_responses
+from ..utils import mock_response
+
+TASK_KEY = datastore.TRAINTASK["key"]
+
+
+def test_normalize_endpoint():
+    assert metrics.normalize_endpoint(f"http://foo.io/task/{TASK_KEY}/?page=2") == "/task/{key}/"
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = metrics.Histogram(buckets=(0.1, 1))
+    for value in (0.05, 0.1, 0.5, 3):
+        histogram.observe(value)
+
+    assert histogram.to_dict() == {"count": 4, "sum": 3.65, "buckets": {"0.1": 2, "1": 3, "+Inf": 4}}
+
+
+def test_client_metrics_per_endpoint(client, mocker):
+    responses = [mock_response(datastore.TRAINTASK, headers={"Content-Length": "1024"}) for _ in range(2)]
+    mock_requests_responses(mocker, "get", responses)
+
+    client.get_task(TASK_KEY)
+    client.get_task(TASK_KEY)
+
+    result = client.metrics().to_dict()
+    assert result["requests"]["GET /task/{key}/"]["count"] == 2
+    assert result["requests"]["GET /task/{key}/"]["bytes_received"] == 2048
+    assert result["calls"]["get_task"]["count"] == 2
+    assert result["calls"]["get_task"]["errors"] == {}
+
+
+def test_client_metrics_retries_and_errors(client, mocker):
+    mocker.patch("substra.sdk.utils.time.sleep")
+    responses = [
+        mock_response(response="Unavailable", status=503),
+        mock_response(response={"detail": "Not found"}, status=404),
+    ]
+    mock_requests_responses(mocker, "get", responses)
+
+    with pytest.raises(exceptions.NotFound):
+        client.get_task(TASK_KEY)
+
+    result = client.metrics().to_dict()
+    assert result["requests"]["GET /task/{key}/"]["retries"] == 1
+    assert result["requests"]["GET /task/{key}/"]["errors"] == {"GatewayUnavailable": 1, "NotFound": 1}
+    assert result["calls"]["get_task"]["errors"] == {"NotFound": 1}
+
+
+def test_metrics_to_prometheus():
+    registry = metrics.MetricsRegistry(buckets=(1,))
+    registry.record_request("get", f"http://foo.io/task/{TASK_KEY}/", 0.5, error="NotFound", bytes_received=10)
+    registry.record_call("get_task", 0.5, error="NotFound")
+    registry.record_batch(100, 0.5)
+
+    lines = registry.to_prometheus().splitlines()
+
+    assert "# TYPE substra_http_request_duration_seconds histogram" in lines
+    assert 'substra_http_request_duration_seconds_bucket{method="GET",endpoint="/task/{key}/",le="1"} 1' in lines
+    assert 'substra_http_request_duration_seconds_count{method="GET",endpoint="/task/{key}/"} 1' in lines
+    assert 'substra_http_request_errors_total{method="GET",endpoint="/task/{key}/",error="NotFound"} 1' in lines
+    assert 'substra_http_response_received_bytes_total{method="GET",endpoint="/task/{key}/"} 10' in lines
+    assert 'substra_client_call_errors_total{method="get_task",error="NotFound"} 1' in lines
+    assert 'substra_task_batch_size_bucket{le="100"} 1' in lines
+    assert "substra_task_batch_size_sum 100" in lines
@@ -1,9 +1,15 @@
+import io
 import json
+import threading
+import urllib.parse
 
 import pytest
 import requests
+import urllib3
 
+from substra.sdk import RetryPolicy
 from substra.sdk import exceptions
+from substra.sdk.backends.remote import multipart
 from substra.sdk.backends.remote import rest_client
 from substra.sdk.client import Client
 
@@ -85,7 +91,7 @@ def test_request_http_errors(mocker, status_code, http_response, sdk_exception):
 
 def test_request_connection_error(mocker):
     mocker.patch(
-        "substra.sdk.backends.remote.rest_client.requests.post", side_effect=requests.exceptions.ConnectionError
+        "substra.sdk.backends.remote.rest_client.requests.Session.post", side_effect=requests.exceptions.ConnectionError
     )
     with pytest.raises(exceptions.ConnectionError):
         _client_from_config(CONFIG).add("foo", {})
@@ -168,3 +174,192 @@ def test_list_not_paginated(mocker):
     asset = _client_from_config(CONFIG).list(asset_type, paginated=False)
     assert len(asset) != len(items)
     assert len(m_get.call_args_list) == 1
+
+
+def test_requests_share_session(mocker):
+    responses = [mock_response(response={"key": "a-key"}), mock_response(response={"key": "b-key"})]
+    m_get = mock_requests_responses(mocker, "get", responses)
+    client = _client_from_config(CONFIG)
+    session = client._session
+
+    client.get("traintask", "a-key")
+    client.get("traintask", "b-key")
+
+    assert m_get.call_count == 2
+    assert client._session is session
+
+
+def test_session_pool_size():
+    client = rest_client.Client(CONFIG["url"], CONFIG["insecure"], None, pool_maxsize=42)
+    adapter = client._session.get_adapter("https://foo.com")
+    assert adapter._pool_maxsize == 42
+    assert client._session.get_adapter("http://foo.com") is adapter
+
+
+def _paginated_responses(items, page_size, base_url="http://foo.com/traintask/"):
+    pages = [items[i : i + page_size] for i in range(0, len(items), page_size)]
+    responses = {}
+    for index, page in enumerate(pages, start=1):
+        responses[index] = mock_response(
+            response={
+                "count": len(items),
+                "next": f"{base_url}?page={index + 1}&page_size={page_size}" if index < len(pages) else None,
+                "previous": None,
+                "results": page,
+            }
+        )
+    return responses
+
+
+@pytest.mark.parametrize("page_workers", [1, 3])
+def test_list_paginated_concurrent_pages_keep_order(mocker, page_workers):
+    items = [{**datastore.TRAINTASK, "key": str(i)} for i in range(9)]
+    responses = _paginated_responses(items, page_size=2)
+
+    def _get(url, **kwargs):
+        query = urllib.parse.parse_qs(urllib.parse.urlsplit(url).query)
+        return responses[int(query.get("page", ["1"])[0])]
+
+    m_get = mocker.patch("substra.sdk.backends.remote.rest_client.requests.Session.get", side_effect=_get)
+    client = rest_client.Client(CONFIG["url"], CONFIG["insecure"], None, page_workers=page_workers)
+
+    assets = client.list("traintask")
+
+    assert [asset["key"] for asset in assets] == [item["key"] for item in items]
+    assert m_get.call_count == len(responses)
+
+
+def test_iter_list_requests_next_pages_before_yielding_first_page(mocker):
+    items = [{**datastore.TRAINTASK, "key": str(i)} for i in range(4)]
+    responses = _paginated_responses(items, page_size=2)
+    page_2_requested = threading.Event()
+
+    def _get(url, **kwargs):
+        page = int(urllib.parse.parse_qs(urllib.parse.urlsplit(url).query).get("page", ["1"])[0])
+        if page == 2:
+            page_2_requested.set()
+        return responses[page]
+
+    mocker.patch("substra.sdk.backends.remote.rest_client.requests.Session.get", side_effect=_get)
+    client = rest_client.Client(CONFIG["url"], CONFIG["insecure"], None, page_workers=2)
+
+    pages = client.iter_list("traintask")
+    first_page = next(pages)
+
+    # page 2 is in flight while the caller handles page 1
+    assert page_2_requested.wait(timeout=5)
+    assert [item["key"] for page in [first_page, *pages] for item in page] == ["0", "1", "2", "3"]
+
+
+def test_list_paginated_follows_next_links_without_page_number(mocker):
+    items = [datastore.TRAINTASK, datastore.TRAINTASK]
+    responses = [
+        mock_response(
+            response={"count": len(items), "next": "http://foo.com/?cursor=abc", "previous": None, "results": items[:1]}
+        ),
+        mock_response(response={"count": len(items), "next": None, "previous": None, "results": items[1:]}),
+    ]
+    m_get = mock_requests_responses(mocker, "get", responses)
+
+    assets = _client_from_config(CONFIG).list("traintask")
+
+    assert len(assets) == len(items)
+    assert m_get.call_args_list[1].args[0] == "http://foo.com/?cursor=abc"
+
+
+def test_get_with_response_cache_revalidates(mocker):
+    responses = [
+        mock_response(response=datastore.TRAINTASK, headers={"ETag": '"v1"'}),
+        mock_response(status=304, headers={"ETag": '"v1"'}),
+    ]
+    m_get = mock_requests_responses(mocker, "get", responses)
+    client = rest_client.Client(CONFIG["url"], CONFIG["insecure"], None, cache_size=10)
+
+    first = client.get("task", "a-key")
+    second = client.get("task", "a-key")
+
+    assert first == second == datastore.TRAINTASK
+    assert "If-None-Match" not in m_get.call_args_list[0].kwargs["headers"]
+    assert m_get.call_args_list[1].kwargs["headers"]["If-None-Match"] == '"v1"'
+
+
+def test_get_with_response_cache_evicts_least_recently_used(mocker):
+    responses = [
+        mock_response(response={"key": "a"}, headers={"Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}),
+        mock_response(response={"key": "b"}, headers={"Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}),
+        mock_response(response={"key": "a"}),
+    ]
+    m_get = mock_requests_responses(mocker, "get", responses)
+    client = rest_client.Client(CONFIG["url"], CONFIG["insecure"], None, cache_size=1)
+
+    client.get("task", "a")
+    client.get("task", "b")
+    client.get("task", "a")
+
+    assert "If-Modified-Since" not in m_get.call_args_list[2].kwargs["headers"]
+
+
+def test_response_cache_size_from_client():
+    client = Client(url="http://foo.io", backend_type="remote", token="foo", response_cache_size=3)
+    assert client._backend._client._cache is not None
+
+
+def test_request_retried_after_delay_requested_by_server(mocker):
+    m_sleep = mocker.patch("substra.sdk.utils.time.sleep")
+    responses = [
+        mock_response(response="Too Many Requests", status=429, headers={"Retry-After": "7"}),
+        mock_response(response={"key": "a-key"}),
+    ]
+    m_get = mock_requests_responses(mocker, "get", responses)
+
+    asset = _client_from_config(CONFIG).get("task", "a-key")
+
+    assert asset == {"key": "a-key"}
+    assert m_get.call_count == 2
+    m_sleep.assert_called_once_with(7)
+
+
+def test_request_retry_policy_from_client(mocker):
+    m_sleep = mocker.patch("substra.sdk.utils.time.sleep")
+    retry_policy = RetryPolicy(exceptions={exceptions.GatewayUnavailable: 1})
+    responses = [mock_response(response="Unavailable", status=503) for _ in range(3)]
+    m_get = mock_requests_responses(mocker, "get", responses)
+    client = Client(url="http://foo.io", backend_type="remote", token="foo", retry_policy=retry_policy)
+
+    with pytest.raises(exceptions.GatewayUnavailable):
+        client.get_task("a-key")
+
+    assert m_get.call_count == 2
+    assert m_sleep.call_count == 1
+
+
+def test_multipart_encoder_matches_requests_encoding(tmp_path):
+    path = tmp_path / "archive.zip"
+    path.write_bytes(b"zip content" * 1000)
+    fields = {"json": '{"key": "value"}'}
+
+    with open(path, "rb") as f:
+        body = multipart.MultipartEncoder(fields, {"file": f, "sample": io.BytesIO(b"sample")}, boundary="b0undary")
+        content = b"".join(iter(lambda: body.read(100), b""))
+
+    expected_fields = [urllib3.fields.RequestField(name="json", data=fields["json"])]
+    for name, filename, data in [("file", "archive.zip", path.read_bytes()), ("sample", "sample", b"sample")]:
+        expected_fields.append(urllib3.fields.RequestField(name=name, data=data, filename=filename))
+    for field in expected_fields:
+        field.make_multipart(content_type=None)
+    expected, _ = urllib3.encode_multipart_formdata(expected_fields, boundary="b0undary")
+
+    assert len(body) == len(expected)
+    assert content == expected
+
+
+def test_request_streams_files(mocker):
+    m_post = mock_requests(mocker, "post", response={"key": "a-key"})
+    files = {"file": io.BytesIO(b"content")}
+
+    _client_from_config(CONFIG).add("data_sample", data={"json": "{}"}, files=files)
+
+    kwargs = m_post.call_args.kwargs
+    assert "files" not in kwargs
+    assert isinstance(kwargs["data"], multipart.MultipartEncoder)
+    assert kwargs["headers"]["Content-Type"] == kwargs["data"].content_type
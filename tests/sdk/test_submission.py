@@ -0,0 +1,134 @@
+import threading
+import time
+
+import pytest
+
+from substra.sdk import schemas
+from substra.sdk.backends.remote import submission
+
+
+def _task(key, parents=()):
+    return schemas.TaskSpec(
+        key=key,
+        function_key="function-key",
+        worker="worker",
+        inputs=[
+            schemas.InputRef(identifier="model", parent_task_key=parent, parent_task_output_identifier="model")
+            for parent in parents
+        ],
+    )
+
+
+def test_independent_batches_are_sent_concurrently():
+    batches = [[_task("a")], [_task("b")], [_task("c")]]
+    barrier = threading.Barrier(len(batches), timeout=5)
+
+    submission.submit_batches(batches, lambda batch: barrier.wait(), max_in_flight=3)
+
+
+def test_batch_waits_for_its_parents():
+    batches = [[_task("a")], [_task("b")], [_task("c", parents=["a"]), _task("d", parents=["c"])]]
+    accepted = []
+    sent_after = {}
+
+    def submit(batch):
+        sent_after[batch[0].key] = list(accepted)
+        if batch[0].key == "a":
+            time.sleep(0.05)
+        accepted.append(batch[0].key)
+
+    submission.submit_batches(batches, submit, max_in_flight=3)
+
+    assert "a" in sent_after["c"]
+    assert sent_after["b"] == []
+
+
+def test_batches_are_read_when_they_can_be_sent():
+    read = []
+    read_when_sent = []
+
+    def batches():
+        for key in "abc":
+            read.append(key)
+            yield [_task(key)]
+
+    submission.submit_batches(batches(), lambda batch: read_when_sent.append(list(read)), max_in_flight=1)
+
+    assert read_when_sent == [["a"], ["a", "b"], ["a", "b", "c"]]
+
+
+def test_error_stops_the_submission():
+    batches = [[_task("a")], [_task("b", parents=["a"])]]
+    sent = []
+
+    def submit(batch):
+        sent.append(batch[0].key)
+        raise ValueError("rejected")
+
+    with pytest.raises(ValueError):
+        submission.submit_batches(batches, submit, max_in_flight=2)
+
+    assert sent == ["a"]
+
+
+def test_adaptive_batch_sizer_aimd():
+    sizer = submission.AdaptiveBatchSizer(initial_size=10, increase=5, target_latency=1, min_size=2, max_size=18)
+
+    sizer.record(0.5)
+    assert sizer.size == 15
+    sizer.record(0.5)
+    assert sizer.size == 18
+    sizer.record(3)
+    assert sizer.size == 9
+    for _ in range(5):
+        sizer.record(3)
+    assert sizer.size == 2
+
+
+def test_adaptive_batch_sizer_batches():
+    tasks = [_task(str(i)) for i in range(10)]
+    sizer = submission.AdaptiveBatchSizer(initial_size=4, increase=2)
+
+    batches = sizer.batches(tasks)
+    first = next(batches)
+    sizer.record(0.1)
+    rest = list(batches)
+
+    assert [len(batch) for batch in [first] + rest] == [4, 6]
+
+
+def test_adaptive_batch_sizer_limits_bytes():
+    tasks = [_task(str(i)) for i in range(10)]
+    task_bytes = submission._estimate_bytes(tasks[0])
+    sizer = submission.AdaptiveBatchSizer(initial_size=100, max_bytes=3 * task_bytes)
+
+    assert [len(batch) for batch in sizer.batches(tasks)] == [3, 3, 3, 1]
+
+
+def test_adaptive_batch_sizer_does_not_serialize_tasks(mocker):
+    tasks = [_task(str(i)) for i in range(10)]
+    dump = mocker.patch.object(schemas.TaskSpec, "model_dump_json")
+    sizer = submission.AdaptiveBatchSizer(initial_size=4)
+
+    assert [len(batch) for batch in sizer.batches(tasks)] == [4, 4, 2]
+    dump.assert_not_called()
+
+
+def test_estimated_task_bytes_bound_the_serialized_size():
+    task = schemas.TaskSpec(
+        function_key="f" * 36,
+        worker="worker",
+        tag="tag",
+        metadata={"round": "1"},
+        inputs=[
+            schemas.InputRef(identifier="datasamples", asset_key="a" * 36),
+            schemas.InputRef(identifier="model", parent_task_key="p" * 36, parent_task_output_identifier="model"),
+        ],
+        outputs={
+            "model": schemas.ComputeTaskOutputSpec(
+                permissions=schemas.Permissions(public=False, authorized_ids=["org-1", "org-2"])
+            )
+        },
+    )
+
+    assert len(task.model_dump_json()) <= submission._estimate_bytes(task)
@@ -1,3 +1,4 @@
+import uuid
 from contextlib import nullcontext as does_not_raise
 
 import pytest
@@ -6,9 +7,13 @@ from substra.sdk import exceptions
 from substra.sdk.models import ComputePlanStatus
 from substra.sdk.models import ComputeTaskStatus
 from substra.sdk.models import TaskErrorType
+from substra.sdk.utils import PollingPolicy
 
 from .. import datastore
+from ..utils import make_paginated_response
 from ..utils import mock_requests
+from ..utils import mock_requests_responses
+from ..utils import mock_response
 
 
 def _param_name_maker(arg):
@@ -72,3 +77,84 @@ def test_wait_timeout(client, mocker, asset_dict, function_name, status):
     with pytest.raises(exceptions.FutureTimeoutError):
         # mock_requests returns only once and timeout=0 is falsy, so setting a microscopic duration
         function(key=item["key"], timeout=1e-10)
+
+
+def _tasks(statuses):
+    return [{**datastore.TRAINTASK, "key": str(uuid.uuid4()), "status": status} for status in statuses]
+
+
+def test_iter_wait_tasks(client, mocker):
+    tasks = _tasks([ComputeTaskStatus.done, ComputeTaskStatus.executing])
+    m_get = mock_requests_responses(
+        mocker,
+        "get",
+        [
+            mock_response(make_paginated_response(tasks)),
+            mock_response(make_paginated_response([{**tasks[1], "status": ComputeTaskStatus.done}])),
+        ],
+    )
+
+    finished = list(client.iter_wait_tasks([task["key"] for task in tasks], polling_period=0))
+
+    assert [task.key for task in finished] == [task["key"] for task in tasks]
+    # a single listing per polling period, of the unfinished tasks only
+    assert m_get.call_count == 2
+    assert m_get.call_args.kwargs["params"]["key"] == tasks[1]["key"]
+
+
+def test_wait_tasks_keeps_order_and_reports_failures(client, mocker):
+    tasks = _tasks([ComputeTaskStatus.canceled, ComputeTaskStatus.done, ComputeTaskStatus.canceled])
+    mocker.patch(
+        "substra.sdk.backends.remote.rest_client.requests.Session.get",
+        side_effect=lambda url, **kwargs: mock_response(make_paginated_response(tasks)),
+    )
+    keys = [task["key"] for task in tasks]
+
+    with pytest.raises(exceptions.FutureFailureError) as e:
+        client.wait_tasks(keys)
+    assert [task.key for task in e.value.assets] == [keys[0], keys[2]]
+
+    assert [task.key for task in client.wait_tasks(keys[::-1], raise_on_failure=False)] == keys[::-1]
+
+
+def test_wait_compute_plans_timeout(client, mocker):
+    compute_plans = [
+        {**datastore.COMPUTE_PLAN, "key": str(uuid.uuid4()), "status": status}
+        for status in (ComputePlanStatus.done, ComputePlanStatus.doing)
+    ]
+    mock_requests(mocker, "get", make_paginated_response(compute_plans))
+
+    with pytest.raises(exceptions.FutureTimeoutError) as e:
+        client.wait_compute_plans([cp["key"] for cp in compute_plans], timeout=1e-10)
+    assert e.value.keys == [compute_plans[1]["key"]]
+
+
+def test_wait_tasks_not_found(client, mocker):
+    tasks = _tasks([ComputeTaskStatus.done])
+    mock_requests(mocker, "get", make_paginated_response(tasks))
+
+    with pytest.raises(exceptions.AssetsNotFound):
+        client.wait_tasks([tasks[0]["key"], str(uuid.uuid4())])
+
+
+def test_wait_polls_adaptively(client, mocker):
+    m_sleep = mocker.patch("substra.sdk.client.time.sleep")
+    client._polling_policy = PollingPolicy(initial_period=1, backoff=2, max_period=3)
+    item = {**datastore.TRAINTASK, "status": ComputeTaskStatus.executing}
+    responses = [mock_response(item)] * 4 + [mock_response({**item, "status": ComputeTaskStatus.done})]
+    mock_requests_responses(mocker, "get", responses)
+
+    client.wait_task(key=item["key"])
+
+    assert [call.args[0] for call in m_sleep.call_args_list] == [1, 2, 3, 3]
+
+
+def test_wait_stops_when_polling_budget_exceeded(client, mocker):
+    mocker.patch("substra.sdk.client.time.sleep")
+    client._polling_policy = PollingPolicy(max_requests=2)
+    item = {**datastore.TRAINTASK, "status": ComputeTaskStatus.executing}
+    m_get = mock_requests_responses(mocker, "get", [mock_response(item)] * 3)
+
+    with pytest.raises(exceptions.FutureTimeoutError):
+        client.wait_task(key=item["key"])
+    assert m_get.call_count == 2
@@ -1,5 +1,8 @@
 import os
 import zipfile
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
 
 import pytest
 
@@ -14,7 +17,8 @@ def _unzip(fp, destination):
         zipf.extractall(destination)
 
 
-def test_zip_folder(tmp_path):
+@pytest.mark.parametrize("zip_folder", [utils.zip_folder_in_memory, utils.zip_folder_to_spooled_file])
+def test_zip_folder(tmp_path, zip_folder):
     # initialise dir to zip
     dir_to_zip = tmp_path / "dir"
     dir_to_zip.mkdir()
@@ -35,7 +39,7 @@ def test_zip_folder(tmp_path):
         assert os.path.exists(str(path))
 
     # zip dir
-    fp = utils.zip_folder_in_memory(str(dir_to_zip))
+    fp = zip_folder(str(dir_to_zip))
     assert fp
 
     # unzip dir
@@ -120,3 +124,133 @@ def test_check_search_ordering(ordering, exception):
             utils.check_search_ordering(ordering)
     else:
         utils.check_search_ordering(ordering)
+
+
+def test_extract_data_sample_files_bounds_memory(tmp_path, mocker):
+    mocker.patch.object(utils, "ZIP_SPOOL_TOTAL_MAX_SIZE", 1)
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"sample_{i}"
+        path.mkdir()
+        (path / "data.csv").write_text(f"content{i}")
+        paths.append(str(path))
+
+    with utils.extract_data_sample_files({"paths": paths}) as (data, files):
+        assert "paths" not in data
+        assert sorted(files) == ["sample_0", "sample_1", "sample_2"]
+        # the archives exceeding the memory budget are written to temporary files
+        assert all(f._rolled for f in files.values())
+        destination_dir = tmp_path / "destination"
+        _unzip(files["sample_1"], str(destination_dir))
+        assert (destination_dir / "data.csv").read_text() == "content1"
+
+
+def _failing(exception, failures):
+    calls = []
+
+    def f():
+        calls.append(1)
+        if len(calls) <= failures:
+            raise exception
+        return len(calls)
+
+    return f, calls
+
+
+def test_retry_policy_delays_are_capped():
+    policy = utils.RetryPolicy(initial_delay=1, backoff=2, max_delay=5, jitter=False)
+    assert [policy.delay(retry) for retry in range(5)] == [1, 2, 4, 5, 5]
+
+
+def test_retry_policy_full_jitter(mocker):
+    m_uniform = mocker.patch("substra.sdk.utils.random.uniform", return_value=0.5)
+    policy = utils.RetryPolicy(initial_delay=1, backoff=2, max_delay=5)
+    assert policy.delay(3) == 0.5
+    m_uniform.assert_called_once_with(0, 5)
+
+
+def test_retry_policy_respects_retry_after():
+    policy = utils.RetryPolicy(initial_delay=1, max_delay=5, jitter=False)
+    exception = exceptions.TooManyRequests("too many requests", 429)
+    exception.retry_after = 12
+    assert policy.delay(0, exception) == 12
+    assert policy.replace(respect_retry_after=False).delay(0, exception) == 1
+
+
+def test_retry_policy_per_exception_max_retries(mocker):
+    m_sleep = mocker.patch("substra.sdk.utils.time.sleep")
+    policy = utils.RetryPolicy(exceptions={exceptions.GatewayUnavailable: 2}, timeout=None)
+
+    f, calls = _failing(exceptions.GatewayUnavailable("unavailable", 503), failures=2)
+    assert policy.call(f) == 3
+
+    f, calls = _failing(exceptions.GatewayUnavailable("unavailable", 503), failures=3)
+    with pytest.raises(exceptions.GatewayUnavailable):
+        policy.call(f)
+    assert len(calls) == 3
+    assert m_sleep.call_count == 4
+
+
+def test_retry_policy_does_not_retry_other_exceptions(mocker):
+    m_sleep = mocker.patch("substra.sdk.utils.time.sleep")
+    f, calls = _failing(exceptions.NotFound("not found", 404), failures=1)
+    with pytest.raises(exceptions.NotFound):
+        utils.RetryPolicy()(f)()
+    assert len(calls) == 1
+    m_sleep.assert_not_called()
+
+
+def test_retry_policy_does_not_sleep_past_deadline(mocker):
+    m_sleep = mocker.patch("substra.sdk.utils.time.sleep")
+    exception = exceptions.GatewayUnavailable("unavailable", 503)
+    exception.retry_after = 120
+    f, calls = _failing(exception, failures=1)
+    with pytest.raises(exceptions.GatewayUnavailable):
+        utils.RetryPolicy(timeout=60).call(f)
+    assert len(calls) == 1
+    m_sleep.assert_not_called()
+
+
+def test_retry_on_exception_accepts_a_single_exception_type(mocker):
+    mocker.patch("substra.sdk.utils.time.sleep")
+    f, calls = _failing(exceptions.RequestTimeout("a-key", 408), failures=2)
+    assert utils.retry_on_exception(exceptions=(exceptions.RequestTimeout))(f)() == 3
+
+
+def test_retry_on_exception_doubles_the_delay_until_the_timeout(mocker):
+    clock = [0]
+    m_sleep = mocker.patch("substra.sdk.utils.time.sleep", side_effect=lambda delay: clock.append(clock[-1] + delay))
+    mocker.patch("substra.sdk.utils.time.time", side_effect=lambda: clock[-1])
+    f, calls = _failing(exceptions.RequestTimeout("a-key", 408), failures=10)
+
+    with pytest.raises(exceptions.RequestTimeout):
+        utils.retry_on_exception(exceptions=(exceptions.RequestTimeout), timeout=60)(f)()
+
+    # no jitter, no cap and no retry skipped because the next delay would exceed the timeout
+    assert [call.args[0] for call in m_sleep.call_args_list] == [1, 2, 4, 8, 16, 32]
+    assert len(calls) == 7
+
+
+def test_polling_policy_backs_off_up_to_max_period():
+    policy = utils.PollingPolicy(initial_period=1, backoff=2, max_period=5)
+    assert [policy.delay(poll) for poll in range(5)] == [1, 2, 4, 5, 5]
+
+
+def test_polling_policy_waits_for_estimated_end_date():
+    policy = utils.PollingPolicy(initial_period=1, max_period=5, eta_margin=10, max_eta_period=600)
+    now = datetime.now(timezone.utc)
+
+    assert 85 < policy.delay(0, now + timedelta(seconds=100)) <= 90
+    assert policy.delay(0, now + timedelta(hours=2)) == 600
+    # past estimates are ignored
+    assert policy.delay(0, now - timedelta(seconds=100)) == 1
+    assert policy.with_period(3).delay(0, now + timedelta(seconds=100)) == 3
+
+
+def test_polling_policy_budget():
+    policy = utils.PollingPolicy(max_requests=3, max_request_time=10)
+    policy.check_budget(2, 9.0, "asset")
+    with pytest.raises(exceptions.FutureTimeoutError):
+        policy.check_budget(3, 1.0, "asset")
+    with pytest.raises(exceptions.FutureTimeoutError):
+        policy.check_budget(1, 10.0, "asset")
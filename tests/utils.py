@@ -11,7 +11,7 @@ def mock_response(response=None, status=200, headers=None, json_error=None):
     m.text = str(response)
     m.json = mock.MagicMock(return_value=response, headers=headers, side_effect=json_error)
 
-    if status not in (200, 201):
+    if status >= 400:
         exception = requests.exceptions.HTTPError(str(status), response=m)
         m.raise_for_status = mock.MagicMock(side_effect=exception)
 
@@ -20,7 +20,7 @@ def mock_response(response=None, status=200, headers=None, json_error=None):
 
 def mock_requests_responses(mocker, method, responses):
     return mocker.patch(
-        f"substra.sdk.backends.remote.rest_client.requests.{method}",
+        f"substra.sdk.backends.remote.rest_client.requests.Session.{method}",
         side_effect=responses,
     )
 